@@ -0,0 +1,63 @@
+"""Walk-forward ბექტესტი.
+
+მაგალითები:
+    python run_backtest.py                                # LR, ყოველკვირეული, მზარდი ფანჯარა
+    python run_backtest.py --model xgb --cadence monthly
+    python run_backtest.py --cadence matchday --window 365 --workers 8
+"""
+import sys
+import os
+import argparse
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import PROCESSED_DIR, BACKTEST_WORKERS, MIN_EDGE_THRESHOLD
+from src.data.db_manager import init_database
+from src.ml.backtest import CADENCES, run_backtest, summarize
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIbetuchio walk-forward ბექტესტი")
+    parser.add_argument("--model", choices=["lr", "xgb"], default="lr")
+    parser.add_argument("--cadence", choices=list(CADENCES), default="weekly",
+                        help="რამდენად ხშირად ხდება გადაწვრთნა")
+    parser.add_argument("--window", type=int, default=None,
+                        help="მცოცავი ფანჯარა დღეებში (ნაგულისხმევად - მზარდი)")
+    parser.add_argument("--start", default=None, help="პირველი სატესტო თარიღი (YYYY-MM-DD)")
+    parser.add_argument("--workers", type=int, default=BACKTEST_WORKERS)
+    parser.add_argument("--min-edge", type=float, default=MIN_EDGE_THRESHOLD)
+    parser.add_argument("--out", default=None, help="ფოლდების CSV (ნაგულისხმევად data/processed/)")
+    args = parser.parse_args()
+
+    log.info("=" * 60)
+    log.info("AIbetuchio - walk-forward ბექტესტი")
+    log.info("=" * 60)
+
+    init_database()
+    report = run_backtest(model=args.model, cadence=args.cadence, window_days=args.window,
+                          start=args.start, workers=args.workers, min_edge=args.min_edge)
+    if report.empty:
+        log.error("ფოლდები ვერ შეიქმნა. შეამოწმეთ მონაცემები (setup_data.py)")
+        return
+
+    out = args.out or PROCESSED_DIR / (
+        f"backtest_{args.model}_{args.cadence}_{datetime.now():%Y%m%d-%H%M%S}.csv")
+    report.to_csv(out, index=False)
+
+    summary = summarize(report)
+    log.info("\n" + "=" * 40)
+    log.info("შედეგები:")
+    log.info(f"  ფოლდები: {summary['folds']}, მატჩები: {summary['matches']}")
+    log.info(f"  Accuracy: {summary['accuracy']:.4f}")
+    log.info(f"  Log Loss: {summary['log_loss']:.4f}")
+    roi = f"{summary['roi']:.2%}" if summary["roi"] is not None else "N/A"
+    log.info(f"  Value bets: {summary['bets']}, მოგება: {summary['profit']:.2f}, ROI: {roi}")
+    log.info(f"  ფოლდების CSV: {out}")
+    log.info("=" * 40)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""ფიჩერების პაიპლაინის ბენჩმარკი და ეკვივალენტობის შემოწმება.
+
+მაგალითები:
+    python run_benchmark.py                              # სინთეტიკური 10 ლიგა x 4 სეზონი,
+                                                         # შედარება ბაზისურ ეტალონთან
+    python run_benchmark.py --teams 20 --seasons 30 --divisions 20
+    python run_benchmark.py --source db --engines default,compact
+    python run_benchmark.py --engine mine=my_pkg.features:create_features
+    python run_benchmark.py --save-golden golden.pkl     # გამომავლის დაფიქსირება
+    python run_benchmark.py --golden golden.pkl          # შედარება დაფიქსირებულთან
+
+ნაგულისხმევ სინთეტიკურ მონაცემებზე (BENCHMARK_GOLDEN_CONFIG) ეტალონია
+ბაზისური, სტრიქონ-სტრიქონ იმპლემენტაციის დაფიქსირებული გამომავალი
+(BENCHMARK_GOLDEN_PATH) - ყველა ძრავი მასთან მოწმდება (მის სვეტებზე).
+"""
+import sys
+import os
+import argparse
+import importlib
+import time
+import multiprocessing as mp
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from src.config import BENCHMARK_RESULTS_PATH, BENCHMARK_GOLDEN_PATH, BENCHMARK_GOLDEN_CONFIG
+from src.utils.benchmark import compare_features, append_results
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# ძრავი = "module:function" (+ დამატებითი kwargs); ეტალონის (golden) გარეშე
+# პირველი ითვლება ეტალონად
+ENGINES = {
+    "default": ("src.data.feature_engineer:create_features", {}),
+    "compact": ("src.data.feature_engineer:create_features", {"compact": True}),
+}
+
+
+def _load_engine(spec: str):
+    module, func = spec.split(":")
+    return getattr(importlib.import_module(module), func)
+
+
+def _run_engine(spec: str, kwargs: dict, matches: pd.DataFrame) -> tuple:
+    """ერთი ძრავის გაშვება ცალკე პროცესში (პიკური RSS რომ არ აირიოს)."""
+    from src.utils.profiling import peak_rss_mb, frame_mb
+
+    engine = _load_engine(spec)
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    featured = engine(matches, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    stats = {
+        "rows": len(featured),
+        "seconds": round(elapsed, 4),
+        "rows_per_sec": round(len(matches) / elapsed, 1) if elapsed > 0 else None,
+        "frame_mb": round(frame_mb(featured), 2),
+        "peak_rss_mb": peak_rss_mb(),
+        "baseline_rss_mb": rss_before,
+    }
+    return featured, stats
+
+
+def _load_matches(args) -> pd.DataFrame:
+    if args.source == "db":
+        from src.data.db_manager import get_all_matches
+        return get_all_matches()
+    from src.data.synthetic import generate_matches
+    return generate_matches(teams=args.teams, seasons=args.seasons,
+                            divisions=args.divisions, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ფიჩერების ბენჩმარკი")
+    parser.add_argument("--source", choices=["synthetic", "db"], default="synthetic")
+    parser.add_argument("--teams", type=int, default=20)
+    parser.add_argument("--seasons", type=int, default=4)
+    parser.add_argument("--divisions", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engines", default=",".join(ENGINES),
+                        help="გასაშვები ძრავები (პირველი = ეტალონი)")
+    parser.add_argument("--engine", action="append", default=[],
+                        help="დამატებითი ძრავი: name=module:function")
+    parser.add_argument("--rtol", type=float, default=1e-5)
+    parser.add_argument("--atol", type=float, default=1e-6)
+    parser.add_argument("--golden", help="დაფიქსირებული გამომავალი (pickle) ეტალონად")
+    parser.add_argument("--save-golden", help="ეტალონის გამომავლის შენახვა (pickle)")
+    parser.add_argument("--output", default=str(BENCHMARK_RESULTS_PATH),
+                        help="შედეგების JSON Lines ფაილი")
+    args = parser.parse_args()
+
+    engines = {name: ENGINES[name] for name in args.engines.split(",") if name}
+    for item in args.engine:
+        name, spec = item.split("=", 1)
+        engines[name] = (spec, {})
+
+    log.info("=" * 60)
+    log.info("AIbetuchio - ფიჩერების ბენჩმარკი")
+    log.info("=" * 60)
+
+    matches = _load_matches(args)
+    config = {"source": args.source, "matches": len(matches)}
+    if args.source == "synthetic":
+        config.update(teams=args.teams, seasons=args.seasons,
+                      divisions=args.divisions, seed=args.seed)
+    log.info(f"მონაცემები: {config}")
+
+    golden, reference_name = args.golden, "golden"
+    if golden is None and not args.save_golden and args.source == "synthetic" \
+            and all(config[k] == v for k, v in BENCHMARK_GOLDEN_CONFIG.items()):
+        golden, reference_name = str(BENCHMARK_GOLDEN_PATH), "baseline"
+    reference = pd.read_pickle(golden) if golden else None
+    if reference is not None:
+        log.info(f"ეტალონი: {golden}")
+    else:
+        reference_name = None
+    records = []
+    failed = False
+
+    ctx = mp.get_context("spawn")
+    for name, (spec, kwargs) in engines.items():
+        with ctx.Pool(1) as pool:
+            featured, stats = pool.apply(_run_engine, (spec, kwargs, matches))
+
+        record = {"engine": name, "spec": spec, "kwargs": kwargs, **config, **stats}
+        if reference is None:
+            reference, reference_name = featured, name
+            if args.save_golden:
+                featured.to_pickle(args.save_golden)
+                log.info(f"ეტალონი შენახულია: {args.save_golden}")
+        else:
+            problems = compare_features(reference, featured, rtol=args.rtol, atol=args.atol)
+            record.update(reference=reference_name, equivalent=not problems,
+                          mismatches=problems)
+            failed |= bool(problems)
+
+        records.append(record)
+        peak = f"{stats['peak_rss_mb']:.1f} MB" if stats["peak_rss_mb"] is not None else "N/A"
+        status = ""
+        if "equivalent" in record:
+            status = " | ✓ ეკვივალენტური" if record["equivalent"] else \
+                f" | ✗ {len(record['mismatches'])} შეუსაბამობა"
+        log.info(f"{name:>10}: {stats['seconds']:.2f} წმ, {stats['rows_per_sec']} მატჩი/წმ, "
+                 f"ცხრილი {stats['frame_mb']:.1f} MB, პიკური RSS {peak}{status}")
+        for problem in record.get("mismatches", [])[:10]:
+            log.warning(f"  {problem}")
+
+    append_results(args.output, records)
+    log.info(f"შედეგები ჩაწერილია: {args.output}")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ load_dotenv()
 
 from src.telegram.bot import create_bot
 from src.data.db_manager import init_database
+from src.ml.inference_client import get_inference_client
 from src.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -30,6 +31,9 @@ def main():
         )
         return
 
+    # მოდელი და პროგნოზები ფონურად იტვირთება, პირველი ბრძანება აღარ ელოდება
+    get_inference_client().warm_up_async()
+
     log.info("ბოტი იწყებს მუშაობას...")
     bot = create_bot(token)
     bot.run_polling(drop_pending_updates=True)
@@ -0,0 +1,78 @@
+"""პროგნოზების წინასწარი დათვლის განრიგი (APScheduler).
+
+- ყოველ PRECOMPUTE_INTERVAL_MIN წუთში: თუ მონაცემები ან მოდელი შეიცვალა,
+  ახალი/დაუსრულებელი მატჩები ფასდება და იწერება predictions ცხრილში;
+- ყოველდღე DATA_REFRESH_HOUR საათზე: CSV-ების განახლება და მაშინვე დათვლა;
+  --retrain-ით ახალი მატჩების შემდეგ მოდელიც ინკრემენტულად ახლდება.
+"""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from apscheduler.schedulers.blocking import BlockingScheduler
+
+from src.config import PRECOMPUTE_INTERVAL_MIN, DATA_REFRESH_HOUR
+from src.data.db_manager import init_database
+from src.ml.precompute import precompute_predictions, refresh_data
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def refresh_and_precompute(retrain: bool = False):
+    inserted = 0
+    try:
+        inserted = refresh_data()
+    except Exception as e:
+        log.error(f"მონაცემების განახლების შეცდომა: {e}")
+    if retrain and inserted:
+        try:
+            from src.ml.jobs import training_lock
+            from src.ml.trainer import MatchPredictor
+            with training_lock() as acquired:
+                if acquired:
+                    MatchPredictor().train_incremental()
+                else:
+                    log.info("გაწვრთნა უკვე მიმდინარეობს - ინკრემენტული გამოტოვებულია")
+        except Exception as e:
+            log.error(f"ინკრემენტული გადაწვრთნის შეცდომა: {e}")
+    precompute_predictions()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIbetuchio პროგნოზების განრიგი")
+    parser.add_argument("--once", action="store_true",
+                        help="ერთი დათვლა და გასვლა (განრიგის გარეშე)")
+    parser.add_argument("--force", action="store_true",
+                        help="დათვლა ცვლილებების შემოწმების გარეშე")
+    parser.add_argument("--retrain", action="store_true",
+                        help="ყოველდღიური განახლების შემდეგ მოდელის ინკრემენტული გადაწვრთნა")
+    args = parser.parse_args()
+
+    log.info("=" * 60)
+    log.info("AIbetuchio - პროგნოზების განრიგი")
+    log.info("=" * 60)
+
+    init_database()
+    precompute_predictions(force=args.force)
+    if args.once:
+        return
+
+    scheduler = BlockingScheduler()
+    scheduler.add_job(precompute_predictions, "interval", minutes=PRECOMPUTE_INTERVAL_MIN,
+                      id="precompute", max_instances=1, coalesce=True)
+    if DATA_REFRESH_HOUR is not None:
+        scheduler.add_job(refresh_and_precompute, "cron", hour=DATA_REFRESH_HOUR,
+                          kwargs={"retrain": args.retrain}, id="refresh",
+                          max_instances=1, coalesce=True)
+    log.info(f"განრიგი: დათვლა ყოველ {PRECOMPUTE_INTERVAL_MIN} წთ-ში, "
+             f"განახლება {DATA_REFRESH_HOUR}:00-ზე")
+    try:
+        scheduler.start()
+    except (KeyboardInterrupt, SystemExit):
+        log.info("განრიგი გაჩერდა")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""ლოკალური ინფერენსის სერვერის გაშვება (ბოტი და ვებ გვერდები მას მიმართავენ)."""
+import sys
+import os
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import INFERENCE_HOST, INFERENCE_PORT
+from src.data.db_manager import init_database
+from src.ml.inference_server import serve
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIbetuchio ინფერენსის სერვერი")
+    parser.add_argument("--host", default=INFERENCE_HOST)
+    parser.add_argument("--port", type=int, default=INFERENCE_PORT)
+    args = parser.parse_args()
+
+    log.info("=" * 60)
+    log.info("AIbetuchio - ინფერენსის სერვერი")
+    log.info("=" * 60)
+
+    init_database()
+    serve(args.host, args.port)
+
+
+if __name__ == "__main__":
+    main()
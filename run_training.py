@@ -1,8 +1,10 @@
 """მოდელის გაწვრთნა."""
 import sys
 import os
+import argparse
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from src.ml.jobs import training_lock
 from src.ml.trainer import MatchPredictor
 from src.data.db_manager import init_database
 from src.utils.logger import get_logger
@@ -11,24 +13,79 @@ log = get_logger(__name__)
 
 
 def main():
+    parser = argparse.ArgumentParser(description="AIbetuchio მოდელის გაწვრთნა")
+    parser.add_argument("--shadow", action="store_true",
+                        help="ახალი მოდელი shadow-ად (ჩემპიონთან ერთად ფასდება, არ ცვლის მას)")
+    parser.add_argument("--per-division", action="store_true",
+                        help="თითო ლიგის მოდელი + გლობალური fallback (პარალელურად, ოჯახად)")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="გაწვრთნა დისკზე არსებული float32 შარდებიდან (შეზღუდული მეხსიერება)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="წინა მოდელის განახლება ახალი მატჩებით (დრიფტისას - სრული)")
+    parser.add_argument("--prune", type=int, metavar="K",
+                        help="დამატებით ტოპ-K ფიჩერის მოდელი shadow-ად (permutation importance)")
+    args = parser.parse_args()
+
     log.info("=" * 60)
     log.info("AIbetuchio - მოდელის გაწვრთნა")
     log.info("=" * 60)
 
     init_database()
 
-    trainer = MatchPredictor()
-    results = trainer.train()
+    with training_lock() as acquired:
+        if not acquired:
+            log.error("სხვა გაწვრთნა უკვე მიმდინარეობს (worker ან სხვა პროცესი)")
+            sys.exit(1)
+        trainer = MatchPredictor()
+        if args.incremental:
+            results = trainer.train_incremental(shadow=args.shadow)
+        elif args.out_of_core:
+            results = trainer.train_out_of_core(shadow=args.shadow)
+        else:
+            results = trainer.train(shadow=args.shadow, per_division=args.per_division,
+                                    prune_top_k=args.prune)
 
-    if results:
+    if results.get("mode") == "unchanged":
+        log.info(f"ახალი მატჩები არ არის - ვერსია {results['version']} უცვლელია")
+    elif results:
         log.info("\n" + "=" * 40)
         log.info("შედეგები:")
-        log.info(f"  მოდელი: {results['model_type']}")
-        log.info(f"  Accuracy: {results['accuracy']:.4f} ({results['accuracy']*100:.1f}%)")
-        log.info(f"  Log Loss: {results['log_loss']:.4f}")
-        log.info(f"  XGBoost Accuracy: {results['xgb_accuracy']:.4f}")
-        log.info(f"  LR Accuracy: {results['lr_accuracy']:.4f}")
+        log.info(f"  მოდელი: {results['model_type']} (ვერსია {results['version']}"
+                 f"{', shadow' if args.shadow else ''})")
+        if results["accuracy"] is not None:
+            log.info(f"  Accuracy: {results['accuracy']:.4f} ({results['accuracy']*100:.1f}%)")
+            log.info(f"  Log Loss: {results['log_loss']:.4f}")
+        if results.get("mode") == "incremental":
+            log.info(f"  ინკრემენტული: {results['base_version']} + {results['update_rows']} "
+                     f"მატჩი, {results['duration_sec']:.1f}s (შეფასება - ბოლო "
+                     f"{results['test_size']} გადადებულ მატჩზე)")
+            log.info(f"  განახლებამდე ({results['new_rows']} ახალ მატჩზე): "
+                     f"{results['pre_update_accuracy']:.4f} / {results['pre_update_log_loss']:.4f}")
+        else:
+            if results.get("fallback_reason"):
+                log.info(f"  სრული გადაწვრთნა: {results['fallback_reason']}")
+            log.info(f"  XGBoost Accuracy: {results['xgb_accuracy']:.4f}")
+            log.info(f"  LR Accuracy: {results['lr_accuracy']:.4f}")
+            for division, info in results.get("divisions", {}).items():
+                log.info(f"  {division}: {info['model_type']} ვალიდაცია "
+                         f"{info['valid_log_loss']:.4f} (გლობალური "
+                         f"{info['global_valid_log_loss']:.4f}), test {info['log_loss']:.4f} "
+                         f"(გლობალური {info['global_log_loss']:.4f})"
+                         f"{' - გამოიყენება' if info['used'] else ''}")
         log.info(f"  Train/Test: {results['train_size']}/{results['test_size']}")
+        for stage, info in results.get("memory", {}).items():
+            log.info(f"  {stage}: {info['sec']:.1f}s, RSS {info['rss_mb'] or 0:.0f} MB "
+                     f"(პიკი {info['peak_rss_mb'] or 0:.0f} MB)")
+
+        pruning = results.get("pruning")
+        if pruning:
+            full, pruned = pruning["full"], pruning["pruned"]
+            log.info(f"\nტოპ-{pruning['top_k']} ფიჩერი (shadow {pruning['version']}, "
+                     f"ჯგუფები: {', '.join(pruning['groups'])}):")
+            for label, key, fmt in (("Accuracy", "accuracy", ".4f"), ("Log Loss", "log_loss", ".4f"),
+                                    ("სკორინგი ms/1k", "scoring_ms_per_1k", ".2f"),
+                                    ("ფიჩერები s", "features_sec", ".2f")):
+                log.info(f"  {label}: {full[key]:{fmt}} -> {pruned[key]:{fmt}}")
 
         if results.get("feature_importance"):
             log.info("\nTop 10 ფიჩერი:")
@@ -0,0 +1,48 @@
+"""ფონური გაწვრთნის worker: training_jobs რიგიდან job-ების შესრულება.
+
+job-ებს მოდელის გვერდი (ვებ) აყენებს რიგში; worker-ი მათ სათითაოდ
+ასრულებს და პროგრესს ბაზაში წერს (src/ml/jobs.py).
+"""
+import sys
+import os
+import time
+import argparse
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config import JOB_POLL_SEC
+from src.data.db_manager import init_database
+from src.ml.jobs import run_next_job
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AIbetuchio გაწვრთნის worker")
+    parser.add_argument("--once", action="store_true",
+                        help="რიგის ერთი job-ის შესრულება და გასვლა")
+    parser.add_argument("--poll", type=float, default=JOB_POLL_SEC,
+                        help="რიგის შემოწმების ინტერვალი (წამი)")
+    args = parser.parse_args()
+
+    log.info("=" * 60)
+    log.info("AIbetuchio - გაწვრთნის worker")
+    log.info("=" * 60)
+
+    init_database()
+
+    if args.once:
+        status = run_next_job()
+        log.info(f"job: {status}" if status else "რიგი ცარიელია")
+        return
+
+    try:
+        while True:
+            if run_next_job() is None:
+                time.sleep(args.poll)
+    except (KeyboardInterrupt, SystemExit):
+        log.info("worker გაჩერდა")
+
+
+if __name__ == "__main__":
+    main()
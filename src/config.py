@@ -38,11 +38,88 @@ SEASON_LABELS = {
 FOOTBALL_DATA_BASE_URL = "https://www.football-data.co.uk/mmz4281/{season}/{league}.csv"
 
 # === ML კონფიგურაცია ===
+# ნაკადების ბიუჯეტი: პროცესები x XGBoost x BLAS ნაკადები (src/utils/concurrency.py)
+CPU_BUDGET = int(os.getenv("CPU_BUDGET", "0")) or os.cpu_count() or 1
 MODEL_PATH = MODELS_DIR / "match_predictor.joblib"
 MODEL_METADATA_PATH = MODELS_DIR / "model_metadata.json"
+MODEL_VERSIONS_DIR = MODELS_DIR / "versions"  # ვერსიონირებული არტეფაქტები (src/ml/artifacts.py)
+MODEL_POINTER_PATH = MODELS_DIR / "CURRENT"  # მიმდინარე ვერსიის მიმთითებელი
+MODEL_SHADOWS_PATH = MODELS_DIR / "SHADOWS"  # shadow ვერსიების სია (JSON)
+MODEL_REGISTRY_LOCK_PATH = MODELS_DIR / "registry.lock"  # CURRENT/SHADOWS-ის ცვლილებები
+MODEL_KEEP_VERSIONS = 5
+# "numpy" - ექსპორტირებული NumPy runtime (src/ml/runtime.py), "native" - sklearn/xgboost
+MODEL_RUNTIME = os.getenv("MODEL_RUNTIME", "numpy")
+# ჰიპერპარამეტრების ძებნა (src/ml/search.py)
+SEARCH_BUDGET_SEC = 180  # ძებნის დროის ბიუჯეტი
+SEARCH_CANDIDATES = 27  # საწყისი შემთხვევითი კონფიგურაციები
+SEARCH_ETA = 3  # ყოველ საფეხურზე რჩება 1/eta, ხეები x eta
+SEARCH_MIN_ROUNDS = 50
+SEARCH_MAX_ROUNDS = 1000
+EARLY_STOPPING_ROUNDS = 30
+# XGBoost-ის მშობლიური გაწვრთნა (src/ml/boosting.py)
+XGB_TREE_METHOD = "hist"
+XGB_NTHREAD = CPU_BUDGET  # ნაგულისხმევი; პულებში - plan()-ის წილი
+XGB_MAX_BIN = 256
+XGB_VALID_FRACTION = 0.1  # train-ის ბოლო ნაწილი early stopping-ისთვის
+# ინკრემენტული გადაწვრთნა (MatchPredictor.train_incremental, src/ml/drift.py)
+INCREMENTAL_MAX_ROUNDS = 50  # მაქს. დამატებული boosting რაუნდი ერთ განახლებაზე
+INCREMENTAL_MAX_NEW_FRACTION = 0.5  # ახალი/ნასწავლი სტრიქონები - ზემოთ სრული გადაწვრთნა
+INCREMENTAL_PSI_THRESHOLD = 0.25  # ფიჩერის PSI - ზემოთ დრიფტია
+INCREMENTAL_REFERENCE_DAYS = 365  # PSI-ის შედარების ფანჯარა (სწავლების ბოლო დღეები)
+INCREMENTAL_LOGLOSS_TOLERANCE = 0.05  # log-loss-ის დასაშვები გაუარესება ახალ მატჩებზე
+INCREMENTAL_HOLDOUT_FRACTION = 0.2  # ახალი მატჩების ბოლო ნაწილი - განახლებული მოდელის შეფასება
+# out-of-core გაწვრთნა (MatchPredictor.train_out_of_core, src/ml/shards.py)
+TRAIN_SHARD_DIR = PROCESSED_DIR / "shards"  # float32 შარდები data_version-ის მიხედვით
+TRAIN_EXTERNAL_MEMORY = os.getenv("TRAIN_EXTERNAL_MEMORY", "0") == "1"  # ExtMemQuantileDMatrix
+TRAIN_LR_MAX_ROWS = 200_000  # LR baseline - ბოლო N სასწავლი სტრიქონი
+# ლიგების მოდელები (MatchPredictor.train(per_division=True))
+DIVISION_WORKERS = CPU_BUDGET  # ზედა ზღვარი, ბიუჯეტის ფარგლებში
+DIVISION_MIN_TRAIN_ROWS = 300  # ნაკლები მატჩით ლიგა გლობალურ მოდელს იყენებს
+DIVISION_VALID_FRACTION = 0.2  # train-ის ბოლო ნაწილი: ლიგის მოდელის არჩევა და მარშრუტი
+DIVISION_MIN_VALID_ROWS = 50
+# ფონური გაწვრთნა (src/ml/jobs.py, run_worker.py)
+TRAINING_LOCK_PATH = MODELS_DIR / "training.lock"  # ერთდროულად მხოლოდ ერთი გაწვრთნა
+JOB_POLL_SEC = 2  # worker-ის რიგის შემოწმება და გვერდის განახლება
+# permutation importance და ფიჩერების შემცირება (src/ml/importance.py)
+IMPORTANCE_REPEATS = 5  # არევის გამეორებები თითო სვეტზე
+IMPORTANCE_WORKERS = CPU_BUDGET
+# walk-forward ბექტესტი (src/ml/backtest.py)
+BACKTEST_MIN_TRAIN_DAYS = 365  # პირველი ფოლდის წინ მინიმალური ისტორია
+BACKTEST_WORKERS = CPU_BUDGET
+BACKTEST_XGB_PARAMS = {"max_depth": 3, "learning_rate": 0.05, "subsample": 0.8,
+                       "colsample_bytree": 0.8}
 MIN_EDGE_THRESHOLD = 0.05  # 5% მინიმალური edge value bet-ისთვის
 FORM_WINDOW = 5  # ბოლო 5 მატჩის ფორმა
 ROLLING_WINDOW = 5  # rolling average ფანჯარა
+FORM_WINDOWS = [3, 5, 10]  # მრავალფანჯრიანი ფორმა (src/data/form_engine.py)
+FORM_HALF_LIVES = [3, 6]  # EWMA ფორმის ნახევარ-დაშლა (მატჩებში)
+# რეიტინგები (src/data/ratings.py)
+ELO_INITIAL = 1500.0
+ELO_K = 20.0
+ELO_HOME_ADVANTAGE = 60.0  # Elo ქულები სახლის მოედნისთვის
+PI_LEARNING_RATE = 0.035  # Pi-ratings λ
+PI_CATCHUP_RATE = 0.7  # Pi-ratings γ (სახლი/გასვლა ურთიერთგავლენა)
+# ნაგულისხმევად გამოსათვლელი ფიჩერების ჯგუფები (src/data/feature_registry.py)
+FEATURE_GROUPS = ["form", "h2h", "strength", "standings", "ratings", "odds"]
+
+# === ინფერენსის სერვერი (src/ml/inference_server.py) ===
+INFERENCE_HOST = os.getenv("INFERENCE_HOST", "127.0.0.1")
+INFERENCE_PORT = int(os.getenv("INFERENCE_PORT", "8765"))
+INFERENCE_MAX_WAIT_MS = 5  # რამდენ ხანს ელოდება ბატჩი დამატებით მოთხოვნებს
+INFERENCE_MAX_BATCH = 64
+INFERENCE_TIMEOUT_SEC = 30  # კლიენტის ტაიმაუტი
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", "1"))  # მცირე ბატჩებზე მეტი ნაკადი არ ჩქარობს
+
+# === წინასწარი დათვლა (run_scheduler.py) ===
+PRECOMPUTE_INTERVAL_MIN = 10  # რამდენ წუთში ერთხელ მოწმდება ახალი მონაცემები/მოდელი
+DATA_REFRESH_HOUR = 6  # ყოველდღიური CSV განახლების საათი (None - გამორთულია)
+LIVE_METRICS_DAYS = 365  # ჩემპიონი vs shadow: ბოლო N დღის მატჩები (მოდელის გვერდი)
+
+# === ბენჩმარკები ===
+BENCHMARK_RESULTS_PATH = BASE_DIR / "benchmarks" / "results.jsonl"
+# ბაზისური (სტრიქონ-სტრიქონ) create_features-ის გამომავალი ამ სინთეტიკურ მონაცემებზე
+BENCHMARK_GOLDEN_PATH = BASE_DIR / "benchmarks" / "golden_baseline.pkl.gz"
+BENCHMARK_GOLDEN_CONFIG = {"teams": 20, "seasons": 4, "divisions": 10, "seed": 0}
 
 # === სვეტების კონფიგურაცია ===
 # football-data.co.uk CSV სვეტები, რომლებიც გვჭირდება
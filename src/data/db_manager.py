@@ -1,4 +1,6 @@
 import sqlite3
+from datetime import datetime
+import numpy as np
 import pandas as pd
 from src.config import DB_PATH, DB_DIR
 from src.utils.logger import get_logger
@@ -96,12 +98,118 @@ def init_database():
             notes TEXT
         )
     """)
+    # kind: NULL/"final" - გამოქვეყნებული მოდელი, "trial" - ძებნის ცდა, "pruned" - შემცირებული
+    # importance: permutation importance JSON-ად (src/ml/importance.py)
+    _ensure_columns(conn, "model_runs", {"kind": "TEXT", "duration_sec": "REAL",
+                                         "importance": "TEXT"})
+
+    # მატჩების ცვლილებების მთვლელი (ქეშების ინვალიდაციისთვის)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+
+    # წინასწარ დათვლილი პროგნოზები (src/ml/precompute.py)
+    _ensure_columns(conn, "predictions", {"model_version": "TEXT"})
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_predictions_date ON predictions(date)")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_predictions_model_date
+        ON predictions(model_version, date)
+    """)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_predictions_match_model
+        ON predictions(match_id, model_version)
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS prediction_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            model_version TEXT,
+            data_version INTEGER,
+            scored INTEGER,
+            load_sec REAL,
+            score_sec REAL,
+            write_sec REAL,
+            status TEXT,
+            notes TEXT
+        )
+    """)
+    _ensure_columns(conn, "prediction_runs", {"shadow_versions": "TEXT"})
+    # დასრულებული მატჩები, რომლებსაც ვერსია ვერ აფასებს (ისტორია/ფიჩერები აკლია)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS unscorable_matches (
+            match_id INTEGER,
+            model_version TEXT,
+            recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (match_id, model_version)
+        )
+    """)
+
+    # ფონური გაწვრთნის job-ები (src/ml/jobs.py, run_worker.py)
+    _create_training_jobs(conn)
 
     conn.commit()
     conn.close()
     log.info("ბაზა ინიციალიზებულია")
 
 
+def _ensure_columns(conn, table: str, columns: dict):
+    """არსებულ ცხრილში დაკლებული სვეტების დამატება (ძველი ბაზების მიგრაცია)."""
+    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    for name, sql_type in columns.items():
+        if name not in existing:
+            conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {sql_type}")
+            log.info(f"{table}: დაემატა სვეტი {name}")
+
+
+def _create_training_jobs(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS training_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP,
+            heartbeat_at TIMESTAMP,
+            mode TEXT,
+            shadow INTEGER DEFAULT 0,
+            status TEXT,
+            stage TEXT,
+            progress REAL DEFAULT 0,
+            message TEXT,
+            cancel_requested INTEGER DEFAULT 0,
+            worker_pid INTEGER,
+            result TEXT,
+            error TEXT
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_training_jobs_status ON training_jobs(status)")
+
+
+def _bump_data_version(conn):
+    """matches ცხრილის ცვლილების აღრიცხვა (იმავე ტრანზაქციაში)."""
+    conn.execute("""
+        UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+        WHERE id = 1
+    """)
+
+
+def get_data_version() -> int:
+    """matches ცხრილის ცვლილებების მთვლელი (0, თუ ცხრილი ჯერ არ არსებობს)."""
+    conn = get_connection()
+    try:
+        row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+        return row[0] if row else 0
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
 def insert_matches(df: pd.DataFrame):
     """მატჩების ჩასმა ბაზაში (დუბლიკატების იგნორი)."""
     conn = get_connection()
@@ -128,6 +236,11 @@ def insert_matches(df: pd.DataFrame):
             inserted += 1
         except Exception as e:
             log.debug(f"ჩასმის შეცდომა: {e}")
+    if conn.total_changes:
+        try:
+            _bump_data_version(conn)
+        except sqlite3.OperationalError:
+            log.debug("data_version ცხრილი არ არსებობს (init_database არ გაშვებულა)")
     conn.commit()
     conn.close()
     log.info(f"ჩასმულია {inserted} მატჩი")
@@ -151,6 +264,14 @@ def get_all_matches(division: str = None, season: str = None) -> pd.DataFrame:
     return df
 
 
+def get_divisions() -> list:
+    """ბაზაში არსებული დივიზიონები."""
+    conn = get_connection()
+    rows = conn.execute("SELECT DISTINCT division FROM matches ORDER BY division").fetchall()
+    conn.close()
+    return [row[0] for row in rows if row[0]]
+
+
 def get_matches_for_prediction(division: str = None) -> pd.DataFrame:
     """მატჩების წამოღება პროგნოზისთვის (ყველა სვეტით)."""
     conn = get_connection()
@@ -172,8 +293,8 @@ def insert_prediction(prediction: dict):
         INSERT INTO predictions
         (match_id, date, home_team, away_team, division,
          prob_home, prob_draw, prob_away, predicted_result, confidence,
-         actual_result, is_correct)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+         actual_result, is_correct, model_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         prediction.get("match_id"),
         prediction.get("date"),
@@ -187,11 +308,189 @@ def insert_prediction(prediction: dict):
         prediction.get("confidence"),
         prediction.get("actual_result"),
         prediction.get("is_correct"),
+        prediction.get("model_version"),
     ))
     conn.commit()
     conn.close()
 
 
+PREDICTION_FIELDS = [
+    "match_id", "date", "home_team", "away_team", "division",
+    "prob_home", "prob_draw", "prob_away", "predicted_result", "confidence",
+    "actual_result", "is_correct", "model_version",
+]
+
+
+def upsert_predictions(predictions: list) -> int:
+    """პროგნოზების ბატჩური ჩაწერა (match_id + model_version უკვე არსებობს -> განახლება)."""
+    if not predictions:
+        return 0
+    updates = ", ".join(f"{f} = excluded.{f}" for f in PREDICTION_FIELDS
+                        if f not in ("match_id", "model_version"))
+    conn = get_connection()
+    conn.executemany(f"""
+        INSERT INTO predictions ({", ".join(PREDICTION_FIELDS)})
+        VALUES ({", ".join("?" * len(PREDICTION_FIELDS))})
+        ON CONFLICT(match_id, model_version) DO UPDATE SET
+            {updates}, created_at = CURRENT_TIMESTAMP
+    """, [tuple(p.get(f) for f in PREDICTION_FIELDS) for p in predictions])
+    conn.commit()
+    conn.close()
+    return len(predictions)
+
+
+def get_match_ids_to_score(model_versions: list) -> list:
+    """მატჩები, რომლებსაც რომელიმე ვერსიის პროგნოზი არ აქვთ ან ის ჯერ არ დასრულებულა.
+
+    ვერსიისთვის შეუფასებლად მონიშნული მატჩები (mark_unscorable) გამოტოვებულია.
+    """
+    conn = get_connection()
+    ids = set()
+    for model_version in model_versions:
+        rows = conn.execute("""
+            SELECT m.id FROM matches m
+            LEFT JOIN predictions p ON p.match_id = m.id AND p.model_version = ?
+            WHERE (p.id IS NULL OR p.actual_result IS NULL
+                   OR (m.ftr IS NOT NULL AND p.actual_result != m.ftr))
+              AND NOT EXISTS (SELECT 1 FROM unscorable_matches u
+                              WHERE u.match_id = m.id AND u.model_version = ?)
+        """, (model_version, model_version)).fetchall()
+        ids.update(row[0] for row in rows)
+    conn.close()
+    return sorted(ids)
+
+
+def mark_unscorable(match_ids: list, model_version: str) -> int:
+    """ვერსიამ ვერ შეაფასა (create_features-მა NaN ფიჩერების გამო ამოაგდო).
+
+    ინიშნება მხოლოდ დასრულებული მატჩები - მათი წინა ისტორია აღარ იცვლება;
+    მომავალი მატჩები (მაგ. კოეფიციენტების გარეშე) შემდეგ გაშვებაზე ისევ მოწმდება.
+    """
+    if not match_ids:
+        return 0
+    conn = get_connection()
+    before = conn.total_changes
+    conn.executemany("""
+        INSERT OR IGNORE INTO unscorable_matches (match_id, model_version)
+        SELECT id, ? FROM matches WHERE id = ? AND ftr IS NOT NULL
+    """, [(model_version, int(match_id)) for match_id in match_ids])
+    conn.commit()
+    marked = conn.total_changes - before
+    conn.close()
+    return marked
+
+
+def get_live_model_metrics(cutoffs: dict, since: str = None) -> pd.DataFrame:
+    """დასრულებულ მატჩებზე შენახული პროგნოზების შედარება ვერსიების მიხედვით.
+
+    cutoffs: {ვერსია: თარიღი} - მხოლოდ ეს ვერსიები (ჩემპიონი და shadow-ები) და
+    თითოეულის მხოლოდ ამ თარიღის შემდეგი მატჩები (სწავლებაში არ ყოფილა).
+    შედარება ერთსა და იმავე მატჩებზეა (ყველა ვერსიას აქვს პროგნოზი).
+    """
+    if not cutoffs:
+        return pd.DataFrame()
+    query = f"""
+        SELECT match_id, date, model_version, prob_home, prob_draw, prob_away,
+               actual_result, is_correct
+        FROM predictions
+        WHERE actual_result IS NOT NULL
+          AND model_version IN ({",".join("?" * len(cutoffs))})
+    """
+    params = list(cutoffs)
+    if since:
+        query += " AND date >= ?"
+        params.append(since)
+    conn = get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    if df.empty:
+        return df
+
+    cutoff = df["model_version"].map(lambda v: str(cutoffs[v] or "")[:10])
+    df = df[df["date"].astype(str).str[:10] > cutoff]
+    common = df.groupby("match_id")["model_version"].transform("nunique") == len(cutoffs)
+    df = df[common]
+    if df.empty:
+        return df
+    probs = df[["prob_home", "prob_draw", "prob_away"]].to_numpy()
+    picked = probs[range(len(df)), df["actual_result"].map({"H": 0, "D": 1, "A": 2}).to_numpy()]
+    df = df.assign(nll=-np.log(np.clip(picked, 1e-15, 1.0)))
+    return (df.groupby("model_version")
+              .agg(matches=("match_id", "size"), accuracy=("is_correct", "mean"),
+                   log_loss=("nll", "mean"))
+              .reset_index().sort_values("log_loss"))
+
+
+def get_precomputed_predictions(model_version: str, n: int = None, division: str = None,
+                                since: str = None, until: str = None,
+                                team: str = None) -> pd.DataFrame:
+    """წინასწარ დათვლილი პროგნოზები Predictor.predict_matches-ის ფორმატში."""
+    query = """
+        SELECT p.date AS Date, p.home_team AS HomeTeam, p.away_team AS AwayTeam,
+               p.division AS Div, m.ftr AS FTR,
+               m.odds_home AS B365H, m.odds_draw AS B365D, m.odds_away AS B365A,
+               p.prob_away AS prob_A, p.prob_draw AS prob_D, p.prob_home AS prob_H,
+               p.predicted_result AS predicted, p.confidence,
+               COALESCE(p.is_correct, 0) AS is_correct
+        FROM predictions p JOIN matches m ON m.id = p.match_id
+        WHERE p.model_version = ?
+    """
+    params = [model_version]
+    if division:
+        query += " AND p.division = ?"
+        params.append(division)
+    if since:
+        query += " AND p.date >= ?"
+        params.append(str(since)[:10])
+    if until:
+        query += " AND p.date <= ?"
+        params.append(str(until)[:10])
+    if team:
+        query += " AND (lower(p.home_team) LIKE ? OR lower(p.away_team) LIKE ?)"
+        params += [f"%{team.strip().lower()}%"] * 2
+    if n is not None:
+        # ბოლო n თარიღით, შემდეგ ქრონოლოგიურად
+        query = f"SELECT * FROM ({query} ORDER BY p.date DESC, p.match_id DESC LIMIT ?)"
+        params.append(int(n))
+    query += " ORDER BY Date"
+    conn = get_connection()
+    df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def insert_prediction_run(run: dict):
+    """პროგნოზების წინასწარი დათვლის გაშვების ჩანაწერი."""
+    conn = get_connection()
+    conn.execute("""
+        INSERT INTO prediction_runs
+        (started_at, finished_at, model_version, shadow_versions, data_version,
+         scored, load_sec, score_sec, write_sec, status, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, tuple(run.get(f) for f in (
+        "started_at", "finished_at", "model_version", "shadow_versions", "data_version",
+        "scored", "load_sec", "score_sec", "write_sec", "status", "notes",
+    )))
+    conn.commit()
+    conn.close()
+
+
+def get_last_prediction_run() -> dict | None:
+    """ბოლო წარმატებული წინასწარი დათვლა."""
+    conn = get_connection()
+    try:
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("""
+            SELECT * FROM prediction_runs WHERE status = 'ok' ORDER BY id DESC LIMIT 1
+        """).fetchone()
+        return dict(row) if row else None
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
 def get_predictions(division: str = None, date: str = None) -> pd.DataFrame:
     conn = get_connection()
     query = "SELECT * FROM predictions WHERE 1=1"
@@ -243,8 +542,8 @@ def insert_model_run(run: dict):
     conn.execute("""
         INSERT INTO model_runs
         (model_type, accuracy, log_loss, train_size, test_size,
-         features_used, parameters, notes)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+         features_used, parameters, notes, kind, duration_sec, importance)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """, (
         run.get("model_type"),
         run.get("accuracy"),
@@ -254,18 +553,190 @@ def insert_model_run(run: dict):
         run.get("features_used"),
         run.get("parameters"),
         run.get("notes"),
+        run.get("kind"),
+        run.get("duration_sec"),
+        run.get("importance"),
     ))
     conn.commit()
     conn.close()
 
 
-def get_model_runs() -> pd.DataFrame:
+def insert_model_runs(runs: list):
+    """რამდენიმე ჩანაწერი ერთ ტრანზაქციაში (ძებნის ცდები)."""
+    conn = get_connection()
+    conn.executemany("""
+        INSERT INTO model_runs
+        (model_type, accuracy, log_loss, train_size, test_size,
+         features_used, parameters, notes, kind, duration_sec, importance)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [tuple(run.get(f) for f in (
+        "model_type", "accuracy", "log_loss", "train_size", "test_size",
+        "features_used", "parameters", "notes", "kind", "duration_sec", "importance",
+    )) for run in runs])
+    conn.commit()
+    conn.close()
+
+
+def get_model_runs(include_trials: bool = False) -> pd.DataFrame:
     conn = get_connection()
-    df = pd.read_sql_query("SELECT * FROM model_runs ORDER BY run_date DESC", conn)
+    query = "SELECT * FROM model_runs"
+    try:
+        if not include_trials:
+            conn.execute("SELECT kind FROM model_runs LIMIT 0")
+            query += " WHERE kind IS NULL OR kind != 'trial'"
+    except sqlite3.OperationalError:
+        pass  # ძველი ბაზა kind სვეტის გარეშე
+    df = pd.read_sql_query(query + " ORDER BY run_date DESC", conn)
     conn.close()
     return df
 
 
+# queued -> running -> done/error/cancelled; cancelling - გაუქმება მოთხოვნილია
+TRAINING_JOB_ACTIVE = ("queued", "running", "cancelling")
+TRAINING_JOB_FIELDS = ("started_at", "finished_at", "heartbeat_at", "status", "stage",
+                       "progress", "message", "worker_pid", "result", "error")
+
+
+def enqueue_training_job(mode: str, shadow: bool = False) -> tuple:
+    """გაწვრთნის job რიგში (single-flight): აბრუნებს (id, შეიქმნა თუ არა).
+
+    თუ აქტიური job უკვე არსებობს, ახალი არ იქმნება - ბრუნდება არსებულის id.
+    """
+    conn = get_connection()
+    conn.isolation_level = None
+    try:
+        _create_training_jobs(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(f"""
+            SELECT id FROM training_jobs
+            WHERE status IN ({",".join("?" * len(TRAINING_JOB_ACTIVE))})
+            ORDER BY id LIMIT 1
+        """, TRAINING_JOB_ACTIVE).fetchone()
+        if row:
+            conn.execute("COMMIT")
+            return row[0], False
+        cursor = conn.execute("""
+            INSERT INTO training_jobs (created_at, mode, shadow, status, progress)
+            VALUES (?, ?, ?, 'queued', 0)
+        """, (datetime.now().isoformat(), mode, int(shadow)))
+        conn.execute("COMMIT")
+        return cursor.lastrowid, True
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+def claim_next_training_job(worker_pid: int) -> dict | None:
+    """რიგის პირველი job-ის ატომური აღება (queued -> running)."""
+    conn = get_connection()
+    conn.isolation_level = None
+    conn.row_factory = sqlite3.Row
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute("""
+            SELECT id FROM training_jobs WHERE status = 'queued' ORDER BY id LIMIT 1
+        """).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        now = datetime.now().isoformat()
+        conn.execute("""
+            UPDATE training_jobs
+            SET status = 'running', started_at = ?, heartbeat_at = ?, worker_pid = ?
+            WHERE id = ?
+        """, (now, now, worker_pid, row["id"]))
+        job = conn.execute("SELECT * FROM training_jobs WHERE id = ?", (row["id"],)).fetchone()
+        conn.execute("COMMIT")
+        return dict(job)
+    except sqlite3.OperationalError:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        return None
+    finally:
+        conn.close()
+
+
+def update_training_job(job_id: int, **fields):
+    """job-ის ველების განახლება (TRAINING_JOB_FIELDS)."""
+    unknown = set(fields) - set(TRAINING_JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"უცნობი ველები: {unknown}")
+    if not fields:
+        return
+    conn = get_connection()
+    conn.execute(f"UPDATE training_jobs SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?",
+                 (*fields.values(), job_id))
+    conn.commit()
+    conn.close()
+
+
+def request_training_job_cancel(job_id: int) -> bool:
+    """გაუქმების მოთხოვნა: რიგში მყოფი მაშინვე უქმდება, მიმდინარე - შემდეგ საკონტროლო წერტილზე."""
+    conn = get_connection()
+    cursor = conn.execute(f"""
+        UPDATE training_jobs
+        SET cancel_requested = 1,
+            status = CASE WHEN status = 'queued' THEN 'cancelled' ELSE 'cancelling' END,
+            finished_at = CASE WHEN status = 'queued' THEN ? ELSE finished_at END
+        WHERE id = ? AND status IN ({",".join("?" * len(TRAINING_JOB_ACTIVE))})
+    """, (datetime.now().isoformat(), job_id, *TRAINING_JOB_ACTIVE))
+    conn.commit()
+    conn.close()
+    return cursor.rowcount > 0
+
+
+def fail_orphaned_training_jobs(message: str) -> int:
+    """running/cancelling job-ები, რომელთა worker-იც აღარ არსებობს -> error."""
+    conn = get_connection()
+    try:
+        cursor = conn.execute("""
+            UPDATE training_jobs SET status = 'error', error = ?, finished_at = ?
+            WHERE status IN ('running', 'cancelling')
+        """, (message, datetime.now().isoformat()))
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.OperationalError:
+        return 0
+    finally:
+        conn.close()
+
+
+def get_training_job(job_id: int) -> dict | None:
+    jobs = _select_training_jobs("WHERE id = ?", (job_id,))
+    return jobs[0] if jobs else None
+
+
+def get_active_training_job() -> dict | None:
+    """მიმდინარე ან რიგში მყოფი job (ერთზე მეტი single-flight-ის გამო არ არსებობს)."""
+    jobs = _select_training_jobs(
+        f"WHERE status IN ({','.join('?' * len(TRAINING_JOB_ACTIVE))}) ORDER BY id LIMIT 1",
+        TRAINING_JOB_ACTIVE)
+    return jobs[0] if jobs else None
+
+
+def get_training_jobs(limit: int = 20, statuses: tuple = None) -> list:
+    """ბოლო job-ები (ახლიდან ძველისკენ)."""
+    where, params = "", ()
+    if statuses:
+        where, params = f"WHERE status IN ({','.join('?' * len(statuses))})", tuple(statuses)
+    return _select_training_jobs(f"{where} ORDER BY id DESC LIMIT ?", (*params, limit))
+
+
+def _select_training_jobs(clause: str, params: tuple) -> list:
+    conn = get_connection()
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(f"SELECT * FROM training_jobs {clause}", params).fetchall()
+        return [dict(row) for row in rows]
+    except sqlite3.OperationalError:
+        return []  # ცხრილი ჯერ არ შექმნილა
+    finally:
+        conn.close()
+
+
 def update_prediction_result(prediction_id: int, actual_result: str):
     """პროგნოზის შედეგის განახლება."""
     conn = get_connection()
@@ -1,15 +1,52 @@
 import pandas as pd
 import numpy as np
 from src.config import FORM_WINDOW, ROLLING_WINDOW
-from src.utils.helpers import implied_probabilities
+from src.data.feature_registry import FeatureGroup, register, resolve_groups
+from src.data.form_engine import MultiFormState, form_columns
+from src.data.ratings import RATING_FEATURES, RatingState
+from src.data.team_history import TeamHistory, H2HHistory, result_points
+from src.utils.helpers import (
+    implied_probabilities_matrix, favorite_index, overround, shin_z,
+)
 from src.utils.logger import get_logger
 
 log = get_logger(__name__)
 
-
-def create_features(df: pd.DataFrame) -> pd.DataFrame:
+H2H_WINDOW = 5  # ბოლო 5 პირისპირ შეხვედრა
+ODDS_COLUMNS = ["B365H", "B365D", "B365A"]
+STANDINGS_MIN_MATCHES = 20  # ლიგის ცხრილი/სიძლიერე მინიმუმ 20 მატჩიდან
+
+# DB სვეტი -> football-data.co.uk სვეტი
+COLUMN_MAP = {
+    "home_team": "HomeTeam", "away_team": "AwayTeam",
+    "fthg": "FTHG", "ftag": "FTAG", "ftr": "FTR",
+    "hthg": "HTHG", "htag": "HTAG", "htr": "HTR",
+    "home_shots": "HS", "away_shots": "AS",
+    "home_shots_target": "HST", "away_shots_target": "AST",
+    "home_corners": "HC", "away_corners": "AC",
+    "odds_home": "B365H", "odds_draw": "B365D", "odds_away": "B365A",
+    "division": "Div", "season": "Season",
+}
+NUMERIC_COLUMNS = ["FTHG", "FTAG", "HS", "AS", "HST", "AST", "HC", "AC",
+                   "B365H", "B365D", "B365A"]
+# სვეტები, რომლებსაც streaming მდგომარეობები კითხულობენ
+STATE_COLUMNS = ["HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR",
+                 "HS", "AS", "HST", "AST", "HC", "AC"]
+CATEGORY_COLUMNS = ["Div", "HomeTeam", "AwayTeam", "FTR", "HTR", "Season"]
+EMIT_COLUMN = "_emit"  # create_features(emit=...) შიდა სვეტი
+
+
+def create_features(df: pd.DataFrame, columns: list = None,
+                    compact: bool = False, emit=None) -> pd.DataFrame:
     """მატჩის მონაცემებიდან ML ფიჩერების შექმნა.
 
+    columns: საჭირო ფიჩერ სვეტები (მაგ. მოდელის feature_columns).
+    ითვლება მხოლოდ ის ჯგუფები, რომლებსაც ეს სვეტები ეკუთვნის;
+    None -> კონფიგურაციის FEATURE_GROUPS.
+    compact: შედეგის დატიპების შემცირება (იხ. compact_frame).
+    emit: df-ის სტრიქონებთან გასწორებული bool მასკა - ისტორია მთლიანად
+    გადათამაშდება, მაგრამ ფიჩერები ითვლება და ბრუნდება მხოლოდ ამ სტრიქონებზე.
+
     მნიშვნელოვანი: ყველა ფიჩერი იყენებს მხოლოდ მატჩამდე
     ხელმისაწვდომ ინფორმაციას (no data leakage).
     """
@@ -18,313 +55,507 @@ def create_features(df: pd.DataFrame) -> pd.DataFrame:
 
     log.info("ფიჩერების შექმნა იწყება...")
 
-    df = df.copy()
-    df["Date"] = pd.to_datetime(df["date"] if "date" in df.columns else df["Date"])
-    df = df.sort_values("Date").reset_index(drop=True)
-
-    # სვეტების სტანდარტიზაცია (DB-ში სხვა სახელებია)
-    col_map = {
-        "home_team": "HomeTeam", "away_team": "AwayTeam",
-        "fthg": "FTHG", "ftag": "FTAG", "ftr": "FTR",
-        "home_shots": "HS", "away_shots": "AS",
-        "home_shots_target": "HST", "away_shots_target": "AST",
-        "home_corners": "HC", "away_corners": "AC",
-        "odds_home": "B365H", "odds_draw": "B365D", "odds_away": "B365A",
-        "division": "Div",
-    }
-    for old, new in col_map.items():
-        if old in df.columns and new not in df.columns:
-            df[new] = df[old]
-
-    # რიცხვითი სვეტების კონვერტაცია
-    num_cols = ["FTHG", "FTAG", "HS", "AS", "HST", "AST", "HC", "AC",
-                "B365H", "B365D", "B365A"]
-    for col in num_cols:
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    all_features = []
-
-    # თითოეული ლიგისთვის ცალკე
-    for div in df["Div"].unique():
-        div_df = df[df["Div"] == div].copy()
-        div_features = _compute_division_features(div_df)
-        all_features.append(div_features)
-
-    result = pd.concat(all_features, ignore_index=True)
-
-    # კოეფიციენტებიდან ფიჩერები (ლიგისგან დამოუკიდებელი)
-    result = _add_odds_features(result)
+    if emit is not None:
+        df = df.assign(**{EMIT_COLUMN: np.asarray(emit, dtype=bool)})
+    df = prepare_matches(df)
+    groups = [g for g in resolve_groups(columns) if _has_inputs(df, g)]
+    streaming = [g for g in groups if g.streaming]
+
+    if streaming:
+        div_frames = []
+        feat_frames = []
+
+        # თითოეული ლიგისთვის ცალკე
+        for div in df["Div"].unique():
+            div_df = df[df["Div"] == div]
+            if emit is not None and not div_df[EMIT_COLUMN].any():
+                continue  # ამ ლიგიდან არაფერია მოთხოვნილი
+            div_df, div_feats = _compute_division_features(div_df, streaming)
+            div_frames.append(div_df)
+            feat_frames.append(div_feats)
+
+        if not div_frames:
+            return pd.DataFrame()
+        result = pd.concat(div_frames, ignore_index=True)
+        feats = pd.concat(feat_frames, ignore_index=True)
+        for col in feats.columns:
+            result[col] = feats[col].to_numpy()
+        del div_frames, feat_frames, feats
+    else:
+        result = df if emit is None else df[df[EMIT_COLUMN]].reset_index(drop=True)
+    if emit is not None:
+        result = result.drop(columns=[EMIT_COLUMN])
+
+    # ლიგისგან დამოუკიდებელი ჯგუფები (მაგ. კოეფიციენტები)
+    for group in groups:
+        if not group.streaming:
+            group_feats = group.compute(result)
+            for col in group_feats.columns:
+                result[col] = group_feats[col].to_numpy()
 
     # NaN-ების წაშლა (პირველი რამდენიმე მატჩს არ ექნება ისტორია)
-    feature_cols = [c for c in result.columns if c.startswith("feat_")]
+    feature_cols = [c for g in groups for c in g.columns if c in result.columns]
     before = len(result)
     result = result.dropna(subset=feature_cols)
+    if compact:
+        result = compact_frame(result)
     log.info(f"ფიჩერები შექმნილია: {len(result)} მატჩი ({before - len(result)} ამოღებული)")
 
     return result
 
 
-def _compute_division_features(df: pd.DataFrame) -> pd.DataFrame:
-    """ერთი ლიგის ფიჩერების გამოთვლა."""
+def prepare_matches(df: pd.DataFrame) -> pd.DataFrame:
+    """სვეტების სტანდარტიზაცია, თარიღით დალაგება და რიცხვითი კონვერტაცია."""
+    # DB-ში სხვა სახელებია - გადარქმევით, დუბლირების გარეშე
+    rename = {old: new for old, new in COLUMN_MAP.items()
+              if old in df.columns and new not in df.columns}
+    if "date" in df.columns:
+        df = df.drop(columns=["Date"], errors="ignore")
+        rename["date"] = "Date"
+    df = df.rename(columns=rename)
+
+    df["Date"] = pd.to_datetime(df["Date"])
     df = df.sort_values("Date").reset_index(drop=True)
 
-    # ყველა გუნდის ისტორიის აგება
-    teams = set(df["HomeTeam"].unique()) | set(df["AwayTeam"].unique())
-    team_history = {t: [] for t in teams}
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
 
-    features_list = []
 
-    for idx, row in df.iterrows():
-        home = row["HomeTeam"]
-        away = row["AwayTeam"]
+def build_feature_states(df: pd.DataFrame, columns: list = None) -> tuple:
+    """ერთი ლიგის ისტორიის გადათამაშება point-query-სთვის.
 
-        home_hist = team_history[home]
-        away_hist = team_history[away]
+    df: prepare_matches-ის შედეგი (თარიღით დალაგებული), ერთი ლიგის მატჩებით.
+    აბრუნებს (ჯგუფები, streaming მდგომარეობები) - მდგომარეობები
+    ასახავს ყველა გადმოცემულ მატჩს.
+    """
+    groups = [g for g in resolve_groups(columns) if _has_inputs(df, g)]
+    streaming = [g for g in groups if g.streaming]
+    states = [group.compute() for group in streaming]
 
-        feats = {}
+    state_cols = [c for c in STATE_COLUMNS if c in df.columns]
+    for row in df[state_cols].to_dict("records"):
+        for state in states:
+            state.update(row)
+    return groups, states
 
-        # --- გუნდის ფორმა ---
-        feats.update(_form_features(home_hist, "home", home))
-        feats.update(_form_features(away_hist, "away", away))
 
-        # --- H2H ---
-        feats.update(_h2h_features(home_hist + away_hist, home, away))
+def point_features(groups: list, states: list, home: str, away: str,
+                   odds: tuple = None) -> dict:
+    """ერთი (შესაძლოა ჰიპოთეტური) მატჩის ფიჩერები არსებული მდგომარეობიდან.
 
-        # --- ლიგის სიძლიერის ინდექსი ---
-        feats.update(_strength_index(df.iloc[:idx], home, away))
+    odds: (H, D, A) კოეფიციენტები; მათ გარეშე კოეფიციენტების ფიჩერები NaN-ია.
+    """
+    feats = {}
+    for state in states:
+        feats.update(state.features(home, away))
+
+    row = pd.DataFrame([odds if odds is not None else [np.nan] * len(ODDS_COLUMNS)],
+                       columns=ODDS_COLUMNS, dtype=np.float64)
+    for group in groups:
+        if not group.streaming:
+            feats.update(group.compute(row).iloc[0].to_dict())
+    return feats
 
-        features_list.append(feats)
 
-        # ისტორიის განახლება (მატჩის შემდეგ)
-        match_info = {
-            "date": row["Date"],
-            "home": home, "away": away,
-            "fthg": row.get("FTHG", 0), "ftag": row.get("FTAG", 0),
-            "ftr": row.get("FTR", ""),
-            "hs": row.get("HS"), "as_": row.get("AS"),
-            "hst": row.get("HST"), "ast": row.get("AST"),
-            "hc": row.get("HC"), "ac": row.get("AC"),
-        }
-        team_history[home].append(match_info)
-        team_history[away].append(match_info)
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """მეხსიერების დაზოგვა: float32 ფიჩერები, კატეგორიული ტექსტები, მცირე int-ები.
 
-    feat_df = pd.DataFrame(features_list)
-    return pd.concat([df.reset_index(drop=True), feat_df], axis=1)
+    FTR კატეგორიულია (int8 კოდები), ამიტომ შედარებები ("H"/"D"/"A") უცვლელად მუშაობს.
+    """
+    for col in df.columns:
+        series = df[col]
+        if col.startswith("feat_") or col in ODDS_COLUMNS:
+            df[col] = series.astype(np.float32)
+        elif col in CATEGORY_COLUMNS:
+            df[col] = series.astype("category")
+        elif col in NUMERIC_COLUMNS or col in ("id", "HTHG", "HTAG"):
+            numeric = pd.to_numeric(series, errors="coerce")
+            if numeric.notna().all():
+                df[col] = pd.to_numeric(numeric.astype(np.int64), downcast="integer")
+            else:
+                df[col] = numeric.astype(np.float32)
+    return df
 
 
-def _form_features(history: list, prefix: str, team: str) -> dict:
-    """გუნდის ფორმის ფიჩერები ბოლო N მატჩიდან."""
-    feats = {}
-    window = FORM_WINDOW
-
-    if len(history) < 3:
-        # არასაკმარისი ისტორია
-        feats[f"feat_{prefix}_form_points"] = np.nan
-        feats[f"feat_{prefix}_form_goals_scored"] = np.nan
-        feats[f"feat_{prefix}_form_goals_conceded"] = np.nan
-        feats[f"feat_{prefix}_form_win_rate"] = np.nan
-        feats[f"feat_{prefix}_form_shots"] = np.nan
-        feats[f"feat_{prefix}_form_shots_target"] = np.nan
-        feats[f"feat_{prefix}_form_corners"] = np.nan
-        return feats
+def _has_inputs(df: pd.DataFrame, group: FeatureGroup) -> bool:
+    missing = [c for c in group.inputs if c not in df.columns]
+    if missing:
+        log.debug(f"ჯგუფი '{group.name}' გამოტოვებულია, აკლია: {missing}")
+        return False
+    return True
 
-    recent = history[-window:]
-    points = []
-    goals_scored = []
-    goals_conceded = []
-    shots = []
-    shots_target = []
-    corners = []
-
-    for m in recent:
-        is_home = m["home"] == team
-        gs = m["fthg"] if is_home else m["ftag"]
-        gc = m["ftag"] if is_home else m["fthg"]
-        goals_scored.append(gs or 0)
-        goals_conceded.append(gc or 0)
-
-        ftr = m["ftr"]
-        if (is_home and ftr == "H") or (not is_home and ftr == "A"):
-            points.append(3)
-        elif ftr == "D":
-            points.append(1)
-        else:
-            points.append(0)
-
-        s = m["hs"] if is_home else m["as_"]
-        st = m["hst"] if is_home else m["ast"]
-        c = m["hc"] if is_home else m["ac"]
-        if s is not None and not (isinstance(s, float) and np.isnan(s)):
-            shots.append(s)
-        if st is not None and not (isinstance(st, float) and np.isnan(st)):
-            shots_target.append(st)
-        if c is not None and not (isinstance(c, float) and np.isnan(c)):
-            corners.append(c)
-
-    n = len(recent)
-    feats[f"feat_{prefix}_form_points"] = sum(points) / n if n else 0
-    feats[f"feat_{prefix}_form_goals_scored"] = np.mean(goals_scored) if goals_scored else 0
-    feats[f"feat_{prefix}_form_goals_conceded"] = np.mean(goals_conceded) if goals_conceded else 0
-    wins = sum(1 for p in points if p == 3)
-    feats[f"feat_{prefix}_form_win_rate"] = wins / n if n else 0
-    feats[f"feat_{prefix}_form_shots"] = np.mean(shots) if shots else np.nan
-    feats[f"feat_{prefix}_form_shots_target"] = np.mean(shots_target) if shots_target else np.nan
-    feats[f"feat_{prefix}_form_corners"] = np.mean(corners) if corners else np.nan
 
-    return feats
+def _compute_division_features(df: pd.DataFrame, groups: list) -> tuple:
+    """ერთი ლიგის ფიჩერების გამოთვლა ქრონოლოგიურ ერთ გავლაში.
 
+    აბრუნებს (თარიღით დალაგებული მატჩები, ფიჩერების DataFrame).
+    """
+    df = df.sort_values("Date").reset_index(drop=True)
 
-def _h2h_features(combined_history: list, home: str, away: str) -> dict:
-    """პირისპირ შეხვედრების ფიჩერები."""
-    feats = {}
+    states = [group.compute() for group in groups]
+    features_list = []
 
-    h2h = [m for m in combined_history
-           if (m["home"] == home and m["away"] == away) or
-              (m["home"] == away and m["away"] == home)]
+    emit = df[EMIT_COLUMN].to_numpy() if EMIT_COLUMN in df.columns else None
 
-    h2h = h2h[-5:]  # ბოლო 5
+    state_cols = [c for c in STATE_COLUMNS if c in df.columns]
+    for i, row in enumerate(df[state_cols].to_dict("records")):
+        if emit is None or emit[i]:
+            # ფიჩერები მხოლოდ მატჩამდე არსებული მდგომარეობიდან
+            feats = {}
+            for state in states:
+                feats.update(state.features(row["HomeTeam"], row["AwayTeam"]))
+            features_list.append(feats)
 
-    if len(h2h) < 2:
-        feats["feat_h2h_home_wins"] = np.nan
-        feats["feat_h2h_draws"] = np.nan
-        feats["feat_h2h_away_wins"] = np.nan
-        feats["feat_h2h_home_goals_avg"] = np.nan
-        return feats
+        # მდგომარეობის განახლება (მატჩის შემდეგ)
+        for state in states:
+            state.update(row)
 
-    home_wins = 0
-    draws = 0
-    away_wins = 0
-    home_goals = []
-
-    for m in h2h:
-        if m["home"] == home:
-            if m["ftr"] == "H":
-                home_wins += 1
-            elif m["ftr"] == "D":
-                draws += 1
-            else:
-                away_wins += 1
-            home_goals.append(m["fthg"] or 0)
-        else:
-            if m["ftr"] == "A":
-                home_wins += 1
-            elif m["ftr"] == "D":
-                draws += 1
+    columns = [c for group in groups for c in group.columns]
+    if emit is not None:
+        df = df[emit].reset_index(drop=True)
+    return df, pd.DataFrame(features_list, columns=columns)
+
+
+class FormState:
+    """გუნდის ფორმა ბოლო FORM_WINDOW მატჩიდან."""
+
+    NAMES = ["points", "goals_scored", "goals_conceded", "win_rate",
+             "shots", "shots_target", "corners"]
+
+    def __init__(self):
+        self.history = {}
+
+    def _team(self, team: str) -> TeamHistory:
+        history = self.history.get(team)
+        if history is None:
+            history = self.history[team] = TeamHistory(FORM_WINDOW)
+        return history
+
+    def features(self, home: str, away: str) -> dict:
+        feats = {}
+        for team, prefix in [(home, "home"), (away, "away")]:
+            # features() მხოლოდ კითხულობს - ქეშირებული მდგომარეობა ნაკადებს შორის იზიარება
+            history = self.history.get(team)
+            if history is None or history.total < 3:
+                # არასაკმარისი ისტორია
+                stats = dict.fromkeys(self.NAMES, np.nan)
             else:
-                away_wins += 1
-            home_goals.append(m["ftag"] or 0)
+                stats = history.stats()
+            for name in self.NAMES:
+                feats[f"feat_{prefix}_form_{name}"] = stats[name]
+        return feats
 
-    n = len(h2h)
-    feats["feat_h2h_home_wins"] = home_wins / n
-    feats["feat_h2h_draws"] = draws / n
-    feats["feat_h2h_away_wins"] = away_wins / n
-    feats["feat_h2h_home_goals_avg"] = np.mean(home_goals)
+    def update(self, row: dict):
+        fthg = row.get("FTHG", 0)
+        ftag = row.get("FTAG", 0)
+        ftr = row.get("FTR", "")
+        self._team(row["HomeTeam"]).append(
+            _goals(fthg), _goals(ftag), result_points(ftr, True),
+            row.get("HS", np.nan), row.get("HST", np.nan), row.get("HC", np.nan), True,
+        )
+        self._team(row["AwayTeam"]).append(
+            _goals(ftag), _goals(fthg), result_points(ftr, False),
+            row.get("AS", np.nan), row.get("AST", np.nan), row.get("AC", np.nan), False,
+        )
 
-    return feats
 
+class H2HState:
+    """პირისპირ შეხვედრების ფიჩერები."""
 
-def _strength_index(past_matches: pd.DataFrame, home: str, away: str) -> dict:
-    """შეტევის/დაცვის სიძლიერის ინდექსი."""
-    feats = {}
+    def __init__(self):
+        self.history = H2HHistory(H2H_WINDOW)
+
+    def features(self, home: str, away: str) -> dict:
+        feats = {}
+
+        # ისტორიული ქცევა: H2H მატჩი ორივე გუნდის ისტორიაში ჩანდა,
+        # ამიტომ ბოლო H2H_WINDOW ჩანაწერი დუბლიკატებიდან აიღებოდა
+        total = self.history.total(home, away)
+        recent = self.history.recent(home, away)
+        if total < H2H_WINDOW:
+            recent = np.concatenate([recent[-(H2H_WINDOW - total):], recent])
+
+        if len(recent) < 2:
+            feats["feat_h2h_home_wins"] = np.nan
+            feats["feat_h2h_draws"] = np.nan
+            feats["feat_h2h_away_wins"] = np.nan
+            feats["feat_h2h_home_goals_avg"] = np.nan
+            return feats
+
+        home_won, draw, home_goals = self.history.perspective(home, away, recent)
+        n = len(recent)
+        home_wins = int(home_won.sum())
+        draws = int(draw.sum())
+        feats["feat_h2h_home_wins"] = home_wins / n
+        feats["feat_h2h_draws"] = draws / n
+        feats["feat_h2h_away_wins"] = (n - home_wins - draws) / n
+        feats["feat_h2h_home_goals_avg"] = float(home_goals.sum(dtype=np.float64)) / n
 
-    if len(past_matches) < 20:
-        feats["feat_home_attack_strength"] = np.nan
-        feats["feat_home_defense_strength"] = np.nan
-        feats["feat_away_attack_strength"] = np.nan
-        feats["feat_away_defense_strength"] = np.nan
-        feats["feat_home_league_position"] = np.nan
-        feats["feat_away_league_position"] = np.nan
         return feats
 
-    league_avg_home_goals = past_matches["FTHG"].mean()
-    league_avg_away_goals = past_matches["FTAG"].mean()
+    def update(self, row: dict):
+        self.history.append(
+            row["HomeTeam"], row["AwayTeam"],
+            _goals(row.get("FTHG", 0)), _goals(row.get("FTAG", 0)), row.get("FTR", ""),
+        )
 
-    if league_avg_home_goals == 0:
-        league_avg_home_goals = 1.0
-    if league_avg_away_goals == 0:
-        league_avg_away_goals = 1.0
 
-    for team, prefix in [(home, "home"), (away, "away")]:
-        home_matches = past_matches[past_matches["HomeTeam"] == team]
-        away_matches = past_matches[past_matches["AwayTeam"] == team]
+_NO_STRENGTH = np.zeros((2, 5))  # უცნობი გუნდი (features() მას არ ჩაწერს)
 
-        if len(home_matches) >= 3:
-            attack_home = home_matches["FTHG"].mean() / league_avg_home_goals
-            defense_home = home_matches["FTAG"].mean() / league_avg_away_goals
-        else:
-            attack_home = 1.0
-            defense_home = 1.0
 
-        if len(away_matches) >= 3:
-            attack_away = away_matches["FTAG"].mean() / league_avg_away_goals
-            defense_away = away_matches["FTHG"].mean() / league_avg_home_goals
-        else:
-            attack_away = 1.0
-            defense_away = 1.0
+class StrengthState:
+    """შეტევის/დაცვის სიძლიერის ინდექსი ლიგის საშუალოსთან მიმართებით.
 
-        feats[f"feat_{prefix}_attack_strength"] = (attack_home + attack_away) / 2
-        feats[f"feat_{prefix}_defense_strength"] = (defense_home + defense_away) / 2
+    ჯამები და რაოდენობები ინახება ინკრემენტულად, ამიტომ თითო მატჩი O(1)-ია.
+    """
 
-    # ლიგის პოზიცია (გამარტივებული - ქულებით)
-    standings = _compute_standings(past_matches)
-    feats["feat_home_league_position"] = standings.get(home, 10) / max(len(standings), 1)
-    feats["feat_away_league_position"] = standings.get(away, 10) / max(len(standings), 1)
+    def __init__(self):
+        self.matches = 0
+        self.league = np.zeros(4)  # FTHG ჯამი, FTHG რაოდ., FTAG ჯამი, FTAG რაოდ.
+        # გუნდზე: [მატჩები, გატანილი ჯამი/რაოდ., გაშვებული ჯამი/რაოდ.] სახლში და გასვლაზე
+        self.teams = {}
 
-    return feats
+    def _team(self, team: str) -> np.ndarray:
+        stats = self.teams.get(team)
+        if stats is None:
+            stats = self.teams[team] = np.zeros((2, 5))
+        return stats
 
+    @staticmethod
+    def _mean(total: float, count: float) -> float:
+        return total / count if count else np.nan
 
-def _compute_standings(df: pd.DataFrame) -> dict:
-    """ლიგის ცხრილის გამოთვლა."""
-    points = {}
+    def features(self, home: str, away: str) -> dict:
+        feats = {}
 
-    for _, row in df.iterrows():
-        home = row["HomeTeam"]
-        away = row["AwayTeam"]
-        ftr = row.get("FTR", "")
+        if self.matches < STANDINGS_MIN_MATCHES:
+            feats["feat_home_attack_strength"] = np.nan
+            feats["feat_home_defense_strength"] = np.nan
+            feats["feat_away_attack_strength"] = np.nan
+            feats["feat_away_defense_strength"] = np.nan
+            return feats
 
-        if home not in points:
-            points[home] = 0
-        if away not in points:
-            points[away] = 0
+        league_avg_home_goals = self._mean(self.league[0], self.league[1])
+        league_avg_away_goals = self._mean(self.league[2], self.league[3])
 
-        if ftr == "H":
-            points[home] += 3
-        elif ftr == "D":
-            points[home] += 1
-            points[away] += 1
-        elif ftr == "A":
-            points[away] += 3
+        if league_avg_home_goals == 0:
+            league_avg_home_goals = 1.0
+        if league_avg_away_goals == 0:
+            league_avg_away_goals = 1.0
 
-    # პოზიციის მინიჭება
-    sorted_teams = sorted(points.items(), key=lambda x: x[1], reverse=True)
-    positions = {}
-    for i, (team, _) in enumerate(sorted_teams, 1):
-        positions[team] = i
+        for team, prefix in [(home, "home"), (away, "away")]:
+            at_home, on_road = self.teams.get(team, _NO_STRENGTH)
 
-    return positions
+            if at_home[0] >= 3:
+                attack_home = self._mean(at_home[1], at_home[2]) / league_avg_home_goals
+                defense_home = self._mean(at_home[3], at_home[4]) / league_avg_away_goals
+            else:
+                attack_home = 1.0
+                defense_home = 1.0
 
+            if on_road[0] >= 3:
+                attack_away = self._mean(on_road[1], on_road[2]) / league_avg_away_goals
+                defense_away = self._mean(on_road[3], on_road[4]) / league_avg_home_goals
+            else:
+                attack_away = 1.0
+                defense_away = 1.0
 
-def _add_odds_features(df: pd.DataFrame) -> pd.DataFrame:
-    """კოეფიციენტებიდან ფიჩერების დამატება."""
-    df = df.copy()
+            feats[f"feat_{prefix}_attack_strength"] = (attack_home + attack_away) / 2
+            feats[f"feat_{prefix}_defense_strength"] = (defense_home + defense_away) / 2
 
-    if all(c in df.columns for c in ["B365H", "B365D", "B365A"]):
-        probs = df.apply(
-            lambda r: implied_probabilities(r["B365H"], r["B365D"], r["B365A"]),
-            axis=1
+        return feats
+
+    def update(self, row: dict):
+        fthg = _numeric(row.get("FTHG"))
+        ftag = _numeric(row.get("FTAG"))
+        home_ok = not np.isnan(fthg)
+        away_ok = not np.isnan(ftag)
+
+        self.matches += 1
+        if home_ok:
+            self.league[0] += fthg
+            self.league[1] += 1
+        if away_ok:
+            self.league[2] += ftag
+            self.league[3] += 1
+
+        for stats, scored, scored_ok, conceded, conceded_ok in [
+            (self._team(row["HomeTeam"])[0], fthg, home_ok, ftag, away_ok),
+            (self._team(row["AwayTeam"])[1], ftag, away_ok, fthg, home_ok),
+        ]:
+            stats[0] += 1
+            if scored_ok:
+                stats[1] += scored
+                stats[2] += 1
+            if conceded_ok:
+                stats[3] += conceded
+                stats[4] += 1
+
+
+class StandingsState:
+    """ლიგის პოზიცია (გამარტივებული - ქულებით)."""
+
+    def __init__(self):
+        self.matches = 0
+        # გუნდი -> [ქულები, პირველი გამოჩენის რიგი] (თანაბარ ქულებზე რიგი წყვეტს)
+        self.points = {}
+
+    def _position(self, team: str) -> int:
+        entry = self.points.get(team)
+        if entry is None:
+            return 10
+        pts, order = entry
+        return 1 + sum(
+            1 for p, o in self.points.values()
+            if p > pts or (p == pts and o < order)
         )
-        df["feat_implied_prob_home"] = probs.apply(lambda x: x[0])
-        df["feat_implied_prob_draw"] = probs.apply(lambda x: x[1])
-        df["feat_implied_prob_away"] = probs.apply(lambda x: x[2])
 
-        # კოეფიციენტებიდან ფავორიტის ინდიკატორი
-        df["feat_odds_favorite"] = df[["B365H", "B365D", "B365A"]].idxmin(axis=1)
-        df["feat_odds_favorite"] = df["feat_odds_favorite"].map({
-            "B365H": 0, "B365D": 1, "B365A": 2
-        })
+    def features(self, home: str, away: str) -> dict:
+        if self.matches < STANDINGS_MIN_MATCHES:
+            return {
+                "feat_home_league_position": np.nan,
+                "feat_away_league_position": np.nan,
+            }
+
+        n_teams = max(len(self.points), 1)
+        return {
+            "feat_home_league_position": self._position(home) / n_teams,
+            "feat_away_league_position": self._position(away) / n_teams,
+        }
 
-    return df
+    def update(self, row: dict):
+        home = row["HomeTeam"]
+        away = row["AwayTeam"]
+        ftr = row.get("FTR", "")
+
+        self.matches += 1
+        for team in (home, away):
+            if team not in self.points:
+                self.points[team] = [0, len(self.points)]
+
+        if ftr == "H":
+            self.points[home][0] += 3
+        elif ftr == "D":
+            self.points[home][0] += 1
+            self.points[away][0] += 1
+        elif ftr == "A":
+            self.points[away][0] += 3
+
+
+def _odds_features(df: pd.DataFrame) -> pd.DataFrame:
+    """კოეფიციენტებიდან ფიჩერები (მთელ მატრიცაზე ვექტორულად)."""
+    odds = df[ODDS_COLUMNS].to_numpy(dtype=np.float64)
+    probs = implied_probabilities_matrix(odds)
+
+    return pd.DataFrame({
+        "feat_implied_prob_home": probs[:, 0],
+        "feat_implied_prob_draw": probs[:, 1],
+        "feat_implied_prob_away": probs[:, 2],
+        # კოეფიციენტებიდან ფავორიტის ინდიკატორი (0=H, 1=D, 2=A)
+        "feat_odds_favorite": favorite_index(odds),
+    }, index=df.index)
+
+
+def _odds_devig_features(df: pd.DataFrame) -> pd.DataFrame:
+    """ბუკმეკერის მარჟა და margin-ის მოხსნის ალტერნატიული მეთოდები."""
+    odds = df[ODDS_COLUMNS].to_numpy(dtype=np.float64)
+    booksum = overround(odds)
+    shin = implied_probabilities_matrix(odds, method="shin")
+    power = implied_probabilities_matrix(odds, method="power")
+
+    return pd.DataFrame({
+        "feat_odds_overround": booksum,
+        "feat_odds_margin": booksum - 1,
+        "feat_shin_prob_home": shin[:, 0],
+        "feat_shin_prob_draw": shin[:, 1],
+        "feat_shin_prob_away": shin[:, 2],
+        "feat_shin_z": shin_z(odds),
+        "feat_power_prob_home": power[:, 0],
+        "feat_power_prob_draw": power[:, 1],
+        "feat_power_prob_away": power[:, 2],
+    }, index=df.index)
+
+
+def _goals(value):
+    """გოლების მნიშვნელობა (None/0 -> 0, NaN რჩება NaN)."""
+    return value or 0
+
+
+def _numeric(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+# === ჯგუფების რეგისტრაცია ===
+register(FeatureGroup(
+    name="form",
+    columns=tuple(f"feat_{prefix}_form_{name}"
+                  for prefix in ("home", "away") for name in FormState.NAMES),
+    inputs=("HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"),
+    compute=FormState,
+    streaming=True,
+))
+
+register(FeatureGroup(
+    name="form_multi",
+    columns=tuple(form_columns()),
+    inputs=("HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"),
+    compute=MultiFormState,
+    streaming=True,
+))
+
+register(FeatureGroup(
+    name="h2h",
+    columns=("feat_h2h_home_wins", "feat_h2h_draws",
+             "feat_h2h_away_wins", "feat_h2h_home_goals_avg"),
+    inputs=("HomeTeam", "AwayTeam", "FTHG", "FTAG", "FTR"),
+    compute=H2HState,
+    streaming=True,
+))
+
+register(FeatureGroup(
+    name="strength",
+    columns=("feat_home_attack_strength", "feat_home_defense_strength",
+             "feat_away_attack_strength", "feat_away_defense_strength"),
+    inputs=("HomeTeam", "AwayTeam", "FTHG", "FTAG"),
+    compute=StrengthState,
+    streaming=True,
+))
+
+register(FeatureGroup(
+    name="standings",
+    columns=("feat_home_league_position", "feat_away_league_position"),
+    inputs=("HomeTeam", "AwayTeam", "FTR"),
+    compute=StandingsState,
+    streaming=True,
+))
+
+register(FeatureGroup(
+    name="ratings",
+    columns=tuple(RATING_FEATURES),
+    inputs=("HomeTeam", "AwayTeam", "FTHG", "FTAG"),
+    compute=RatingState,
+    streaming=True,
+))
+
+register(FeatureGroup(
+    name="odds",
+    columns=("feat_implied_prob_home", "feat_implied_prob_draw",
+             "feat_implied_prob_away", "feat_odds_favorite"),
+    inputs=tuple(ODDS_COLUMNS),
+    compute=_odds_features,
+))
+
+register(FeatureGroup(
+    name="odds_devig",
+    columns=("feat_odds_overround", "feat_odds_margin",
+             "feat_shin_prob_home", "feat_shin_prob_draw", "feat_shin_prob_away",
+             "feat_shin_z",
+             "feat_power_prob_home", "feat_power_prob_draw", "feat_power_prob_away"),
+    inputs=tuple(ODDS_COLUMNS),
+    compute=_odds_devig_features,
+))
 
 
 def get_feature_columns(df: pd.DataFrame) -> list:
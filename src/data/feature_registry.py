@@ -0,0 +1,82 @@
+"""ფიჩერების ჯგუფების რეესტრი.
+
+თითოეული ჯგუფი აცხადებს თავის სახელს, სვეტებს, საჭირო შემავალ
+სვეტებს, ვერსიას და გამოთვლის ფუნქციას. create_features მხოლოდ
+იმ ჯგუფებს ითვლის, რომელთა სვეტებიც მოთხოვნილია.
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+from src.config import FEATURE_GROUPS
+
+
+@dataclass(frozen=True)
+class FeatureGroup:
+    """ფიჩერების ჯგუფის დეკლარაცია.
+
+    streaming=True: compute() აბრუნებს ლიგის მდგომარეობას
+    (features(home, away) / update(row)), რომელიც მატჩებს
+    ქრონოლოგიურად ერთ გავლაში ამუშავებს.
+    streaming=False: compute(df) აბრუნებს ფიჩერების DataFrame-ს
+    იმავე ინდექსით (მთელ ცხრილზე ერთბაშად).
+    """
+    name: str
+    columns: tuple
+    inputs: tuple
+    compute: Callable
+    version: int = 1
+    streaming: bool = False
+
+
+_REGISTRY: dict[str, FeatureGroup] = {}
+
+
+def register(group: FeatureGroup) -> FeatureGroup:
+    """ჯგუფის რეგისტრაცია (იგივე სახელით ხელახლა რეგისტრაცია ცვლის ძველს)."""
+    _REGISTRY[group.name] = group
+    return group
+
+
+def get_group(name: str) -> FeatureGroup:
+    if name not in _REGISTRY:
+        raise KeyError(f"უცნობი ფიჩერების ჯგუფი: {name}")
+    return _REGISTRY[name]
+
+
+def all_groups() -> list[FeatureGroup]:
+    return list(_REGISTRY.values())
+
+
+def column_owner(column: str) -> FeatureGroup | None:
+    """ჯგუფი, რომელიც მოცემულ სვეტს ითვლის."""
+    for group in _REGISTRY.values():
+        if column in group.columns:
+            return group
+    return None
+
+
+def resolve_groups(columns: list = None, groups: list = None) -> list[FeatureGroup]:
+    """საჭირო ჯგუფების განსაზღვრა მოთხოვნილი სვეტებიდან.
+
+    columns=None და groups=None -> კონფიგურაციის ნაგულისხმევი ჯგუფები.
+    """
+    if columns is None and groups is None:
+        groups = FEATURE_GROUPS
+
+    names = set(groups or [])
+    for col in columns or []:
+        owner = column_owner(col)
+        if owner is None:
+            raise KeyError(f"სვეტი არცერთ ფიჩერების ჯგუფს არ ეკუთვნის: {col}")
+        names.add(owner.name)
+
+    for name in names:
+        get_group(name)
+
+    # რეგისტრაციის თანმიმდევრობა = სვეტების სტაბილური რიგი
+    return [g for g in _REGISTRY.values() if g.name in names]
+
+
+def groups_signature(groups: list[FeatureGroup]) -> str:
+    """ჯგუფების ვერსიების ხელმოწერა (ქეშის გასაღებისთვის)."""
+    return ",".join(f"{g.name}:{g.version}" for g in groups)
@@ -0,0 +1,135 @@
+"""მრავალფანჯრიანი და ექსპონენციალურად შეწონილი ფორმა ერთ გავლაში.
+
+თითო გუნდზე ინახება კუმულატიური ჯამების ring buffer (max(windows) + 1
+ჩანაწერი) და EWMA მდგომარეობები. ნებისმიერი ფანჯრის სტატისტიკა ორი
+კუმულატიური ჯამის სხვაობაა, ამიტომ ახალი ფანჯრის დამატება თითქმის
+არაფერი ღირს.
+"""
+import numpy as np
+
+from src.config import FORM_WINDOWS, FORM_HALF_LIVES
+from src.data.team_history import result_points
+
+# ვექტორის ველები: მრიცხველი/მნიშვნელი წყვილები (NaN-ები არ ითვლება)
+_FIELDS = ["n", "points", "wins",
+           "goals_scored", "goals_scored_n", "goals_conceded", "goals_conceded_n",
+           "shots", "shots_n", "shots_target", "shots_target_n",
+           "corners", "corners_n"]
+STATS = ["points", "goals_scored", "goals_conceded", "win_rate",
+         "shots", "shots_target", "corners"]
+_NUM = np.array([_FIELDS.index(f) for f in
+                 ["points", "goals_scored", "goals_conceded", "wins",
+                  "shots", "shots_target", "corners"]])
+_DEN = np.array([_FIELDS.index(f) for f in
+                 ["n", "goals_scored_n", "goals_conceded_n", "n",
+                  "shots_n", "shots_target_n", "corners_n"]])
+
+MIN_HISTORY = 3  # FormState-ის მსგავსად: 3 მატჩზე ნაკლები -> NaN
+
+
+def _label(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(value).replace(".", "_")
+
+
+def form_columns(windows: list = None, half_lives: list = None) -> list:
+    """ფორმის ძრავის სვეტების სახელები."""
+    windows = FORM_WINDOWS if windows is None else windows
+    half_lives = FORM_HALF_LIVES if half_lives is None else half_lives
+    cols = []
+    for prefix in ("home", "away"):
+        for w in windows:
+            cols += [f"feat_{prefix}_form{w}_{stat}" for stat in STATS]
+        for hl in half_lives:
+            cols += [f"feat_{prefix}_ewm{_label(hl)}_{stat}" for stat in STATS]
+    return cols
+
+
+class TeamForm:
+    """ერთი გუნდის კუმულატიური ჯამები და EWMA მდგომარეობა."""
+
+    __slots__ = ("_cum", "_ewm", "total")
+
+    def __init__(self, max_window: int, n_half_lives: int):
+        self._cum = np.zeros((max_window + 1, len(_FIELDS)))
+        self._ewm = np.zeros((n_half_lives, len(_FIELDS)))
+        self.total = 0
+
+    def append(self, values: np.ndarray, decay: np.ndarray):
+        size = len(self._cum)
+        self._cum[(self.total + 1) % size] = self._cum[self.total % size] + values
+        self._ewm *= decay[:, None]
+        self._ewm += values
+        self.total += 1
+
+    def window_sums(self, windows: np.ndarray) -> np.ndarray:
+        """(len(windows), fields) ჯამები ბოლო W მატჩზე."""
+        size = len(self._cum)
+        start = np.maximum(self.total - windows, 0) % size
+        return self._cum[self.total % size] - self._cum[start]
+
+    def ewm_sums(self) -> np.ndarray:
+        return self._ewm
+
+
+class MultiFormState:
+    """ფორმა რამდენიმე ფანჯარაზე და ნახევარ-დაშლის პერიოდზე ერთდროულად."""
+
+    def __init__(self, windows: list = None, half_lives: list = None):
+        self.windows = np.array(FORM_WINDOWS if windows is None else windows, dtype=np.int64)
+        half_lives = FORM_HALF_LIVES if half_lives is None else half_lives
+        self.decay = 0.5 ** (1.0 / np.array(half_lives, dtype=np.float64))
+        self.columns = form_columns(self.windows.tolist(), half_lives)
+        self.teams = {}
+
+    def _team(self, team: str) -> TeamForm:
+        form = self.teams.get(team)
+        if form is None:
+            form = self.teams[team] = TeamForm(int(self.windows.max(initial=1)), len(self.decay))
+        return form
+
+    def team_values(self, team: str) -> np.ndarray:
+        """ყველა ფანჯრის და EWMA-ს საშუალოები ერთ ვექტორში."""
+        form = self.teams.get(team)  # მხოლოდ კითხვა: ქეშირებული მდგომარეობა არ იცვლება
+        n_rows = len(self.windows) + len(self.decay)
+        if form is None or form.total < MIN_HISTORY:
+            return np.full(n_rows * len(STATS), np.nan)
+        sums = np.vstack([form.window_sums(self.windows), form.ewm_sums()])
+        num = sums[:, _NUM]
+        den = sums[:, _DEN]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = np.where(den > 0, num / den, np.nan)
+        return values.ravel()
+
+    def features(self, home: str, away: str) -> dict:
+        values = np.concatenate([self.team_values(home), self.team_values(away)])
+        return dict(zip(self.columns, values.tolist()))
+
+    def update(self, row: dict):
+        ftr = row.get("FTR", "")
+        fthg = _value(row.get("FTHG"))
+        ftag = _value(row.get("FTAG"))
+        self._team(row["HomeTeam"]).append(_match_vector(
+            result_points(ftr, True), fthg, ftag,
+            _value(row.get("HS")), _value(row.get("HST")), _value(row.get("HC")),
+        ), self.decay)
+        self._team(row["AwayTeam"]).append(_match_vector(
+            result_points(ftr, False), ftag, fthg,
+            _value(row.get("AS")), _value(row.get("AST")), _value(row.get("AC")),
+        ), self.decay)
+
+
+def _value(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _match_vector(points, scored, conceded, shots, shots_target, corners) -> np.ndarray:
+    vec = np.zeros(len(_FIELDS))
+    vec[0] = 1
+    vec[1] = points
+    vec[2] = points == 3
+    for pos, value in ((3, scored), (5, conceded), (7, shots),
+                       (9, shots_target), (11, corners)):
+        if value == value:
+            vec[pos] = value
+            vec[pos + 1] = 1
+    return vec
@@ -0,0 +1,253 @@
+"""გუნდების რეიტინგები (Elo და Pi-ratings) ერთ ქრონოლოგიურ გავლაში.
+
+თითოეული მატჩის განახლება O(1)-ია, მდგომარეობა კი JSON-ად
+სერიალიზებადია (snapshot), ამიტომ ძრავის გაგრძელება შეიძლება
+ახალი შედეგების შემოსვლისას.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    ELO_INITIAL, ELO_K, ELO_HOME_ADVANTAGE,
+    PI_LEARNING_RATE, PI_CATCHUP_RATE,
+)
+
+RATING_FEATURES = [
+    "feat_home_elo",
+    "feat_away_elo",
+    "feat_elo_diff",
+    "feat_elo_expected_home",
+    "feat_home_pi_rating",
+    "feat_away_pi_rating",
+    "feat_pi_expected_goal_diff",
+]
+
+_PI_BASE = 10.0
+_PI_SCALE = 3.0
+
+
+def _pi_goal_diff(rating: float) -> float:
+    """Pi-რეიტინგიდან მოსალოდნელი გოლების სხვაობა."""
+    value = _PI_BASE ** (abs(rating) / _PI_SCALE) - 1
+    return value if rating >= 0 else -value
+
+
+def _pi_goal_diff_array(ratings: np.ndarray) -> np.ndarray:
+    return np.sign(ratings) * (_PI_BASE ** (np.abs(ratings) / _PI_SCALE) - 1)
+
+
+def _elo_goal_multiplier(goal_diff: float) -> float:
+    """Elo K-ს მასშტაბირება გოლების სხვაობით."""
+    goal_diff = abs(goal_diff)
+    if goal_diff <= 1:
+        return 1.0
+    if goal_diff == 2:
+        return 1.5
+    return (11 + goal_diff) / 8
+
+
+class RatingEngine:
+    """Elo (გოლების სხვაობით და სახლის უპირატესობით) + Pi-ratings.
+
+    გუნდების მდგომარეობა ინახება სიებში ინდექსით, რაც ცხელ ციკლს
+    მარტივ float ოპერაციებამდე ამცირებს.
+    """
+
+    __slots__ = ("k", "home_advantage", "initial", "learning_rate", "catchup_rate",
+                 "_index", "_elo", "_pi_home", "_pi_away", "matches")
+
+    def __init__(self, k: float = ELO_K, home_advantage: float = ELO_HOME_ADVANTAGE,
+                 initial: float = ELO_INITIAL, learning_rate: float = PI_LEARNING_RATE,
+                 catchup_rate: float = PI_CATCHUP_RATE):
+        self.k = k
+        self.home_advantage = home_advantage
+        self.initial = initial
+        self.learning_rate = learning_rate
+        self.catchup_rate = catchup_rate
+        self._index = {}
+        self._elo = []
+        self._pi_home = []
+        self._pi_away = []
+        self.matches = 0
+
+    def _team(self, team: str) -> int:
+        idx = self._index.get(team)
+        if idx is None:
+            idx = self._index[team] = len(self._elo)
+            self._elo.append(self.initial)
+            self._pi_home.append(0.0)
+            self._pi_away.append(0.0)
+        return idx
+
+    def _rating(self, team: str) -> tuple:
+        """(elo, pi_home, pi_away) ჩაწერის გარეშე; უცნობი გუნდი - საწყისი მნიშვნელობები."""
+        idx = self._index.get(team)
+        if idx is None:
+            return self.initial, 0.0, 0.0
+        return self._elo[idx], self._pi_home[idx], self._pi_away[idx]
+
+    def pre_match(self, home: str, away: str) -> dict:
+        """რეიტინგის ფიჩერები მატჩამდე არსებული მდგომარეობიდან (მხოლოდ კითხვა -
+        გაზიარებულ/ქეშირებულ ძრავზე ნაკადებიდან უსაფრთხოა)."""
+        elo_h, pi_h, _ = self._rating(home)
+        elo_a, _, pi_a = self._rating(away)
+        expected = 1.0 / (1.0 + 10.0 ** (-(elo_h + self.home_advantage - elo_a) / 400.0))
+        return dict(zip(RATING_FEATURES, (elo_h, elo_a, elo_h - elo_a, expected, pi_h, pi_a,
+                                          _pi_goal_diff(pi_h) - _pi_goal_diff(pi_a))))
+
+    def update(self, home: str, away: str, home_goals: float, away_goals: float):
+        """მატჩის შედეგით რეიტინგების განახლება (O(1))."""
+        self._update(self._team(home), self._team(away), home_goals, away_goals)
+
+    def _update(self, h: int, a: int, home_goals: float, away_goals: float):
+        if home_goals != home_goals or away_goals != away_goals:
+            return  # შედეგი უცნობია (NaN)
+
+        # --- Elo ---
+        elo = self._elo
+        expected = 1.0 / (1.0 + 10.0 ** (-(elo[h] + self.home_advantage - elo[a]) / 400.0))
+        goal_diff = home_goals - away_goals
+        score = 1.0 if goal_diff > 0 else (0.5 if goal_diff == 0 else 0.0)
+        delta = self.k * _elo_goal_multiplier(goal_diff) * (score - expected)
+        elo[h] += delta
+        elo[a] -= delta
+
+        # --- Pi-ratings ---
+        pi_home = self._pi_home
+        pi_away = self._pi_away
+        predicted = _pi_goal_diff(pi_home[h]) - _pi_goal_diff(pi_away[a])
+        error = abs(goal_diff - predicted)
+        psi = _PI_SCALE * math.log10(1 + error)
+        psi_home = psi if goal_diff > predicted else -psi
+
+        old = pi_home[h]
+        pi_home[h] = old + psi_home * self.learning_rate
+        pi_away[h] += (pi_home[h] - old) * self.catchup_rate
+
+        old = pi_away[a]
+        pi_away[a] = old - psi_home * self.learning_rate
+        pi_home[a] += (pi_away[a] - old) * self.catchup_rate
+
+        self.matches += 1
+
+    def process(self, home_teams, away_teams, home_goals, away_goals) -> np.ndarray:
+        """მატჩების ბლოკის დამუშავება ქრონოლოგიური რიგით.
+
+        აბრუნებს (n, len(RATING_FEATURES)) მასივს მატჩამდე რეიტინგებით.
+        ციკლში მხოლოდ რეიტინგები იწერება და ახლდება (იგივე _update ბირთვით,
+        რასაც update() იყენებს); წარმოებული სვეტები (სხვაობა, მოსალოდნელი
+        შედეგი) ბოლოს ვექტორულად ითვლება.
+        """
+        codes, uniques = pd.factorize(
+            np.concatenate([np.asarray(home_teams, dtype=object),
+                            np.asarray(away_teams, dtype=object)])
+        )
+        index = np.array([self._team(t) for t in uniques], dtype=np.int64)
+        n = len(codes) // 2
+        homes = index[codes[:n]].tolist()
+        aways = index[codes[n:]].tolist()
+        hg = np.asarray(home_goals, dtype=np.float64).tolist()
+        ag = np.asarray(away_goals, dtype=np.float64).tolist()
+
+        elo, pi_home, pi_away = self._elo, self._pi_home, self._pi_away
+        update = self._update
+        rows = []
+        append = rows.append
+        for h, a, gh, ga in zip(homes, aways, hg, ag):
+            append((elo[h], elo[a], pi_home[h], pi_away[a]))
+            update(h, a, gh, ga)
+
+        raw = np.array(rows, dtype=np.float64).reshape(-1, 4)
+        elo_h, elo_a, pi_h, pi_a = raw.T
+        out = np.empty((len(raw), len(RATING_FEATURES)))
+        out[:, 0] = elo_h
+        out[:, 1] = elo_a
+        out[:, 2] = elo_h - elo_a
+        out[:, 3] = 1.0 / (1.0 + 10.0 ** ((elo_a - elo_h - self.home_advantage) / 400.0))
+        out[:, 4] = pi_h
+        out[:, 5] = pi_a
+        out[:, 6] = _pi_goal_diff_array(pi_h) - _pi_goal_diff_array(pi_a)
+        return out
+
+    def ratings(self) -> pd.DataFrame:
+        """მიმდინარე რეიტინგების ცხრილი (Elo-ით დალაგებული)."""
+        teams = list(self._index)
+        table = pd.DataFrame({
+            "team": teams,
+            "elo": self._elo,
+            "pi_home": self._pi_home,
+            "pi_away": self._pi_away,
+        })
+        return table.sort_values("elo", ascending=False).reset_index(drop=True)
+
+    def snapshot(self) -> dict:
+        """მდგომარეობის JSON-ად სერიალიზებადი ასლი."""
+        return {
+            "params": {
+                "k": self.k,
+                "home_advantage": self.home_advantage,
+                "initial": self.initial,
+                "learning_rate": self.learning_rate,
+                "catchup_rate": self.catchup_rate,
+            },
+            "matches": self.matches,
+            "teams": {
+                team: [self._elo[i], self._pi_home[i], self._pi_away[i]]
+                for team, i in self._index.items()
+            },
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "RatingEngine":
+        engine = cls(**snapshot["params"])
+        for team, (elo, pi_home, pi_away) in snapshot["teams"].items():
+            idx = engine._team(team)
+            engine._elo[idx] = elo
+            engine._pi_home[idx] = pi_home
+            engine._pi_away[idx] = pi_away
+        engine.matches = snapshot.get("matches", 0)
+        return engine
+
+
+class RatingState:
+    """რეიტინგები, როგორც ფიჩერების ჯგუფის streaming მდგომარეობა."""
+
+    def __init__(self):
+        self.engine = RatingEngine()
+
+    def features(self, home: str, away: str) -> dict:
+        return self.engine.pre_match(home, away)
+
+    def update(self, row: dict):
+        self.engine.update(
+            row["HomeTeam"], row["AwayTeam"],
+            _goal_value(row.get("FTHG")), _goal_value(row.get("FTAG")),
+        )
+
+
+def _goal_value(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+def rate_matches(df: pd.DataFrame, engine: RatingEngine = None) -> pd.DataFrame:
+    """მატჩამდე რეიტინგები ყველა მატჩისთვის (df თარიღით დალაგებული უნდა იყოს).
+
+    სვეტები: HomeTeam, AwayTeam, FTHG, FTAG.
+    """
+    engine = engine or RatingEngine()
+    values = engine.process(df["HomeTeam"].to_numpy(), df["AwayTeam"].to_numpy(),
+                            df["FTHG"].to_numpy(), df["FTAG"].to_numpy())
+    return pd.DataFrame(values, columns=RATING_FEATURES, index=df.index)
+
+
+def ratings_as_of(df: pd.DataFrame, date) -> pd.DataFrame:
+    """რეიტინგების ცხრილი მოცემული თარიღის მდგომარეობით (ამ თარიღამდე მატჩებით)."""
+    dates = pd.to_datetime(df["Date"])
+    order = dates[dates < pd.Timestamp(date)].sort_values(kind="stable").index
+    past = df.loc[order]
+    engine = RatingEngine()
+    engine.process(past["HomeTeam"].to_numpy(), past["AwayTeam"].to_numpy(),
+                   past["FTHG"].to_numpy(), past["FTAG"].to_numpy())
+    return engine.ratings()
@@ -0,0 +1,141 @@
+"""გუნდების კომპაქტური მატჩების ისტორია (ring buffer)."""
+import numpy as np
+
+# ერთი მატჩი გუნდის პერსპექტივიდან
+MATCH_DTYPE = np.dtype([
+    ("goals_scored", "f4"),
+    ("goals_conceded", "f4"),
+    ("points", "i1"),
+    ("shots", "f4"),
+    ("shots_target", "f4"),
+    ("corners", "f4"),
+    ("is_home", "?"),
+])
+
+# პირისპირ მატჩი (first = წყვილის ანბანურად პირველი გუნდი)
+H2H_DTYPE = np.dtype([
+    ("first_is_home", "?"),
+    ("home_goals", "f4"),
+    ("away_goals", "f4"),
+    ("result", "i1"),  # 0 = H, 1 = D, 2 = A, 3 = უცნობი
+])
+
+
+def result_points(ftr, is_home: bool) -> int:
+    """მატჩის ქულები გუნდისთვის FTR-დან."""
+    if (is_home and ftr == "H") or (not is_home and ftr == "A"):
+        return 3
+    if ftr == "D":
+        return 1
+    return 0
+
+
+def _nan_mean(values: np.ndarray) -> float:
+    valid = ~np.isnan(values)
+    n = int(valid.sum())
+    if n == 0:
+        return np.nan
+    return float(values[valid].sum(dtype=np.float64)) / n
+
+
+class TeamHistory:
+    """გუნდის ბოლო N მატჩი ტიპიზირებულ ring buffer-ში.
+
+    მეხსიერება შეზღუდულია capacity-ით, ხოლო total ინახავს
+    გუნდის ყველა ნათამაშები მატჩის რაოდენობას.
+    """
+
+    __slots__ = ("_buf", "_pos", "total")
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(capacity, dtype=MATCH_DTYPE)
+        self._pos = 0
+        self.total = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    def append(self, goals_scored, goals_conceded, points,
+               shots, shots_target, corners, is_home):
+        """მატჩის დამატება (უძველესი ჩანაწერი გადაიწერება)."""
+        self._buf[self._pos] = (goals_scored, goals_conceded, points,
+                                shots, shots_target, corners, is_home)
+        self._pos = (self._pos + 1) % len(self._buf)
+        self.total += 1
+
+    def window(self) -> np.ndarray:
+        """ბოლო min(total, capacity) მატჩი (თანმიმდევრობის გარეშე)."""
+        if self.total >= len(self._buf):
+            return self._buf
+        return self._buf[:self.total]
+
+    def stats(self) -> dict:
+        """ფანჯრის სტატისტიკა დროებითი სიების გარეშე."""
+        w = self.window()
+        n = len(w)
+        if n == 0:
+            return {}
+        return {
+            "points": int(w["points"].sum()) / n,
+            "goals_scored": float(w["goals_scored"].sum(dtype=np.float64)) / n,
+            "goals_conceded": float(w["goals_conceded"].sum(dtype=np.float64)) / n,
+            "win_rate": int((w["points"] == 3).sum()) / n,
+            "shots": _nan_mean(w["shots"]),
+            "shots_target": _nan_mean(w["shots_target"]),
+            "corners": _nan_mean(w["corners"]),
+        }
+
+
+class H2HHistory:
+    """გუნდების წყვილების ბოლო N პირისპირ შეხვედრა."""
+
+    __slots__ = ("capacity", "_pairs")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._pairs = {}
+
+    @staticmethod
+    def _key(team_a: str, team_b: str) -> tuple:
+        return (team_a, team_b) if team_a <= team_b else (team_b, team_a)
+
+    def append(self, home: str, away: str, fthg, ftag, ftr):
+        key = self._key(home, away)
+        entry = self._pairs.get(key)
+        if entry is None:
+            entry = [np.zeros(self.capacity, dtype=H2H_DTYPE), 0]
+            self._pairs[key] = entry
+        buf, total = entry
+        result = {"H": 0, "D": 1, "A": 2}.get(ftr, 3)
+        buf[total % self.capacity] = (key[0] == home, fthg, ftag, result)
+        entry[1] = total + 1
+
+    def total(self, team_a: str, team_b: str) -> int:
+        """წყვილის ყველა პირისპირ შეხვედრის რაოდენობა."""
+        entry = self._pairs.get(self._key(team_a, team_b))
+        return entry[1] if entry is not None else 0
+
+    def recent(self, team_a: str, team_b: str) -> np.ndarray:
+        """ბოლო შეხვედრები ქრონოლოგიური თანმიმდევრობით."""
+        entry = self._pairs.get(self._key(team_a, team_b))
+        if entry is None:
+            return np.zeros(0, dtype=H2H_DTYPE)
+        buf, total = entry
+        if total <= self.capacity:
+            return buf[:total]
+        return np.roll(buf, -(total % self.capacity))
+
+    def perspective(self, home: str, away: str, recent: np.ndarray = None) -> tuple:
+        """H2H მატჩები home გუნდის პერსპექტივიდან.
+
+        აბრუნებს (home_won, draw, home_goals) მასივებს.
+        """
+        if recent is None:
+            recent = self.recent(home, away)
+        is_first = self._key(home, away)[0] == home
+        home_was_home = recent["first_is_home"] == is_first
+        draw = recent["result"] == 1
+        home_won = np.where(home_was_home, recent["result"] == 0, recent["result"] == 2)
+        home_goals = np.where(home_was_home, recent["home_goals"], recent["away_goals"])
+        return home_won, draw, home_goals
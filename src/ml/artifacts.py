@@ -0,0 +1,545 @@
+"""მოდელის ვერსიონირებული არტეფაქტები: შენახვა, ატომური გამოქვეყნება, ჩატვირთვა.
+
+ყოველი ვერსია ცალკე დირექტორიაა (models/versions/<ვერსია>/):
+    manifest.json   - ფორმატი, ფიჩერები, კლასები, ფაილები
+    metadata.json   - გაწვრთნის მეტრიკები (მოდელის გვერდისთვის)
+    model.ubj       - XGBoost booster (მშობლიური ფორმატი)
+    coef.npy, intercept.npy - წრფივი მოდელის წონები
+    scaler_mean.npy, scaler_scale.npy - StandardScaler-ის პარამეტრები
+    impute.npy      - NaN-ების შევსების მნიშვნელობები (სწავლების მედიანები)
+    runtime/        - NumPy-only სკორინგის მასივები (src/ml/runtime.py)
+
+ვერსია ჯერ დროებით დირექტორიაში იწერება და მერე გადაერქმევა, შემდეგ
+კი models/CURRENT მიმთითებელი os.replace-ით იცვლება - მკითხველი ვერასდროს
+ხედავს ნახევრად ჩაწერილ მოდელს. .npy ფაილები mmap-ით იტვირთება.
+
+რეესტრი: CURRENT - ჩემპიონი (მისი პროგნოზები ჩანს ყველგან), SHADOWS -
+ვერსიები, რომლებიც ჩემპიონთან ერთად ფასდება შედარებისთვის. რეესტრის
+წაკითხვა-ცვლილება-ჩაწერა ხდება registry.lock-ის (flock) ქვეშ - გაწვრთნის
+job-ის გამოქვეყნება და მოდელის გვერდის promote ერთმანეთს არ გადაეწერება.
+
+მოდელების ოჯახი (ლიგების მოდელები): ვერსიის manifest.json-ში "family" -
+წევრების სია, თითოეული members/<დივიზიონი>/ ქვედირექტორიაში იგივე
+ფორმატით; GLOBAL_MEMBER ფასდება ლიგებს, რომელთაც საკუთარი მოდელი არ აქვთ.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.config import (
+    MODEL_PATH, MODEL_METADATA_PATH, MODEL_VERSIONS_DIR, MODEL_POINTER_PATH,
+    MODEL_KEEP_VERSIONS, MODEL_RUNTIME, MODEL_SHADOWS_PATH, MODEL_REGISTRY_LOCK_PATH,
+)
+from src.ml.runtime import export_runtime, load_runtime
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+LEGACY_VERSION = "legacy"
+GLOBAL_MEMBER = "global"
+
+
+class AffineScaler:
+    """StandardScaler-ის ეკვივალენტი: (X - mean) / scale."""
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class LinearModel:
+    """მულტინომიალური ლოგისტიკური რეგრესია (softmax) წონებიდან."""
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray):
+        self.coef_ = coef
+        self.intercept_ = intercept
+
+    def predict_proba(self, X) -> np.ndarray:
+        z = np.asarray(X, dtype=np.float64) @ self.coef_.T + self.intercept_
+        if z.shape[1] == 1:  # ბინარული: sigmoid
+            p = 1.0 / (1.0 + np.exp(-z))
+            return np.hstack([1 - p, p])
+        z -= z.max(axis=1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=1, keepdims=True)
+
+
+class BoosterClassifier:
+    """მშობლიური XGBoost booster sklearn-ის მსგავსი ინტერფეისით."""
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    def get_booster(self):
+        return self.booster
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.booster.inplace_predict(np.asarray(X, dtype=np.float32))
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_proba(X).argmax(axis=1)
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        """gain-ზე დაფუძნებული მნიშვნელობა (ნორმალიზებული, XGBClassifier-ის მსგავსად)."""
+        scores = self.booster.get_score(importance_type="gain")
+        importances = np.array([scores.get(f"f{i}", 0.0)
+                                for i in range(self.booster.num_features())])
+        total = importances.sum()
+        return importances / total if total > 0 else importances
+
+
+class LabelSet:
+    """LabelEncoder-ის ნაცვლად: მხოლოდ კლასების რიგი."""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes)
+
+
+@dataclass
+class ModelArtifact:
+    version: str
+    model: object
+    scaler: object
+    label_encoder: object
+    feature_columns: list
+    metadata: dict = field(default_factory=dict)
+    folded: bool = False  # model თავად ასრულებს სკალირებას (NumPy runtime)
+    impute_values: np.ndarray = None  # სწავლების მედიანები feature_columns-ის რიგით
+
+    def impute(self, X) -> np.ndarray:
+        """NaN-ების შევსება სწავლებისდროინდელი მნიშვნელობებით (ბატჩისგან დამოუკიდებლად).
+
+        ძველ არტეფაქტებს მედიანები არ აქვთ - მაშინ სკალერის საშუალო.
+        """
+        X = np.asarray(X, dtype=np.float64)
+        fill = self.impute_values
+        if fill is None:
+            fill = self.scaler.mean_ if self.scaler is not None else 0.0
+        return np.where(np.isnan(X), fill, X)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """ნედლი ფიჩერებიდან ალბათობები."""
+        if not self.folded and self.scaler is not None:
+            X = self.scaler.transform(X)
+        return self.model.predict_proba(X)
+
+    def predict_raw(self, X, divisions=None) -> np.ndarray:
+        """NaN-იანი ფიჩერებიდან ალბათობები (divisions - ModelFamily-სთან თავსებადობისთვის)."""
+        X = self.impute(X)
+        if hasattr(self.scaler, "feature_names_in_"):  # ძველი sklearn სკალერი სახელებით
+            import pandas as pd
+            X = pd.DataFrame(X, columns=self.feature_columns)
+        return self.predict_proba(X)
+
+
+@dataclass
+class ModelFamily:
+    """ლიგების მოდელები + გლობალური fallback; სტრიქონები დივიზიონით მარშრუტდება."""
+    version: str
+    members: dict  # დივიზიონი -> ModelArtifact (GLOBAL_MEMBER - დანარჩენი ლიგები)
+    metadata: dict = field(default_factory=dict)
+
+    global_member = property(lambda self: self.members[GLOBAL_MEMBER])
+    model = property(lambda self: self.global_member.model)
+    scaler = property(lambda self: self.global_member.scaler)
+    label_encoder = property(lambda self: self.global_member.label_encoder)
+    feature_columns = property(lambda self: self.global_member.feature_columns)
+    impute_values = property(lambda self: self.global_member.impute_values)
+    folded = property(lambda self: self.global_member.folded)
+
+    def member(self, division: str) -> ModelArtifact:
+        return self.members.get(division, self.global_member)
+
+    def predict_raw(self, X, divisions) -> np.ndarray:
+        """სტრიქონები დაჯგუფდება დივიზიონით - თითო მოდელი ერთხელ ფასდება."""
+        X = np.asarray(X, dtype=np.float64)
+        divisions = np.asarray(divisions, dtype=object)
+        proba = np.empty((len(X), len(self.label_encoder.classes_)))
+        routed = np.array([d if d in self.members else GLOBAL_MEMBER for d in divisions],
+                          dtype=object)
+        for name in dict.fromkeys(routed):
+            rows = routed == name
+            proba[rows] = self.members[name].predict_raw(X[rows])
+        return proba
+
+
+def current_version() -> str | None:
+    """CURRENT მიმთითებლის ვერსია (None - ჯერ არაფერი გამოქვეყნებულა)."""
+    try:
+        return MODEL_POINTER_PATH.read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def shadow_versions() -> list:
+    """shadow ვერსიები (ჩემპიონთან ერთად ფასდება, მაგრამ არ ჩანს)."""
+    try:
+        shadows = json.loads(MODEL_SHADOWS_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return []
+    current = current_version()
+    return [v for v in shadows if v != current and (MODEL_VERSIONS_DIR / v).is_dir()]
+
+
+def set_shadows(versions: list):
+    """shadow სიის ატომური ჩაწერა."""
+    with registry_lock():
+        _set_shadows(versions)
+
+
+def _set_shadows(versions: list):
+    _atomic_write(MODEL_SHADOWS_PATH, json.dumps(list(dict.fromkeys(versions))))
+
+
+def add_shadow(version: str):
+    with registry_lock():
+        _set_shadows(shadow_versions() + [version])
+
+
+def remove_shadow(version: str):
+    with registry_lock():
+        _set_shadows([v for v in shadow_versions() if v != version])
+
+
+def promote(version: str):
+    """shadow -> ჩემპიონი; ძველი ჩემპიონი shadow ხდება."""
+    with registry_lock():
+        if not (MODEL_VERSIONS_DIR / version).is_dir():
+            raise ValueError(f"ვერსია არ არსებობს: {version}")
+        previous = current_version()
+        shadows = [v for v in shadow_versions() if v != version]
+        _set_shadows(shadows + ([previous] if previous else []))
+        _atomic_write(MODEL_POINTER_PATH, version)
+        _atomic_write(MODEL_METADATA_PATH, json.dumps(
+            _read_json(MODEL_VERSIONS_DIR / version / "metadata.json"),
+            indent=2, ensure_ascii=False))
+    log.info(f"ჩემპიონი: {previous} -> {version}")
+
+
+@contextmanager
+def registry_lock(path: Path = MODEL_REGISTRY_LOCK_PATH):
+    """რეესტრის (CURRENT/SHADOWS) ექსკლუზიური lock პროცესებსა და ნაკადებს შორის.
+
+    ბლოკირებადია (training_lock-ისგან განსხვავებით) - ოპერაციები მოკლეა.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+") as f:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:  # LK_LOCK ~10 წამის შემდეგ ნებდება
+                time.sleep(0.1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def model_key() -> tuple | None:
+    """მიმდინარე მოდელების (ჩემპიონი + shadow) იდენტიფიკატორი ცვლილების აღმოსაჩენად."""
+    version = current_version()
+    if version is not None:
+        return ("version", version, tuple(shadow_versions()))
+    try:
+        stat = MODEL_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return (LEGACY_VERSION, stat.st_mtime_ns, stat.st_size)
+
+
+def publish_model(model, scaler, label_encoder, feature_columns: list,
+                  metadata: dict, sample=None, impute_values=None,
+                  shadow: bool = False) -> str:
+    """მოდელის ახალი ვერსიის ჩაწერა და ატომურად გამოქვეყნება.
+
+    sample: ნედლი ფიჩერები (მაგ. სატესტო ნაწილი) NumPy runtime-ის
+    ეკვივალენტობის შესამოწმებლად.
+    impute_values: NaN-ების შევსების მნიშვნელობები feature_columns-ის რიგით.
+    shadow: ჩემპიონის ნაცვლად shadow-ად დამატება (CURRENT არ იცვლება).
+    """
+    def write(tmp_dir: Path, version: str) -> dict:
+        return _write_artifact(tmp_dir, version, model, scaler, label_encoder,
+                               feature_columns, metadata, sample, impute_values)
+
+    return _publish(write, metadata, shadow)
+
+
+def publish_family(members: dict, label_encoder, feature_columns: list, metadata: dict,
+                   shadow: bool = False) -> str:
+    """მოდელების ოჯახის გამოქვეყნება ერთ ვერსიად.
+
+    members: {დივიზიონი ან GLOBAL_MEMBER: {"model", "scaler", "impute_values",
+    "sample", "metadata"}}; GLOBAL_MEMBER აუცილებელია.
+    """
+    if GLOBAL_MEMBER not in members:
+        raise ValueError("ოჯახს გლობალური მოდელი სჭირდება")
+
+    def write(tmp_dir: Path, version: str) -> dict:
+        for name, member in members.items():
+            member_dir = tmp_dir / "members" / name
+            member_dir.mkdir(parents=True)
+            member_metadata = member.get("metadata", {})
+            _write_artifact(member_dir, version, member["model"], member.get("scaler"),
+                            label_encoder, feature_columns, member_metadata,
+                            member.get("sample"), member.get("impute_values"))
+            _write_json(member_dir / "metadata.json", member_metadata)
+        manifest = {
+            "version": version,
+            "model_type": metadata.get("model_type"),
+            "created_at": datetime.now().isoformat(),
+            "feature_columns": list(feature_columns),
+            "classes": [str(c) for c in label_encoder.classes_],
+            "format": "family",
+            "family": list(members),
+        }
+        _write_json(tmp_dir / "manifest.json", manifest)
+        return manifest
+
+    return _publish(write, metadata, shadow)
+
+
+def _publish(write, metadata: dict, shadow: bool) -> str:
+    """ვერსიის დირექტორიის ჩაწერა (write), ატომური გადარქმევა და რეესტრის განახლება."""
+    version = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    MODEL_VERSIONS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_dir = MODEL_VERSIONS_DIR / f".tmp-{version}"
+    tmp_dir.mkdir()
+
+    try:
+        manifest = write(tmp_dir, version)
+        _write_json(tmp_dir / "metadata.json", {**metadata, "version": version})
+        os.replace(tmp_dir, MODEL_VERSIONS_DIR / version)
+    except Exception:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    with registry_lock():
+        if shadow and current_version() is not None:
+            _set_shadows(shadow_versions() + [version])
+            log.info(f"shadow მოდელი დამატებულია: ვერსია {version} ({manifest['format']})")
+        else:
+            _atomic_write(MODEL_POINTER_PATH, version)
+            # მოდელის გვერდი და ძველი ხელსაწყოები ამ ფაილს კითხულობენ
+            _atomic_write(MODEL_METADATA_PATH, json.dumps({**metadata, "version": version},
+                                                          indent=2, ensure_ascii=False))
+            log.info(f"მოდელი გამოქვეყნებულია: ვერსია {version} ({manifest['format']})")
+
+    prune_versions()
+    return version
+
+
+def _write_artifact(path: Path, version: str, model, scaler, label_encoder,
+                    feature_columns: list, metadata: dict, sample=None,
+                    impute_values=None) -> dict:
+    """ერთი მოდელის ფაილები და manifest.json დირექტორიაში."""
+    manifest = {
+        "version": version,
+        "model_type": metadata.get("model_type"),
+        "created_at": datetime.now().isoformat(),
+        "feature_columns": list(feature_columns),
+        "classes": [str(c) for c in label_encoder.classes_],
+        "format": _save_estimator(model, path),
+        "scaler": scaler is not None,
+        "impute": impute_values is not None,
+        "runtime": export_runtime(model, scaler, path, sample=sample),
+    }
+    if scaler is not None:
+        np.save(path / "scaler_mean.npy", np.asarray(scaler.mean_, dtype=np.float64))
+        np.save(path / "scaler_scale.npy", np.asarray(scaler.scale_, dtype=np.float64))
+    if impute_values is not None:
+        np.save(path / "impute.npy", np.asarray(impute_values, dtype=np.float64))
+    _write_json(path / "manifest.json", manifest)
+    return manifest
+
+
+def load_model(version: str = None, native: bool = False) -> ModelArtifact | ModelFamily | None:
+    """ვერსიის (ნაგულისხმევად CURRENT) ჩატვირთვა; მის გარეშე - ძველი joblib ფაილი.
+
+    native: runtime-ის ნაცვლად ორიგინალი estimator (მაგ. გაწვრთნის გასაგრძელებლად).
+    """
+    version = version or current_version()
+    if version is None:
+        return _load_legacy()
+
+    path = MODEL_VERSIONS_DIR / version
+    manifest = _read_json(path / "manifest.json")
+    metadata = _read_json(path / "metadata.json")
+    if manifest.get("family"):
+        members = {name: _read_artifact(path / "members" / name, version, native)
+                   for name in manifest["family"]}
+        return ModelFamily(version=version, members=members, metadata=metadata)
+    return _read_artifact(path, version, native, manifest, metadata)
+
+
+def _read_artifact(path: Path, version: str, native: bool = False, manifest: dict = None,
+                   metadata: dict = None) -> ModelArtifact:
+    manifest = manifest or _read_json(path / "manifest.json")
+    if metadata is None:
+        metadata = _read_json(path / "metadata.json")
+
+    scaler = None
+    if manifest.get("scaler"):
+        scaler = AffineScaler(np.load(path / "scaler_mean.npy", mmap_mode="r"),
+                              np.load(path / "scaler_scale.npy", mmap_mode="r"))
+
+    impute_values = None
+    if manifest.get("impute"):
+        impute_values = np.load(path / "impute.npy", mmap_mode="r")
+
+    # NumPy runtime ნაგულისხმევად - sklearn/xgboost-ის იმპორტი არ ხდება
+    folded = bool(manifest.get("runtime")) and MODEL_RUNTIME == "numpy" and not native
+    if folded:
+        model = load_runtime(manifest["runtime"], path)
+    else:
+        model = _load_estimator(manifest["format"], path)
+
+    return ModelArtifact(
+        version=version,
+        model=model,
+        scaler=scaler,
+        label_encoder=LabelSet(manifest["classes"]),
+        feature_columns=manifest["feature_columns"],
+        metadata=metadata,
+        folded=folded,
+        impute_values=impute_values,
+    )
+
+
+def list_versions() -> list:
+    """გამოქვეყნებული ვერსიები (ძველიდან ახლისკენ)."""
+    if not MODEL_VERSIONS_DIR.exists():
+        return []
+    return sorted(p.name for p in MODEL_VERSIONS_DIR.iterdir()
+                  if p.is_dir() and not p.name.startswith("."))
+
+
+def version_metadata(version: str) -> dict:
+    """ვერსიის მეტადატა მოდელის ჩატვირთვის გარეშე ({} - თუ არ არსებობს)."""
+    path = MODEL_VERSIONS_DIR / version / "metadata.json"
+    return _read_json(path) if path.exists() else {}
+
+
+def trained_through(version: str) -> str | None:
+    """ბოლო თარიღი, რომელიც ვერსიამ სწავლებისას ნახა (ძველ ვერსიებში - გაწვრთნის დღე)."""
+    metadata = version_metadata(version)
+    return metadata.get("trained_through") or (metadata.get("trained_at") or "")[:10] or None
+
+
+def prune_versions(keep: int = MODEL_KEEP_VERSIONS):
+    """ძველი ვერსიების წაშლა (მიმდინარე და shadow-ები ყოველთვის რჩება)."""
+    with registry_lock():
+        active = {current_version(), *shadow_versions()}
+        for version in list_versions()[:-keep] if keep > 0 else []:
+            if version not in active:
+                shutil.rmtree(MODEL_VERSIONS_DIR / version, ignore_errors=True)
+
+
+def _save_estimator(model, path: Path) -> str:
+    if hasattr(model, "get_booster"):
+        model.get_booster().save_model(str(path / "model.ubj"))
+        return "xgboost"
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        np.save(path / "coef.npy", np.asarray(model.coef_, dtype=np.float64))
+        np.save(path / "intercept.npy", np.asarray(model.intercept_, dtype=np.float64))
+        return "linear"
+    import joblib
+    joblib.dump(model, str(path / "model.joblib"))
+    return "joblib"
+
+
+def _load_estimator(fmt: str, path: Path):
+    if fmt == "linear":
+        return LinearModel(np.load(path / "coef.npy", mmap_mode="r"),
+                           np.load(path / "intercept.npy", mmap_mode="r"))
+    if fmt == "xgboost":
+        import xgboost as xgb
+        from src.utils.concurrency import plan
+        booster = xgb.Booster()
+        booster.load_model(str(path / "model.ubj"))
+        # გაწვრთნის nthread ინფერენსში არ გადადის (plan("inference"))
+        booster.set_param({"nthread": plan("inference", quiet=True).estimator_threads})
+        return BoosterClassifier(booster)
+    import joblib
+    return joblib.load(str(path / "model.joblib"))
+
+
+def _load_legacy() -> ModelArtifact | None:
+    """run_training.py-ის ძველი ფორმატი (models/match_predictor.joblib)."""
+    if not MODEL_PATH.exists():
+        return None
+    import joblib
+    model_data = joblib.load(str(MODEL_PATH))
+    try:
+        metadata = _read_json(MODEL_METADATA_PATH)
+    except FileNotFoundError:
+        metadata = {}
+    return ModelArtifact(
+        version=LEGACY_VERSION,
+        model=model_data["model"],
+        scaler=model_data["scaler"],
+        label_encoder=model_data["label_encoder"],
+        feature_columns=model_data["feature_columns"],
+        metadata=metadata,
+    )
+
+
+def _atomic_write(path: Path, text: str):
+    """ჩაწერა დროებით ფაილში და os.replace (ატომური გადარქმევა)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # უნიკალური სახელი: პარალელური ჩამწერები ერთ დროებით ფაილს არ იზიარებენ
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _write_json(path: Path, payload: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+
+
+def _read_json(path: Path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
@@ -0,0 +1,221 @@
+"""Walk-forward ბექტესტი.
+
+მოდელი თავიდან ისწავლება ყოველი პერიოდის (ტური/კვირა/თვე) დასაწყისში
+მხოლოდ მანამდე ცნობილ მატჩებზე (მზარდი ან მცოცავი ფანჯარა) და ფასდება
+ამ პერიოდის მატჩებზე. ფიჩერების მატრიცა ერთხელ ითვლება და დისკზე
+ინახება (.npy, data_version-ის მიხედვით), პროცესები კი მას mmap-ით
+კითხულობენ - ფოლდები პარალელურად სრულდება.
+"""
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import (
+    PROCESSED_DIR, MIN_EDGE_THRESHOLD, BACKTEST_MIN_TRAIN_DAYS, BACKTEST_WORKERS,
+    BACKTEST_XGB_PARAMS,
+)
+from src.data.db_manager import get_all_matches, get_data_version
+from src.data.feature_engineer import create_features, get_feature_columns
+from src.utils.concurrency import plan, limit_threads, set_process_threads
+from src.utils.helpers import implied_probabilities_matrix
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+CADENCES = {"matchday": None, "weekly": "W-MON", "monthly": "MS"}
+CLASSES = ["A", "D", "H"]  # LabelEncoder-ის რიგი (trainer.py)
+CACHE_ARRAYS = ("X", "y", "odds", "days")
+
+
+def build_feature_cache(force: bool = False) -> Path:
+    """ფიჩერების მატრიცის ქეში data/processed/backtest/v<data_version>/."""
+    cache_dir = PROCESSED_DIR / "backtest" / f"v{get_data_version()}"
+    if (cache_dir / "meta.json").exists() and not force:
+        return cache_dir
+
+    log.info("ბექტესტი: ფიჩერების მატრიცის აგება...")
+    featured = create_features(get_all_matches())
+    featured = featured[featured["FTR"].isin(CLASSES)]
+    featured = featured.sort_values("Date", kind="stable").reset_index(drop=True)
+    columns = get_feature_columns(featured)
+
+    tmp_dir = cache_dir.with_name(f".tmp-{cache_dir.name}-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+    arrays = {
+        "X": featured[columns].to_numpy(dtype=np.float32),
+        "y": featured["FTR"].map({c: i for i, c in enumerate(CLASSES)}).to_numpy(np.int8),
+        "odds": featured[["B365H", "B365D", "B365A"]].to_numpy(dtype=np.float64),
+        "days": featured["Date"].to_numpy("datetime64[D]").astype(np.int64),
+    }
+    for name, array in arrays.items():
+        np.save(tmp_dir / f"{name}.npy", array)
+    with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"feature_columns": columns, "rows": len(featured)}, f, ensure_ascii=False)
+
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    os.replace(tmp_dir, cache_dir)
+    log.info(f"ბექტესტი: ქეში {cache_dir} ({len(featured)} მატჩი, {len(columns)} ფიჩერი)")
+    return cache_dir
+
+
+def make_folds(days: np.ndarray, cadence: str = "weekly", window_days: int = None,
+               start: str = None, min_train_days: int = BACKTEST_MIN_TRAIN_DAYS) -> list:
+    """ფოლდები ინდექსების შუალედებად: (train_start, train_end, test_end).
+
+    days: დალაგებული თარიღები (დღეები epoch-იდან). window_days=None - მზარდი ფანჯარა.
+    """
+    if cadence not in CADENCES:
+        raise ValueError(f"უცნობი პერიოდულობა: {cadence} ({', '.join(CADENCES)})")
+    dates = days.astype("datetime64[D]")
+    first = (pd.Timestamp(start) if start
+             else pd.Timestamp(dates[0]) + pd.Timedelta(days=min_train_days))
+    last = pd.Timestamp(dates[-1])
+
+    if CADENCES[cadence] is None:
+        boundaries = np.unique(dates[dates >= np.datetime64(first.date())])
+    else:
+        boundaries = pd.date_range(first, last, freq=CADENCES[cadence]).to_numpy("datetime64[D]")
+        boundaries = np.concatenate([[np.datetime64(first.date())], boundaries])
+    boundaries = np.unique(np.concatenate([boundaries, [dates[-1] + 1]])).astype(np.int64)
+
+    folds = []
+    for t0, t1 in zip(boundaries[:-1], boundaries[1:]):
+        train_end = int(np.searchsorted(days, t0, side="left"))
+        test_end = int(np.searchsorted(days, t1, side="left"))
+        train_start = (int(np.searchsorted(days, t0 - window_days, side="left"))
+                       if window_days else 0)
+        if test_end > train_end and train_end - train_start > 0:
+            folds.append((train_start, train_end, test_end))
+    return folds
+
+
+_arrays = {}
+
+
+def _load_cache(cache_dir: str) -> dict:
+    """mmap-ით ჩატვირთული მასივები (პროცესში ერთხელ)."""
+    if _arrays.get("dir") != cache_dir:
+        _arrays.clear()
+        _arrays.update({name: np.load(Path(cache_dir) / f"{name}.npy", mmap_mode="r")
+                        for name in CACHE_ARRAYS})
+        _arrays["dir"] = cache_dir
+    return _arrays
+
+
+def _fit_predict(model: str, X_train, y_train, X_test, nthread: int = 1) -> np.ndarray:
+    if model == "xgb":
+        from src.ml.boosting import train_booster
+        # ფოლდები პარალელურია - booster-ს პროცესის წილი (plan("backtest"))
+        booster, _ = train_booster(X_train, y_train, BACKTEST_XGB_PARAMS, nthread=nthread)
+        return booster.predict_proba(X_test)
+    if model == "lr":
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.preprocessing import StandardScaler
+        scaler = StandardScaler().fit(X_train)
+        lr = LogisticRegression(max_iter=1000, random_state=42)
+        lr.fit(scaler.transform(X_train), y_train)
+        proba = np.zeros((len(X_test), len(CLASSES)))
+        proba[:, lr.classes_] = lr.predict_proba(scaler.transform(X_test))
+        return proba
+    raise ValueError(f"უცნობი მოდელი: {model}")
+
+
+def run_fold(cache_dir: str, model: str, fold: tuple,
+             min_edge: float = MIN_EDGE_THRESHOLD, nthread: int = 1) -> dict:
+    """ერთი ფოლდი: გაწვრთნა, შეფასება, value bet-ების ROI (1 ერთეული ფსონი)."""
+    from sklearn.metrics import log_loss
+
+    start = time.perf_counter()
+    arrays = _load_cache(cache_dir)
+    train_start, train_end, test_end = fold
+    X_train = np.array(arrays["X"][train_start:train_end], dtype=np.float64)
+    X_test = np.array(arrays["X"][train_end:test_end], dtype=np.float64)
+    y_train = np.asarray(arrays["y"][train_start:train_end])
+    y_test = np.asarray(arrays["y"][train_end:test_end])
+
+    # NaN -> ფოლდის train მედიანები (მომავლის მონაცემები არ გამოიყენება)
+    with np.errstate(all="ignore"):
+        medians = np.nan_to_num(np.nanmedian(X_train, axis=0))
+    X_train = np.where(np.isnan(X_train), medians, X_train)
+    X_test = np.where(np.isnan(X_test), medians, X_test)
+
+    proba = _fit_predict(model, X_train, y_train, X_test, nthread)
+
+    # value bet-ები: მოდელის ალბათობა > ბუკმეკერის + min_edge (H, D, A რიგით)
+    odds = np.asarray(arrays["odds"][train_end:test_end])
+    model_hda = proba[:, [2, 1, 0]]
+    with np.errstate(all="ignore"):
+        edge = model_hda - implied_probabilities_matrix(odds)
+        bets = (edge > min_edge) & (odds > 0)
+    won = np.zeros_like(bets)
+    won[np.arange(len(y_test)), 2 - y_test] = True
+    profit = np.where(bets & won, odds - 1, 0.0) - (bets & ~won)
+
+    days = arrays["days"]
+    return {
+        "start": str(np.datetime64(int(days[train_end]), "D")),
+        "end": str(np.datetime64(int(days[test_end - 1]), "D")),
+        "train_size": train_end - train_start,
+        "test_size": test_end - train_end,
+        "accuracy": float((proba.argmax(axis=1) == y_test).mean()),
+        "log_loss": float(log_loss(y_test, proba, labels=[0, 1, 2])),
+        "bets": int(bets.sum()),
+        "profit": float(profit.sum()),
+        "roi": float(profit.sum() / bets.sum()) if bets.any() else None,
+        "fit_sec": round(time.perf_counter() - start, 3),
+    }
+
+
+def run_backtest(model: str = "lr", cadence: str = "weekly", window_days: int = None,
+                 start: str = None, workers: int = BACKTEST_WORKERS,
+                 min_edge: float = MIN_EDGE_THRESHOLD) -> pd.DataFrame:
+    """walk-forward ბექტესტი; აბრუნებს ფოლდების ცხრილს."""
+    cache_dir = build_feature_cache()
+    days = np.load(cache_dir / "days.npy")
+    folds = make_folds(days, cadence, window_days, start)
+    layout = plan("backtest", tasks=len(folds), workers=workers)
+    log.info(f"ბექტესტი: {model}, {cadence}, "
+             f"{'მცოცავი ' + str(window_days) + ' დღე' if window_days else 'მზარდი ფანჯარა'}, "
+             f"{len(folds)} ფოლდი, {layout.workers} პროცესი")
+
+    started = time.perf_counter()
+    task = partial(run_fold, str(cache_dir), model, min_edge=min_edge,
+                   nthread=layout.estimator_threads)
+    if layout.workers > 1:
+        with ProcessPoolExecutor(max_workers=layout.workers, initializer=set_process_threads,
+                                 initargs=(layout.blas_threads,)) as pool:
+            results = list(pool.map(task, folds,
+                                    chunksize=max(1, len(folds) // (layout.workers * 4))))
+    else:
+        with limit_threads(layout):
+            results = [task(fold) for fold in folds]
+
+    report = pd.DataFrame(results)
+    log.info(f"ბექტესტი დასრულდა: {time.perf_counter() - started:.1f}s")
+    return report
+
+
+def summarize(report: pd.DataFrame) -> dict:
+    """ფოლდების შეჯამება (მატჩების რაოდენობით შეწონილი)."""
+    if report.empty:
+        return {}
+    weights = report["test_size"]
+    bets = report["bets"].sum()
+    return {
+        "folds": len(report),
+        "matches": int(weights.sum()),
+        "accuracy": float(np.average(report["accuracy"], weights=weights)),
+        "log_loss": float(np.average(report["log_loss"], weights=weights)),
+        "bets": int(bets),
+        "profit": float(report["profit"].sum()),
+        "roi": float(report["profit"].sum() / bets) if bets else None,
+        "fit_sec_total": float(report["fit_sec"].sum()),
+    }
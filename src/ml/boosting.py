@@ -0,0 +1,110 @@
+"""XGBoost-ის მშობლიური გაწვრთნა (xgb.train) sklearn wrapper-ის გარეშე.
+
+- QuantileDMatrix: ფიჩერები ერთხელ დაიყოფა ბინებად (hist) და float32-ში
+  ინახება - სრული float64 ასლის ნაცვლად;
+- tree_method="hist" და ნაკადების მკაფიო რაოდენობა;
+- early stopping დროით ბოლო ვალიდაციის ნაწილზე;
+- სკალირება არ სჭირდება (ხეები მონოტონური გარდაქმნის მიმართ ინვარიანტულია).
+"""
+import time
+
+import numpy as np
+import xgboost as xgb
+
+from src.config import (
+    XGB_TREE_METHOD, XGB_NTHREAD, XGB_MAX_BIN, XGB_VALID_FRACTION,
+    SEARCH_MAX_ROUNDS, EARLY_STOPPING_ROUNDS,
+)
+from src.ml.artifacts import BoosterClassifier
+from src.utils.logger import get_logger
+from src.utils.profiling import peak_rss_mb
+
+log = get_logger(__name__)
+
+
+def booster_params(params: dict, nthread: int = None) -> dict:
+    """სიძებნი პარამეტრები -> xgb.train-ის პარამეტრები."""
+    return {
+        "objective": "multi:softprob",
+        "num_class": 3,
+        "eval_metric": "mlogloss",
+        "tree_method": XGB_TREE_METHOD,
+        "max_bin": XGB_MAX_BIN,
+        "nthread": nthread or XGB_NTHREAD,
+        "seed": 42,
+        **{k: v for k, v in params.items() if k != "n_estimators"},
+    }
+
+
+def quantile_matrix(X, y=None, ref=None, nthread: int = None) -> xgb.QuantileDMatrix:
+    """float32 QuantileDMatrix (ვალიდაციისთვის ref - სასწავლის ბინები)."""
+    return xgb.QuantileDMatrix(np.asarray(X, dtype=np.float32), label=y,
+                               max_bin=XGB_MAX_BIN, ref=ref, nthread=nthread or XGB_NTHREAD)
+
+
+def fit_booster(dtrain, dvalid, params: dict, rounds: int, nthread: int = None):
+    """ერთი booster-ის გაწვრთნა early stopping-ით; აბრუნებს მოჭრილ booster-ს."""
+    booster = xgb.train(
+        booster_params(params, nthread), dtrain, num_boost_round=rounds,
+        evals=[(dvalid, "valid")] if dvalid is not None else (),
+        early_stopping_rounds=EARLY_STOPPING_ROUNDS if dvalid is not None else None,
+        verbose_eval=False,
+    )
+    if dvalid is not None:
+        booster = booster[: booster.best_iteration + 1]
+    return booster
+
+
+def train_booster(X, y, params: dict, valid_fraction: float = XGB_VALID_FRACTION,
+                  max_rounds: int = SEARCH_MAX_ROUNDS, nthread: int = None) -> tuple:
+    """საბოლოო მოდელი: ბოლო valid_fraction - early stopping-ისთვის.
+
+    აბრუნებს (BoosterClassifier, სტატისტიკა: დრო, პიკური RSS, იტერაციები).
+    """
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    split = int(len(X) * (1 - valid_fraction)) if valid_fraction else len(X)
+
+    start = time.perf_counter()
+    dtrain = quantile_matrix(X[:split], y[:split], nthread=nthread)
+    dvalid = (quantile_matrix(X[split:], y[split:], ref=dtrain, nthread=nthread)
+              if split < len(X) else None)
+    build_sec = time.perf_counter() - start
+
+    booster = fit_booster(dtrain, dvalid, params, max_rounds, nthread)
+    stats = {
+        "tree_method": XGB_TREE_METHOD,
+        "nthread": nthread or XGB_NTHREAD,
+        "matrix_sec": round(build_sec, 3),
+        "train_sec": round(time.perf_counter() - start, 3),
+        "iterations": booster.num_boosted_rounds(),
+        "valid_size": len(X) - split,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    log.info(f"XGBoost (hist): {stats['iterations']} იტერაცია, {stats['train_sec']:.1f}s, "
+             f"პიკური RSS {stats['peak_rss_mb'] or 0:.0f} MB")
+    return BoosterClassifier(booster), stats
+
+
+def continue_booster(booster, X, y, params: dict, rounds: int, nthread: int = None) -> tuple:
+    """არსებული booster-ის გაგრძელება ახალ სტრიქონებზე (xgb_model) - ძველი ხეები უცვლელია.
+
+    აბრუნებს (BoosterClassifier, სტატისტიკა).
+    """
+    start = time.perf_counter()
+    dnew = xgb.DMatrix(np.asarray(X, dtype=np.float32), label=np.asarray(y),
+                       nthread=nthread or XGB_NTHREAD)
+    base_rounds = booster.num_boosted_rounds()
+    booster = xgb.train(booster_params(params, nthread), dnew, num_boost_round=rounds,
+                        xgb_model=booster, verbose_eval=False)
+    stats = {
+        "tree_method": XGB_TREE_METHOD,
+        "nthread": nthread or XGB_NTHREAD,
+        "train_sec": round(time.perf_counter() - start, 3),
+        "iterations": booster.num_boosted_rounds(),
+        "added_rounds": booster.num_boosted_rounds() - base_rounds,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    log.info(f"XGBoost: +{stats['added_rounds']} რაუნდი ({base_rounds} -> "
+             f"{stats['iterations']}), {stats['train_sec']:.2f}s")
+    return BoosterClassifier(booster), stats
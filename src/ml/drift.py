@@ -0,0 +1,71 @@
+"""მონაცემების და მოდელის დრიფტის შემოწმება (ინკრემენტული გადაწვრთნისთვის).
+
+- ფიჩერების დრიფტი: PSI (population stability index) სწავლების ბოლო
+  პერიოდის (კუმულატიური ფიჩერები, მაგ. h2h, დროსთან ერთად იზრდება) და ახალ
+  მატჩებს შორის; ბინები სწავლების კვანტილებია, მათი რაოდენობა ახალი
+  სტრიქონების რაოდენობას ერგება, ძალიან მცირე ნიმუშზე კი არ მოწმდება;
+- მოდელის დრიფტი: ძველი მოდელის log-loss ახალ მატჩებზე მნიშვნელოვნად
+  (სტანდარტული შეცდომის გათვალისწინებით) აღემატება სატესტოს.
+"""
+import numpy as np
+
+from src.config import INCREMENTAL_PSI_THRESHOLD, INCREMENTAL_LOGLOSS_TOLERANCE
+
+PSI_MAX_BINS = 10
+PSI_ROWS_PER_BIN = 20
+PSI_EPS = 1e-4
+PSI_MIN_ROWS = 100  # ნაკლებ ახალ სტრიქონზე PSI მხოლოდ ხმაურია
+
+
+def population_stability(reference, current, bins: int = None) -> np.ndarray:
+    """PSI თითოეული სვეტისთვის (NaN-ები ცალკე ბინია)."""
+    reference = np.asarray(reference, dtype=np.float64)
+    current = np.asarray(current, dtype=np.float64)
+    if bins is None:
+        bins = int(np.clip(len(current) // PSI_ROWS_PER_BIN, 2, PSI_MAX_BINS))
+    quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+
+    psi = np.zeros(reference.shape[1])
+    for j in range(reference.shape[1]):
+        ref_col, cur_col = reference[:, j], current[:, j]
+        ref_valid = ref_col[~np.isnan(ref_col)]
+        if len(ref_valid) == 0:
+            continue
+        edges = np.unique(np.quantile(ref_valid, quantiles))
+        ref_share = _bin_shares(ref_col, edges)
+        cur_share = _bin_shares(cur_col, edges)
+        psi[j] = np.sum((cur_share - ref_share) * np.log(cur_share / ref_share))
+    return psi
+
+
+def _bin_shares(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    nan = np.isnan(values)
+    counts = np.bincount(np.searchsorted(edges, values[~nan], side="right"),
+                         minlength=len(edges) + 1).astype(np.float64)
+    counts = np.append(counts, nan.sum())
+    return np.maximum(counts / max(len(values), 1), PSI_EPS)
+
+
+def detect_drift(X_reference, X_new, feature_columns: list, base_log_loss: float | None,
+                 row_losses: np.ndarray, psi_threshold: float = INCREMENTAL_PSI_THRESHOLD,
+                 tolerance: float = INCREMENTAL_LOGLOSS_TOLERANCE) -> list:
+    """დრიფტის მიზეზების სია (ცარიელი - დრიფტი არ არის).
+
+    X_reference: სწავლების ბოლო პერიოდის ფიჩერები (INCREMENTAL_REFERENCE_DAYS).
+    row_losses: ძველი მოდელის log-loss თითოეულ ახალ მატჩზე.
+    """
+    reasons = []
+    psi = (population_stability(X_reference, X_new) if len(X_new) >= PSI_MIN_ROWS
+           else np.zeros(len(feature_columns)))
+    drifted = np.flatnonzero(psi > psi_threshold)
+    if len(drifted):
+        worst = drifted[np.argsort(psi[drifted])[::-1][:3]]
+        reasons.append(f"ფიჩერების დრიფტი (PSI > {psi_threshold}): " + ", ".join(
+            f"{feature_columns[j]}={psi[j]:.2f}" for j in worst))
+
+    if base_log_loss is not None and len(row_losses):
+        new_log_loss = float(np.mean(row_losses))
+        stderr = float(np.std(row_losses) / np.sqrt(len(row_losses)))
+        if new_log_loss - base_log_loss > tolerance + 2 * stderr:
+            reasons.append(f"log-loss გაუარესდა: {base_log_loss:.4f} -> {new_log_loss:.4f}")
+    return reasons
@@ -0,0 +1,122 @@
+"""მოდელისგან დამოუკიდებელი permutation importance და ფიჩერების შემცირება.
+
+მნიშვნელობა იზომება დროით ბოლო (სატესტო) ნაწილზე: თითო სვეტი
+IMPORTANCE_REPEATS-ჯერ ირევა და ფიქსირდება log-loss-ის ზრდა (და სიზუსტის
+კლება) - ნებისმიერი მოდელისთვის, რომელსაც predict_proba აქვს (LR-ის
+ჩათვლით, რომელსაც feature_importances_ არ გააჩნია). სვეტები
+პროცესებში ნაწილდება plan("importance")-ის მიხედვით; თითო სვეტის
+შემთხვევითობა მხოლოდ seed-სა და სვეტის ინდექსზეა დამოკიდებული, ამიტომ
+შედეგი პროცესების რაოდენობისგან დამოუკიდებელია.
+"""
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.metrics import log_loss
+
+from src.config import IMPORTANCE_REPEATS, IMPORTANCE_WORKERS
+from src.utils.concurrency import plan, limit_threads, set_process_threads
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+_state = {}
+
+
+def _init_state(model, scaler, X, y, blas_threads: int = None, nthread: int = None):
+    """worker-ის მდგომარეობა (ერთხელ): მოდელი, სატესტო მატრიცა და საბაზო შეფასება."""
+    if blas_threads:
+        set_process_threads(blas_threads)
+    if nthread and hasattr(model, "get_booster"):
+        model.get_booster().set_param({"nthread": nthread})
+    _state.update(model=model, scaler=scaler, X=np.array(X, dtype=np.float64), y=np.asarray(y))
+
+
+def _score(X: np.ndarray) -> tuple:
+    model, scaler, y = _state["model"], _state["scaler"], _state["y"]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)  # სკალერი სვეტების სახელებით ისწავლა
+        proba = model.predict_proba(scaler.transform(X) if scaler is not None else X)
+    return (float(log_loss(y, proba, labels=[0, 1, 2])),
+            float((np.asarray(proba).argmax(axis=1) == y).mean()))
+
+
+def _permute_column(task: tuple) -> tuple:
+    """ერთი სვეტი: (ინდექსი, log-loss-ის ზრდები, სიზუსტის კლებები) n_repeats გამეორებით."""
+    j, n_repeats, seed, base_loss, base_acc = task
+    X = _state["X"]
+    original = X[:, j].copy()
+    rng = np.random.default_rng([seed, j])
+    losses, drops = [], []
+    try:
+        for _ in range(n_repeats):
+            X[:, j] = rng.permutation(original)
+            loss, acc = _score(X)
+            losses.append(loss - base_loss)
+            drops.append(base_acc - acc)
+    finally:
+        X[:, j] = original
+    return j, losses, drops
+
+
+def permutation_importance(model, X, y, feature_columns: list, scaler=None,
+                           n_repeats: int = IMPORTANCE_REPEATS,
+                           workers: int = IMPORTANCE_WORKERS, seed: int = 42) -> dict:
+    """permutation importance სატესტო ნაწილზე (X - შევსებული ნედლი ფიჩერები).
+
+    აბრუნებს {"log_loss", "accuracy", "n_repeats", "sec",
+    "features": {სვეტი: {"log_loss_increase", "std", "accuracy_drop"}}} -
+    სვეტები log-loss-ის ზრდის კლებადობით.
+    """
+    start = time.perf_counter()
+    layout = plan("importance", tasks=len(feature_columns), workers=workers)
+    _init_state(model, scaler, X, y)
+    base_loss, base_acc = _score(_state["X"])
+    tasks = [(j, n_repeats, seed, base_loss, base_acc) for j in range(len(feature_columns))]
+
+    if layout.workers > 1:
+        with ProcessPoolExecutor(
+                max_workers=layout.workers, initializer=_init_state,
+                initargs=(model, scaler, X, y, layout.blas_threads,
+                          layout.estimator_threads)) as pool:
+            results = list(pool.map(_permute_column, tasks,
+                                    chunksize=max(1, len(tasks) // (layout.workers * 4))))
+    else:
+        with limit_threads(layout):
+            results = [_permute_column(task) for task in tasks]
+    _state.clear()
+
+    features = {}
+    for j, losses, drops in results:
+        features[feature_columns[j]] = {
+            "log_loss_increase": float(np.mean(losses)),
+            "std": float(np.std(losses)),
+            "accuracy_drop": float(np.mean(drops)),
+        }
+    features = dict(sorted(features.items(), key=lambda kv: kv[1]["log_loss_increase"],
+                           reverse=True))
+    sec = time.perf_counter() - start
+    log.info(f"permutation importance: {len(features)} ფიჩერი x {n_repeats}, "
+             f"{layout.workers} პროცესი, {sec:.1f}s")
+    return {"log_loss": base_loss, "accuracy": base_acc, "n_repeats": n_repeats,
+            "sec": round(sec, 3), "features": features}
+
+
+def top_features(importance: dict, k: int) -> list:
+    """k ყველაზე მნიშვნელოვანი სვეტი (log-loss-ის ზრდით)."""
+    return list(importance["features"])[:k]
+
+
+def scoring_latency_ms(predict, X, repeats: int = 5) -> float:
+    """predict(X) -> ალბათობები: მედიანური დრო 1000 სტრიქონზე (მილიწამები).
+
+    predict - მაგ. ModelArtifact/ModelFamily-ის predict_raw (NumPy შესასვლელი).
+    """
+    X = np.asarray(X, dtype=np.float64)
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        times.append(time.perf_counter() - start)
+    return float(np.median(times) / max(len(X), 1) * 1000 * 1000)
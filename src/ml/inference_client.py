@@ -0,0 +1,118 @@
+"""ინფერენსის სერვერის თხელი კლიენტი ლოკალური fallback-ით.
+
+სერვერის (run_server.py) გარეშეც მუშაობს: თუ ის მიუწვდომელია,
+მოთხოვნები პროცესის PredictionService-ზე გადადის.
+"""
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pandas as pd
+
+from src.config import INFERENCE_HOST, INFERENCE_PORT, INFERENCE_TIMEOUT_SEC
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+RETRY_REMOTE_SEC = 30  # მიუწვდომელი სერვერის ხელახალი შემოწმების ინტერვალი
+
+
+class InferenceClient:
+    """PredictionService-ის ინტერფეისი HTTP-ზე."""
+
+    def __init__(self, host: str = INFERENCE_HOST, port: int = INFERENCE_PORT,
+                 timeout: float = INFERENCE_TIMEOUT_SEC):
+        self.base_url = f"http://{host}:{port}"
+        self.timeout = timeout
+        self._remote = None  # None = ჯერ არ შემოწმებულა
+        self._checked_at = 0.0
+
+    def _local(self):
+        from src.ml.service import get_prediction_service
+        return get_prediction_service()
+
+    def _request(self, path: str, payload: dict = None) -> bytes:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data,
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+    def _use_remote(self) -> bool:
+        if self._remote is None or (
+                not self._remote and time.monotonic() - self._checked_at > RETRY_REMOTE_SEC):
+            self._checked_at = time.monotonic()
+            try:
+                health = json.loads(self._request("/health"))
+                self._remote = health.get("status") == "ok"
+                log.info(f"ინფერენსის სერვერი: {self.base_url}")
+            except (urllib.error.URLError, OSError, ValueError):
+                self._remote = False
+                log.info("ინფერენსის სერვერი მიუწვდომელია - ლოკალური მოდელი")
+        return self._remote
+
+    def _call(self, path: str, payload: dict, local):
+        """სერვერზე მოთხოვნა; კავშირის შეცდომისას - ლოკალური გამოძახება."""
+        if self._use_remote():
+            try:
+                return self._request(path, payload)
+            except urllib.error.HTTPError as e:
+                # სერვერი მუშაობს, მაგრამ მოთხოვნა ჩავარდა - მხოლოდ ეს გამოძახება ლოკალურად
+                log.error(f"ინფერენსის სერვერის პასუხი {e.code}: {e.read()[:200]!r}")
+                return local()
+            except (urllib.error.URLError, OSError) as e:
+                log.warning(f"ინფერენსის სერვერის შეცდომა ({e}) - ლოკალური მოდელი")
+                self._remote = False
+        return local()
+
+    def is_ready(self) -> bool:
+        if self._use_remote():
+            try:
+                return bool(json.loads(self._request("/health")).get("model_ready"))
+            except (urllib.error.URLError, OSError, ValueError):
+                self._remote = False
+        return self._local().is_ready()
+
+    def get_latest_predictions(self, n: int = 20, division: str = None, since: str = None,
+                               until: str = None, team: str = None) -> pd.DataFrame:
+        query = {"n": n, "division": division, "since": since, "until": until, "team": team}
+        result = self._call("/latest", query,
+                            lambda: self._local().get_latest_predictions(**query))
+        if isinstance(result, pd.DataFrame):
+            return result
+        frame = pd.read_json(io.StringIO(result.decode("utf-8")), orient="split",
+                             convert_dates=False)
+        if "Date" in frame.columns:
+            frame["Date"] = pd.to_datetime(frame["Date"])
+        return frame
+
+    def predict_single(self, home_team: str, away_team: str, division: str = None,
+                       date: str = None, odds: tuple = None) -> dict | None:
+        query = {"home_team": home_team, "away_team": away_team,
+                 "division": division, "date": date, "odds": odds}
+        result = self._call("/predict", query,
+                            lambda: self._local().predict_single(**query))
+        if isinstance(result, bytes):
+            return json.loads(result)["prediction"]
+        return result
+
+    def warm_up_async(self):
+        """სერვერის გარეშე - ლოკალური სერვისის ფონური გამზადება."""
+        if not self._use_remote():
+            self._local().warm_up_async()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_inference_client() -> InferenceClient:
+    """პროცესის ერთადერთი InferenceClient."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = InferenceClient()
+        return _client
@@ -0,0 +1,230 @@
+"""ლოკალური ინფერენსის სერვერი (localhost HTTP, მიკრო-ბატჩინგით).
+
+მოდელი და ფიჩერების მდგომარეობა ერთხელ იტვირთება; ბოტი და ვებ
+გვერდები InferenceClient-ით მიმართავენ. ერთდროული /predict მოთხოვნები
+გროვდება მიკრო-ბატჩებად (INFERENCE_MAX_WAIT_MS / INFERENCE_MAX_BATCH)
+და ფასდება ერთი predict_proba გამოძახებით.
+
+    GET  /health   - მდგომარეობა
+    GET  /metrics  - მრიცხველები და დაყოვნებები
+    POST /predict  - {"home_team", "away_team", "division", "date", "odds"}
+    POST /latest   - {"n", "division", "since", "until", "team"}
+"""
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from src.config import (
+    INFERENCE_HOST, INFERENCE_PORT, INFERENCE_MAX_WAIT_MS, INFERENCE_MAX_BATCH,
+)
+from src.ml.service import get_prediction_service
+from src.utils.concurrency import plan, set_process_threads
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+LATENCY_WINDOW = 1000  # ბოლო N მოთხოვნის დაყოვნება პერცენტილებისთვის
+ENDPOINT_FIELDS = {
+    "/predict": {"home_team", "away_team", "division", "date", "odds"},
+    "/latest": {"n", "division", "since", "until", "team"},
+}
+
+
+class Metrics:
+    """thread-safe მრიცხველები /metrics-ისთვის."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.requests = {}
+        self.errors = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.max_batch = 0
+        self._latencies = []
+
+    def record_request(self, endpoint: str, seconds: float, ok: bool = True):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self.errors += not ok
+            self._latencies.append(seconds)
+            del self._latencies[:-LATENCY_WINDOW]
+
+    def record_batch(self, size: int):
+        with self._lock:
+            self.batches += 1
+            self.batched_items += size
+            self.max_batch = max(self.max_batch, size)
+
+    def snapshot(self, queue_depth: int = 0) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            return {
+                "uptime_sec": round(time.time() - self.started, 1),
+                "requests": dict(self.requests),
+                "errors": self.errors,
+                "batches": self.batches,
+                "avg_batch_size": round(self.batched_items / self.batches, 2)
+                if self.batches else 0,
+                "max_batch_size": self.max_batch,
+                "queue_depth": queue_depth,
+                "latency_ms_p50": round(float(np.percentile(latencies, 50)), 2)
+                if len(latencies) else None,
+                "latency_ms_p95": round(float(np.percentile(latencies, 95)), 2)
+                if len(latencies) else None,
+            }
+
+
+class MicroBatcher:
+    """ერთდროული მოთხოვნების გაერთიანება ერთ ბატჩურ გამოძახებაში."""
+
+    def __init__(self, batch_fn, max_batch: int = INFERENCE_MAX_BATCH,
+                 max_wait_ms: float = INFERENCE_MAX_WAIT_MS, metrics: Metrics = None):
+        self.batch_fn = batch_fn
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.metrics = metrics
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            if self.metrics is not None:
+                self.metrics.record_batch(len(batch))
+            try:
+                results = self.batch_fn([item for item, _ in batch])
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                # ერთი ცუდი მოთხოვნა დანარჩენებს არ უნდა ჩააგდოს
+                log.warning(f"ბატჩის შეცდომა ({e}) - მოთხოვნები ცალ-ცალკე")
+                for item, future in batch:
+                    try:
+                        future.set_result(self.batch_fn([item])[0])
+                    except Exception as item_error:
+                        future.set_exception(item_error)
+                continue
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+class InferenceServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # ერთდროული კავშირები (ნაგულისხმევი 5 ძალიან მცირეა)
+
+    def __init__(self, host: str = INFERENCE_HOST, port: int = INFERENCE_PORT,
+                 max_batch: int = INFERENCE_MAX_BATCH,
+                 max_wait_ms: float = INFERENCE_MAX_WAIT_MS):
+        super().__init__((host, port), _Handler)
+        self.service = get_prediction_service()
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(
+            lambda queries: self.service.predictor().predict_many(queries),
+            max_batch=max_batch, max_wait_ms=max_wait_ms, metrics=self.metrics,
+        )
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: InferenceServer
+
+    def do_GET(self):
+        if self.path == "/health":
+            service = self.server.service
+            predictor = service.predictor()
+            self._send(200, {
+                "status": "ok",
+                "model_ready": predictor.is_ready(),
+                "model_type": predictor.metadata.get("model_type"),
+                "model_version": predictor.version,
+            })
+        elif self.path == "/metrics":
+            self._send(200, self.server.metrics.snapshot(self.server.batcher.depth()))
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        start = time.perf_counter()
+        ok = True
+        try:
+            payload = self._read_json()
+            fields = ENDPOINT_FIELDS.get(self.path)
+            if fields is not None and not set(payload) <= fields:
+                raise ValueError(f"უცნობი ველები: {sorted(set(payload) - fields)}")
+            if self.path == "/predict":
+                result = self.server.batcher.submit(payload).result()
+                self._send(200, {"prediction": result})
+            elif self.path == "/latest":
+                frame = self.server.service.get_latest_predictions(**payload)
+                body = frame.to_json(orient="split", date_format="iso", index=False)
+                self._send_raw(200, body.encode("utf-8"))
+            else:
+                self._send(404, {"error": "not found"})
+        except (ValueError, TypeError) as e:
+            ok = False
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            ok = False
+            log.error(f"მოთხოვნის შეცდომა ({self.path}): {e}")
+            self._send(500, {"error": str(e)})
+        finally:
+            self.server.metrics.record_request(self.path, time.perf_counter() - start, ok)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(payload, dict):
+            raise ValueError("მოთხოვნა JSON ობიექტი უნდა იყოს")
+        return payload
+
+    def _send(self, status: int, payload: dict):
+        self._send_raw(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def _send_raw(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug(f"{self.address_string()} - {format % args}")
+
+
+def serve(host: str = INFERENCE_HOST, port: int = INFERENCE_PORT, warm_up: bool = True):
+    """სერვერის გაშვება (ბლოკავს)."""
+    # მოთხოვნები მიკრო-ბატჩად ერთ ნაკადში ფასდება - BLAS-ის ნაკადები მხოლოდ ხელს უშლის
+    set_process_threads(plan("inference").blas_threads)
+    server = InferenceServer(host, port)
+    if warm_up:
+        server.service.warm_up_async()
+    log.info(f"ინფერენსის სერვერი: http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
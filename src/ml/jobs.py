@@ -0,0 +1,151 @@
+"""ფონური გაწვრთნის job-ები (training_jobs ცხრილი, run_worker.py).
+
+მოდელის გვერდი job-ს რიგში აყენებს და სტატუსს პერიოდულად კითხულობს;
+worker-ი მას ცალკე პროცესში ასრულებს. MatchPredictor.progress ყოველ
+ეტაპზე (features, search, fit, save) წერს პროგრესს და heartbeat-ს და
+ამოწმებს გაუქმების მოთხოვნას - გაუქმებისას გაწვრთნა TrainingCancelled-ით
+წყდება მოდელის გამოქვეყნებამდე. training_lock (ფაილის flock) ერთდროულად
+მხოლოდ ერთ გაწვრთნას უშვებს - worker-ს, run_training.py-ს და განრიგს შორის.
+"""
+import json
+import os
+import traceback
+from contextlib import contextmanager
+from datetime import datetime
+
+from src.config import TRAINING_LOCK_PATH
+from src.data.db_manager import (
+    claim_next_training_job, update_training_job, get_training_job, fail_orphaned_training_jobs,
+)
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+JOB_MODES = {
+    "full": "სრული",
+    "per_division": "ლიგების მოდელები",
+    "incremental": "ინკრემენტული",
+    "out_of_core": "out-of-core",
+}
+
+
+class TrainingCancelled(Exception):
+    """გაწვრთნა გაუქმდა მომხმარებლის მოთხოვნით."""
+
+
+@contextmanager
+def training_lock(path=TRAINING_LOCK_PATH):
+    """ექსკლუზიური lock (არაბლოკირებადი): yield True - აღებულია, False - სხვა პროცესს უჭირავს."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    f = open(path, "a+")
+    try:
+        try:
+            _lock_file(f)
+        except OSError:
+            yield False
+            return
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        try:
+            yield True
+        finally:
+            _unlock_file(f)
+    finally:
+        f.close()
+
+
+if os.name == "nt":
+    import msvcrt
+
+    def _lock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(f):
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(f):
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def _progress_callback(job_id: int):
+    def report(stage: str, fraction: float, message: str = ""):
+        job = get_training_job(job_id)
+        if job is None or job["cancel_requested"]:
+            raise TrainingCancelled(f"job {job_id} გაუქმდა ({stage})")
+        update_training_job(job_id, stage=stage, progress=round(float(fraction), 4),
+                            message=message, heartbeat_at=datetime.now().isoformat())
+    return report
+
+
+def _train(trainer, mode: str, shadow: bool) -> dict:
+    if mode == "incremental":
+        return trainer.train_incremental(shadow=shadow)
+    if mode == "out_of_core":
+        return trainer.train_out_of_core(shadow=shadow)
+    if mode in ("full", "per_division"):
+        return trainer.train(shadow=shadow, per_division=mode == "per_division")
+    raise ValueError(f"უცნობი რეჟიმი: {mode} ({', '.join(JOB_MODES)})")
+
+
+def run_job(job: dict) -> str:
+    """ერთი job-ის შესრულება (lock უკვე აღებულია); აბრუნებს საბოლოო სტატუსს."""
+    from src.ml.trainer import MatchPredictor
+
+    job_id = job["id"]
+    log.info(f"job {job_id}: {JOB_MODES.get(job['mode'], job['mode'])}"
+             f"{' (shadow)' if job['shadow'] else ''}")
+    trainer = MatchPredictor()
+    trainer.progress = _progress_callback(job_id)
+    try:
+        results = _train(trainer, job["mode"], bool(job["shadow"]))
+    except TrainingCancelled as e:
+        log.info(str(e))
+        update_training_job(job_id, status="cancelled", message="გაუქმდა",
+                            finished_at=datetime.now().isoformat())
+        return "cancelled"
+    except Exception as e:
+        log.error(f"job {job_id}: შეცდომა: {e}")
+        update_training_job(job_id, status="error", error=f"{e}\n{traceback.format_exc()}",
+                            finished_at=datetime.now().isoformat())
+        return "error"
+
+    if not results:
+        update_training_job(job_id, status="error", error="გაწვრთნა ვერ მოხერხდა (მონაცემები?)",
+                            finished_at=datetime.now().isoformat())
+        return "error"
+    update_training_job(job_id, status="done", stage="save", progress=1.0,
+                        message=f"ვერსია {results.get('version')}",
+                        result=json.dumps(_summary(results), ensure_ascii=False, default=str),
+                        finished_at=datetime.now().isoformat())
+    log.info(f"job {job_id}: დასრულდა (ვერსია {results.get('version')})")
+    return "done"
+
+
+def _summary(results: dict) -> dict:
+    keys = ("mode", "model_type", "version", "accuracy", "log_loss", "train_size",
+            "test_size", "new_rows", "fallback_reason", "duration_sec")
+    return {k: results[k] for k in keys if k in results}
+
+
+def run_next_job(worker_pid: int = None) -> str | None:
+    """რიგის შემდეგი job (lock-ით); None - რიგი ცარიელია ან სხვა გაწვრთნა მიმდინარეობს."""
+    with training_lock() as acquired:
+        if not acquired:
+            return None
+        # lock თავისუფალი იყო - running job-ების worker-ი აღარ არსებობს
+        orphaned = fail_orphaned_training_jobs("worker-ი შეწყდა დასრულებამდე")
+        if orphaned:
+            log.warning(f"{orphaned} მიტოვებული job მოინიშნა შეცდომად")
+        job = claim_next_training_job(worker_pid or os.getpid())
+        if job is None:
+            return None
+        return run_job(job)
@@ -0,0 +1,123 @@
+"""პროგნოზების წინასწარი დათვლა predictions ცხრილში.
+
+run_scheduler.py პერიოდულად უშვებს: მონაცემების განახლების ან ახალი
+მოდელის გამოქვეყნების შემდეგ ფასდება ყველა ახალი/დაუსრულებელი მატჩი
+მიმდინარე მოდელის და shadow ვერსიებით (ფიჩერები ერთხელ) და ბატჩად
+იწერება ბაზაში. ბოტი და ვებ გვერდები (PredictionService) ჩემპიონის
+სტრიქონებს ინდექსირებული მოთხოვნით კითხულობენ - ML ინფერენსის გარეშე.
+"""
+import time
+from datetime import datetime
+
+from src.data.db_manager import (
+    get_data_version, get_match_ids_to_score, upsert_predictions,
+    insert_prediction_run, get_last_prediction_run, insert_matches, mark_unscorable,
+)
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+
+def refresh_data() -> int:
+    """CSV-ების ხელახლა ჩამოტვირთვა და ახალი მატჩების ჩასმა (setup_data.py-ის ნაბიჯები)."""
+    from src.data.collector import download_all, load_all_raw_data
+    from src.data.cleaner import clean_dataframe, prepare_for_db
+
+    download_all()
+    raw_df = load_all_raw_data()
+    if raw_df.empty:
+        log.warning("მონაცემების განახლება: raw ფაილები ცარიელია")
+        return 0
+    return insert_matches(prepare_for_db(clean_dataframe(raw_df)))
+
+
+def is_fresh(model_version: str, shadow_versions: list = None) -> bool:
+    """ბოლო დათვლა მიმდინარე მონაცემებითა და ამ მოდელის ვერსიით გაკეთდა?
+
+    shadow_versions: None - shadow-ები არ მოწმდება (მხოლოდ ჩემპიონის კითხვისთვის).
+    """
+    if model_version is None:
+        return False
+    last = get_last_prediction_run()
+    if last is None or last["model_version"] != model_version:
+        return False
+    if shadow_versions is not None and \
+            (last.get("shadow_versions") or "") != ",".join(shadow_versions):
+        return False
+    return last["data_version"] == get_data_version()
+
+
+def precompute_predictions(force: bool = False) -> dict:
+    """ახალი/დაუსრულებელი მატჩების შეფასება და ჩაწერა; აბრუნებს გაშვების ჩანაწერს."""
+    from src.ml.service import get_prediction_service
+
+    predictor = get_prediction_service().predictor()
+    if not predictor.is_ready():
+        log.warning("წინასწარი დათვლა გამოტოვებულია: მოდელი არ არის ჩატვირთული")
+        return {}
+
+    model_version = predictor.version
+    shadows = predictor.shadow_versions
+    if not force and is_fresh(model_version, shadows):
+        log.debug("წინასწარი დათვლა: ცვლილებები არ არის")
+        return {}
+
+    run = {
+        "started_at": datetime.now().isoformat(),
+        "model_version": model_version,
+        "shadow_versions": ",".join(shadows),
+        "data_version": get_data_version(),
+        "scored": 0,
+    }
+    try:
+        start = time.perf_counter()
+        match_ids = get_match_ids_to_score([model_version, *shadows])
+        run["load_sec"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frames = predictor.predict_matches_all(match_ids=match_ids) if match_ids else {}
+        run["score_sec"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = [_prediction_row(row, version)
+                for version, frame in frames.items()
+                for row in frame.to_dict("records")]
+        run["scored"] = upsert_predictions(rows)
+        # ფიჩერებიდან ამოვარდნილი დასრულებული მატჩები ყოველ გაშვებაზე აღარ ფასდება
+        skipped = 0
+        for version, frame in frames.items():
+            skipped += mark_unscorable(
+                sorted(set(match_ids) - set(frame["match_id"].tolist())), version)
+        run["write_sec"] = time.perf_counter() - start
+        run["status"] = "ok"
+        log.info(f"წინასწარი დათვლა: {run['scored']} პროგნოზი, {len(match_ids)} მატჩი "
+                 f"({len(frames)} მოდელი, ჩემპიონი {model_version}, "
+                 f"{skipped} შეუფასებლად მონიშნული, "
+                 f"შეფასება {run['score_sec']:.2f}s, ჩაწერა {run['write_sec']:.2f}s)")
+    except Exception as e:
+        run["status"] = "error"
+        run["notes"] = str(e)
+        log.error(f"წინასწარი დათვლის შეცდომა: {e}")
+
+    run["finished_at"] = datetime.now().isoformat()
+    insert_prediction_run(run)
+    return run
+
+
+def _prediction_row(row: dict, model_version: str) -> dict:
+    settled = isinstance(row.get("FTR"), str)
+    return {
+        "match_id": int(row["match_id"]),
+        "date": row["Date"].strftime("%Y-%m-%d"),
+        "home_team": row["HomeTeam"],
+        "away_team": row["AwayTeam"],
+        "division": row["Div"],
+        "prob_home": float(row.get("prob_H", 0)),
+        "prob_draw": float(row.get("prob_D", 0)),
+        "prob_away": float(row.get("prob_A", 0)),
+        "predicted_result": row["predicted"],
+        "confidence": float(row["confidence"]),
+        "actual_result": row["FTR"] if settled else None,
+        "is_correct": int(row["is_correct"]) if settled else None,
+        "model_version": model_version,
+    }
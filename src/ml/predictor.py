@@ -1,12 +1,15 @@
 """პროგნოზების გაკეთება გაწვრთნილი მოდელით."""
-import json
+import threading
+from functools import lru_cache
 import numpy as np
 import pandas as pd
-import joblib
 
-from src.config import MODEL_PATH, MODEL_METADATA_PATH
-from src.data.db_manager import get_all_matches, insert_prediction
-from src.data.feature_engineer import create_features, get_feature_columns
+from src.data.db_manager import get_all_matches, get_data_version, insert_prediction
+from src.data.feature_engineer import (
+    create_features, get_feature_columns, prepare_matches,
+    build_feature_states, point_features,
+)
+from src.ml.artifacts import load_model, model_key, shadow_versions
 from src.utils.logger import get_logger
 
 log = get_logger(__name__)
@@ -14,132 +17,237 @@ log = get_logger(__name__)
 
 class Predictor:
     def __init__(self):
-        self.model = None
-        self.scaler = None
-        self.label_encoder = None
-        self.feature_columns = []
-        self.metadata = {}
+        self._models = (None, ())  # (ჩემპიონი, shadow-ები) - ერთად იცვლება
+        self._loaded_key = None
+        self._reload_lock = threading.Lock()
         self._load_model()
 
+    # მიმდინარე არტეფაქტის ველები (სკორინგი იღებს ერთ snapshot-ს, რომ
+    # hot-reload-მა შუა გამოთვლაში ვერსიები არ აურიოს)
+    _artifact = property(lambda self: self._models[0])
+    shadow_versions = property(lambda self: [a.version for a in self._models[1]])
+    model = property(lambda self: self._artifact.model if self._artifact else None)
+    scaler = property(lambda self: self._artifact.scaler if self._artifact else None)
+    label_encoder = property(
+        lambda self: self._artifact.label_encoder if self._artifact else None)
+    feature_columns = property(
+        lambda self: self._artifact.feature_columns if self._artifact else [])
+    metadata = property(lambda self: self._artifact.metadata if self._artifact else {})
+    version = property(lambda self: self._artifact.version if self._artifact else None)
+
     def _load_model(self):
-        """გაწვრთნილი მოდელის ჩატვირთვა."""
+        """მიმდინარე (CURRENT) მოდელის და shadow ვერსიების ჩატვირთვა."""
+        key = model_key()
         try:
-            model_data = joblib.load(str(MODEL_PATH))
-            self.model = model_data["model"]
-            self.scaler = model_data["scaler"]
-            self.label_encoder = model_data["label_encoder"]
-            self.feature_columns = model_data["feature_columns"]
-
-            with open(str(MODEL_METADATA_PATH), "r", encoding="utf-8") as f:
-                self.metadata = json.load(f)
-
-            log.info(f"მოდელი ჩატვირთულია: {self.metadata.get('model_type')}")
-        except FileNotFoundError:
-            log.warning("გაწვრთნილი მოდელი ვერ მოიძებნა. ჯერ გაუშვით run_training.py")
+            artifact = load_model()
+            if artifact is None:
+                log.warning("გაწვრთნილი მოდელი ვერ მოიძებნა. ჯერ გაუშვით run_training.py")
+            else:
+                log.info(f"მოდელი ჩატვირთულია: {artifact.metadata.get('model_type')} "
+                         f"(ვერსია {artifact.version})")
+            shadows = []
+            for version in shadow_versions() if artifact is not None else []:
+                try:
+                    shadows.append(load_model(version))
+                except Exception as e:
+                    log.error(f"shadow მოდელის ({version}) ჩატვირთვის შეცდომა: {e}")
+            if shadows:
+                log.info(f"shadow მოდელები: {[a.version for a in shadows]}")
+            self._models = (artifact, tuple(shadows))
         except Exception as e:
             log.error(f"მოდელის ჩატვირთვის შეცდომა: {e}")
+        self._loaded_key = key
+
+    def refresh(self) -> bool:
+        """ახალი ვერსიის გამოქვეყნებისას ხელახლა ჩატვირთვა (True - შეიცვალა)."""
+        if model_key() == self._loaded_key:
+            return False
+        with self._reload_lock:
+            if model_key() == self._loaded_key:
+                return False
+            previous = self.version
+            self._load_model()
+            log.info(f"მოდელი განახლდა: {previous} -> {self.version}")
+            return True
 
     def is_ready(self) -> bool:
         return self.model is not None
 
-    def predict_matches(self, division: str = None, upcoming_only: bool = False) -> pd.DataFrame:
-        """მატჩების პროგნოზირება."""
-        if not self.is_ready():
+    def predict_matches(self, division: str = None, upcoming_only: bool = False,
+                        n: int = None, since: str = None, until: str = None,
+                        team: str = None, match_ids: list = None) -> pd.DataFrame:
+        """მატჩების პროგნოზირება.
+
+        since/until (თარიღები, ჩათვლით) და team (სახელის ნაწილი) ზღუდავენ,
+        რომელ მატჩებზე დაითვლება ფიჩერები; n - მათგან ბოლო n თარიღით.
+        match_ids - მხოლოდ ეს მატჩები (ბაზის id, შედეგში match_id სვეტი).
+        ისტორია მაინც მთლიანად გადათამაშდება, მაგრამ ფიჩერები და სკორინგი
+        მხოლოდ მოთხოვნილ ფანჯარაზე სრულდება.
+        """
+        results = self.predict_matches_all(division=division, n=n, since=since,
+                                           until=until, team=team, match_ids=match_ids,
+                                           shadows=False)
+        return next(iter(results.values()), pd.DataFrame())
+
+    def predict_matches_all(self, division: str = None, n: int = None, since: str = None,
+                            until: str = None, team: str = None, match_ids: list = None,
+                            shadows: bool = True) -> dict:
+        """ჩემპიონი და shadow მოდელები ერთ გავლაში: {ვერსია: შედეგი}.
+
+        ფიჩერები ერთხელ ითვლება (ყველა მოდელის სვეტების გაერთიანებით),
+        შემდეგ თითოეული მოდელი მას თავისი სვეტებით აფასებს. ჩემპიონი
+        ყოველთვის პირველია.
+        """
+        self.refresh()
+        art, shadow_arts = self._models
+        if art is None:
             log.error("მოდელი არ არის ჩატვირთული")
-            return pd.DataFrame()
+            return {}
+        arts = [art, *shadow_arts] if shadows else [art]
 
         df = get_all_matches(division=division)
         if df.empty:
             log.warning("მატჩები ვერ მოიძებნა")
-            return pd.DataFrame()
+            return {}
 
-        featured_df = create_features(df)
-        if featured_df.empty:
-            return pd.DataFrame()
+        windowed = n is not None or since or until or team or match_ids is not None
+        candidates = _window_mask(df, since, until, team) if windowed else None
+        if match_ids is not None:
+            candidates &= df["id"].isin(match_ids)
+
+        # მხოლოდ მოდელებისთვის საჭირო ფიჩერების ჯგუფები
+        columns = list(dict.fromkeys(c for a in arts for c in a.feature_columns))
 
-        # ფიჩერების მომზადება
-        available_features = [c for c in self.feature_columns if c in featured_df.columns]
-        if len(available_features) < len(self.feature_columns) * 0.5:
-            log.error("ძალიან ბევრი ფიჩერი აკლია")
-            return pd.DataFrame()
+        # ბოლო n: n-ზე ცოტა მეტი კანდიდატი, თუ NaN-ების გამო ზოგი ამოვარდა - ორმაგდება
+        limit = n
+        while True:
+            emit = _last_n(df, candidates, limit) if limit is not None else candidates
+            featured_df = create_features(df, columns=columns, emit=emit)
+            if (limit is None or len(featured_df) >= n
+                    or limit >= int(candidates.sum())):
+                break
+            limit *= 2
+
+        if featured_df.empty:
+            return {}
+        if n is not None:
+            featured_df = featured_df.sort_values("Date", kind="stable").tail(n)
 
-        X = featured_df[available_features].copy()
-        X = X.fillna(X.median())
+        results = {}
+        for a in arts:
+            result = _score_frame(a, featured_df, with_ids=match_ids is not None)
+            if result is not None:
+                results[a.version] = result
+        return results
 
-        # დაკლებული ფიჩერების დამატება 0-ით
-        for col in self.feature_columns:
-            if col not in X.columns:
-                X[col] = 0
-        X = X[self.feature_columns]
+    def predict_single(self, home_team: str, away_team: str, division: str = None,
+                       date: str = None, odds: tuple = None) -> dict | None:
+        """ერთი (შესაძლოა ჰიპოთეტური) მატჩის პროგნოზი.
 
-        # სკალირება და პროგნოზი
-        X_scaled = self.scaler.transform(X)
-        probabilities = self.model.predict_proba(X_scaled)
-        predictions = self.model.predict(X_scaled)
+        ფიჩერები აიწყობა ლიგის ისტორიიდან date-მდე (None -> მთელი ისტორია)
+        და ფასდება მხოლოდ ეს ერთი სტრიქონი. odds: (H, D, A); თუ არ არის
+        მითითებული, date მოცემულია და ეს მატჩი ბაზაშია, მისი კოეფიციენტები
+        გამოიყენება. უცნობი კოეფიციენტები შედეგში None-ია (არა 0).
+        """
+        return self.predict_many([{
+            "home_team": home_team, "away_team": away_team,
+            "division": division, "date": date, "odds": odds,
+        }])[0]
 
-        # შედეგების DataFrame
-        result = featured_df[["Date", "HomeTeam", "AwayTeam", "Div", "FTR",
-                               "B365H", "B365D", "B365A"]].copy()
-        result = result.iloc[-len(predictions):]
+    def predict_many(self, queries: list) -> list:
+        """predict_single-ის ბატჩური ვერსია: ფიჩერები თითოეულზე, სკორინგი ერთად.
 
-        labels = self.label_encoder.classes_
-        for i, label in enumerate(labels):
-            result[f"prob_{label}"] = probabilities[:, i]
+        queries: predict_single-ის არგუმენტების dict-ები. შედეგი იმავე
+        რიგითაა (None - გუნდი/მატჩები ვერ მოიძებნა).
+        """
+        self.refresh()
+        art = self._artifact
+        if art is None:
+            log.error("მოდელი არ არის ჩატვირთული")
+            return [None] * len(queries)
 
-        result["predicted"] = self.label_encoder.inverse_transform(predictions)
+        version = get_data_version()
+        points = [self._point_query(version, art.feature_columns, **query)
+                  for query in queries]
+        found = [point for point in points if point is not None]
+        if not found:
+            return [None] * len(queries)
 
-        # confidence = მაქსიმალური ალბათობა
-        result["confidence"] = probabilities.max(axis=1)
+        # დაკლებული/NaN ფიჩერები -> სწავლების მედიანები; ოჯახში - ლიგის მოდელი
+        X = np.array([[feats.get(c, np.nan) for c in art.feature_columns]
+                      for _, feats in found], dtype=np.float64)
+        probabilities = art.predict_raw(X, [info["division"] for info, _ in found])
 
-        # სწორია თუ არა
-        result["is_correct"] = (result["predicted"] == result["FTR"]).astype(int)
+        labels = [str(label) for label in art.label_encoder.classes_]
+        scored = iter(zip(found, probabilities))
+        results = []
+        for point in points:
+            if point is None:
+                results.append(None)
+                continue
+            (info, _), probs = next(scored)
+            by_label = dict(zip(labels, probs.tolist()))
+            best = int(np.argmax(probs))
+            results.append({
+                **info,
+                "prob_home": float(by_label.get("H", 0)),
+                "prob_draw": float(by_label.get("D", 0)),
+                "prob_away": float(by_label.get("A", 0)),
+                "predicted_result": labels[best],
+                "confidence": float(probs[best]),
+            })
+        return results
 
-        return result
+    def _point_query(self, version: int, columns: list, home_team: str, away_team: str,
+                     division: str = None, date: str = None,
+                     odds: tuple = None) -> tuple | None:
+        """ერთი მატჩის (მეტა-ინფორმაცია, ფიჩერები) ქეშირებული მდგომარეობიდან."""
+        df = _prepared_matches(division, version)
+        if df.empty:
+            return None
 
-    def predict_single(self, home_team: str, away_team: str,
-                       division: str = None) -> dict | None:
-        """ერთი მატჩის პროგნოზი."""
-        predictions = self.predict_matches(division=division)
-        if predictions.empty:
+        teams = _team_names(division, version)
+        home = teams.get(home_team.strip().lower())
+        away = teams.get(away_team.strip().lower())
+        if home is None or away is None:
+            log.warning(f"გუნდი ვერ მოიძებნა: {home_team if home is None else away_team}")
             return None
 
-        mask = (
-            (predictions["HomeTeam"].str.lower() == home_team.lower()) |
-            (predictions["AwayTeam"].str.lower() == away_team.lower())
-        )
+        if division is None:
+            # გუნდის ბოლო მატჩის ლიგა
+            played = df[(df["HomeTeam"] == home) | (df["AwayTeam"] == home)]
+            division = played["Div"].iloc[-1]
 
-        if home_team.lower() and away_team.lower():
-            mask = (
-                (predictions["HomeTeam"].str.lower() == home_team.lower()) &
-                (predictions["AwayTeam"].str.lower() == away_team.lower())
-            )
+        match_date = pd.Timestamp(date) if date is not None else None
+        if odds is None and match_date is not None:
+            fixture = df[(df["Div"] == division) & (df["Date"] == match_date) &
+                         (df["HomeTeam"] == home) & (df["AwayTeam"] == away)]
+            if not fixture.empty:
+                odds = tuple(fixture.iloc[-1][["B365H", "B365D", "B365A"]])
 
-        match = predictions[mask]
-        if match.empty:
-            return None
+        groups, states = _division_states(division, match_date, version,
+                                          tuple(columns))
+        feats = point_features(groups, states, home, away, odds=odds)
 
-        row = match.iloc[-1]
-        return {
-            "date": str(row["Date"]),
-            "home_team": row["HomeTeam"],
-            "away_team": row["AwayTeam"],
-            "division": row["Div"],
-            "prob_home": float(row.get("prob_H", 0)),
-            "prob_draw": float(row.get("prob_D", 0)),
-            "prob_away": float(row.get("prob_A", 0)),
-            "predicted_result": row["predicted"],
-            "confidence": float(row["confidence"]),
-            "odds_home": float(row.get("B365H", 0)),
-            "odds_draw": float(row.get("B365D", 0)),
-            "odds_away": float(row.get("B365A", 0)),
+        # უცნობი კოეფიციენტი -> None: 0 value-bet/edge-ისთვის რეალურ ფასად ჩანს
+        odds_home, odds_draw, odds_away = (_odds_value(o) for o in odds) \
+            if odds is not None else (None, None, None)
+        info = {
+            "date": str(match_date.date()) if match_date is not None else None,
+            "home_team": home,
+            "away_team": away,
+            "division": division,
+            "odds_home": odds_home,
+            "odds_draw": odds_draw,
+            "odds_away": odds_away,
         }
+        return info, feats
 
-    def get_latest_predictions(self, n: int = 20, division: str = None) -> pd.DataFrame:
-        """ბოლო N პროგნოზი."""
-        predictions = self.predict_matches(division=division)
-        if predictions.empty:
-            return predictions
-        return predictions.tail(n)
+    def get_latest_predictions(self, n: int = 20, division: str = None, since: str = None,
+                               until: str = None, team: str = None) -> pd.DataFrame:
+        """ბოლო N პროგნოზი (თარიღით), სურვილისამებრ თარიღებით/გუნდით გაფილტრული."""
+        return self.predict_matches(division=division, n=n, since=since,
+                                    until=until, team=team)
 
     def save_predictions_to_db(self, predictions: pd.DataFrame):
         """პროგნოზების ბაზაში შენახვა."""
@@ -157,6 +265,101 @@ class Predictor:
                 "confidence": float(row["confidence"]),
                 "actual_result": row.get("FTR"),
                 "is_correct": int(row.get("is_correct", 0)),
+                "model_version": self.version,
             }
             insert_prediction(pred)
         log.info(f"{len(predictions)} პროგნოზი შენახულია ბაზაში")
+
+
+def _odds_value(value) -> float | None:
+    """კოეფიციენტი float-ად; დაკლებული/NaN -> None."""
+    if value is None or pd.isna(value):
+        return None
+    return float(value)
+
+
+def _score_frame(art, featured_df: pd.DataFrame, with_ids: bool = False) -> pd.DataFrame | None:
+    """ერთი მოდელით ფიჩერების ცხრილის შეფასება (None - ფიჩერები აკლია)."""
+    available_features = [c for c in art.feature_columns if c in featured_df.columns]
+    if len(available_features) < len(art.feature_columns) * 0.5:
+        log.error(f"ძალიან ბევრი ფიჩერი აკლია (ვერსია {art.version})")
+        return None
+
+    # დაკლებული/NaN ფიჩერები -> სწავლების მედიანები (ბატჩზე არ არის დამოკიდებული),
+    # სკალირება და პროგნოზი; ოჯახი სტრიქონებს ლიგის მოდელებზე ანაწილებს
+    X = featured_df.reindex(columns=art.feature_columns).to_numpy(dtype=np.float64)
+    probabilities = art.predict_raw(X, featured_df["Div"].astype(str).to_numpy())
+
+    # შედეგების DataFrame
+    result = featured_df[["Date", "HomeTeam", "AwayTeam", "Div", "FTR",
+                          "B365H", "B365D", "B365A"]].copy()
+    if with_ids:
+        result.insert(0, "match_id", featured_df["id"].astype(int))
+
+    labels = art.label_encoder.classes_
+    for i, label in enumerate(labels):
+        result[f"prob_{label}"] = probabilities[:, i]
+
+    result["predicted"] = labels[probabilities.argmax(axis=1)]
+
+    # confidence = მაქსიმალური ალბათობა
+    result["confidence"] = probabilities.max(axis=1)
+
+    # სწორია თუ არა
+    result["is_correct"] = (result["predicted"] == result["FTR"]).astype(int)
+
+    return result
+
+
+@lru_cache(maxsize=4)
+def _team_names(division: str | None, data_version: int) -> dict:
+    """პატარა ასოებით სახელი -> გუნდის სახელი ბაზის ჩაწერით."""
+    df = _prepared_matches(division, data_version)
+    if df.empty:
+        return {}
+    teams = pd.unique(df[["HomeTeam", "AwayTeam"]].to_numpy().ravel())
+    return {str(team).lower(): team for team in teams}
+
+
+@lru_cache(maxsize=4)
+def _prepared_matches(division: str | None, data_version: int) -> pd.DataFrame:
+    """მომზადებული მატჩები (ქეში ინვალიდდება data_version-ის ცვლილებით)."""
+    df = get_all_matches(division=division)
+    return prepare_matches(df) if not df.empty else df
+
+
+@lru_cache(maxsize=32)
+def _division_states(division: str, cutoff: pd.Timestamp | None, data_version: int,
+                     columns: tuple) -> tuple:
+    """ლიგის მდგომარეობები cutoff თარიღამდე (None -> მთელი ისტორია).
+
+    ქეშირებული ობიექტები ნაკადებს შორის იზიარება - მათზე მხოლოდ features()
+    (კითხვა) გამოიძახება, update() - არასდროს.
+    """
+    df = _prepared_matches(division, data_version)
+    if cutoff is not None:
+        df = df[df["Date"] < cutoff]
+    return build_feature_states(df, columns=list(columns))
+
+
+def _window_mask(df: pd.DataFrame, since: str = None, until: str = None,
+                 team: str = None) -> pd.Series:
+    """DB ფორმატის მატჩებზე ფანჯრის მასკა."""
+    mask = pd.Series(True, index=df.index)
+    dates = pd.to_datetime(df["date"])
+    if since:
+        mask &= dates >= pd.Timestamp(since)
+    if until:
+        mask &= dates <= pd.Timestamp(until)
+    if team:
+        team = team.strip().lower()
+        mask &= (df["home_team"].str.lower().str.contains(team, na=False, regex=False) |
+                 df["away_team"].str.lower().str.contains(team, na=False, regex=False))
+    return mask
+
+
+def _last_n(df: pd.DataFrame, mask: pd.Series, n: int) -> pd.Series:
+    """მასკის ბოლო n სტრიქონი თარიღით."""
+    dates = pd.to_datetime(df["date"])[mask]
+    keep = dates.sort_values(kind="stable").index[-n:]
+    return pd.Series(df.index.isin(keep), index=df.index)
@@ -0,0 +1,230 @@
+"""NumPy-only სკორინგის runtime ექსპორტირებული მოდელებისთვის.
+
+ინფერენსს sklearn/xgboost აღარ სჭირდება:
+- ლოგისტიკური რეგრესია: სკალერი "იკეცება" წონებში (W/scale, b - W·mean/scale),
+  რჩება ერთი მატრიცის გამრავლება და softmax;
+- XGBoost: ხეები ბრტყელ მასივებად (შვილები, ფიჩერი, ზღვარი, default_left)
+  და ყველა სტრიქონი x ყველა ხე ერთდროულად, სიღრმის მიხედვით იტერაციით.
+
+ექსპორტისას შედეგი მოწმდება ორიგინალ ესტიმატორთან; შეუსაბამობისას
+runtime არ იწერება და ჩატვირთვა მშობლიურ ფორმატზე რჩება.
+"""
+import json
+from pathlib import Path
+
+import numpy as np
+
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+RUNTIME_ATOL = 1e-6  # ექსპორტის ეკვივალენტობის ტოლერანტობა (ალბათობებზე)
+TREE_CHUNK_ROWS = 1024  # ხეების შეფასება ნაწილებად (სტრიქონი x ხე მასივები მეხსიერებაში)
+
+
+def _softmax(z: np.ndarray) -> np.ndarray:
+    z = z - z.max(axis=1, keepdims=True)
+    e = np.exp(z)
+    return e / e.sum(axis=1, keepdims=True)
+
+
+class LinearRuntime:
+    """სკალერით დაკეცილი წრფივი მოდელი: ნედლი ფიჩერები -> ალბათობები."""
+
+    kind = "linear"
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray):
+        self.weights = weights  # (კლასები, ფიჩერები)
+        self.bias = bias
+
+    @classmethod
+    def fold(cls, coef, intercept, mean=None, scale=None) -> "LinearRuntime":
+        coef = np.asarray(coef, dtype=np.float64)
+        intercept = np.asarray(intercept, dtype=np.float64)
+        if mean is not None:
+            coef = coef / np.asarray(scale, dtype=np.float64)
+            intercept = intercept - coef @ np.asarray(mean, dtype=np.float64)
+        return cls(coef, intercept)
+
+    def predict_proba(self, X) -> np.ndarray:
+        z = np.asarray(X, dtype=np.float64) @ self.weights.T + self.bias
+        if z.shape[1] == 1:
+            p = 1.0 / (1.0 + np.exp(-z))
+            return np.hstack([1 - p, p])
+        return _softmax(z)
+
+    def arrays(self) -> dict:
+        return {"weights": self.weights, "bias": self.bias}
+
+
+class TreeRuntime:
+    """XGBoost (gbtree, multi:softprob) ხეების ვექტორული შეფასება."""
+
+    kind = "trees"
+
+    def __init__(self, left, right, feature, threshold, default_left, roots,
+                 tree_class, base_margin, max_depth, mean=None, scale=None):
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold  # ფოთლებზე - ფოთლის მნიშვნელობა
+        self.default_left = default_left
+        self.roots = roots
+        self.tree_class = tree_class
+        self.base_margin = base_margin
+        self.max_depth = int(max_depth)
+        # ხეები სკალირებულ ფიჩერებზეა ნასწავლი - სკალირება აქვე (ზღვრები არ იკეცება,
+        # რომ float32 დამრგვალება XGBoost-ს დაემთხვეს)
+        self.mean = mean
+        self.scale = scale
+
+    @classmethod
+    def from_booster(cls, booster, mean=None, scale=None) -> "TreeRuntime":
+        model = json.loads(booster.save_raw("json"))["learner"]
+        params = model["learner_model_param"]
+        n_class = max(int(params.get("num_class", "0")), 1)
+        trees = model["gradient_booster"]["model"]["trees"]
+        if model["gradient_booster"]["name"] != "gbtree" or any(
+                any(t["split_type"]) for t in trees):
+            raise ValueError("მხარდაჭერილია მხოლოდ gbtree რიცხვითი გაყოფებით")
+
+        left, right, feature, threshold, default_left, roots = [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            lc = np.asarray(tree["left_children"], dtype=np.int64)
+            rc = np.asarray(tree["right_children"], dtype=np.int64)
+            leaf = lc < 0
+            roots.append(offset)
+            # ფოთოლი თავის თავზე მიუთითებს, რომ იტერაცია იქ "გაჩერდეს"
+            own = np.arange(len(lc)) + offset
+            left.append(np.where(leaf, own, lc + offset))
+            right.append(np.where(leaf, own, rc + offset))
+            feature.append(np.where(leaf, 0, tree["split_indices"]))
+            threshold.append(tree["split_conditions"])
+            default_left.append(tree["default_left"])
+            offset += len(lc)
+
+        base = np.array(json.loads(params["base_score"]) if params["base_score"].startswith("[")
+                        else [float(params["base_score"])] * n_class, dtype=np.float32)
+        return cls(
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float32),
+            default_left=np.concatenate(default_left).astype(bool),
+            roots=np.array(roots, dtype=np.int32),
+            tree_class=np.array(model["gradient_booster"]["model"]["tree_info"], dtype=np.int32),
+            base_margin=base,
+            max_depth=_max_depth(trees),
+            mean=None if mean is None else np.asarray(mean, dtype=np.float64),
+            scale=None if scale is None else np.asarray(scale, dtype=np.float64),
+        )
+
+    def margins(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.mean is not None:
+            X = (X - self.mean) / self.scale
+        X = np.ascontiguousarray(X, dtype=np.float32)
+
+        # ხე -> კლასი one-hot, ფოთლების ჯამი ერთი მატრიცის გამრავლებით
+        onehot = np.zeros((len(self.roots), len(self.base_margin)))
+        onehot[np.arange(len(self.roots)), self.tree_class] = 1.0
+
+        margin = np.empty((len(X), len(self.base_margin)))
+        for start in range(0, len(X), TREE_CHUNK_ROWS):
+            chunk = X[start:start + TREE_CHUNK_ROWS]
+            # სტრიქონის ფიჩერების ბრტყელი ინდექსი: row * n_features + feature
+            base = (np.arange(len(chunk), dtype=np.int64) * X.shape[1])[:, None]
+            flat = chunk.ravel()
+            node = np.repeat(self.roots[None, :], len(chunk), axis=0)
+            for _ in range(self.max_depth):
+                x = flat[base + self.feature[node]]
+                go_left = x < self.threshold[node]
+                missing = np.isnan(x)
+                if missing.any():
+                    go_left[missing] = self.default_left[node[missing]]
+                node = np.where(go_left, self.left[node], self.right[node])
+            margin[start:start + len(chunk)] = self.threshold[node] @ onehot
+        return margin + self.base_margin
+
+    def predict_proba(self, X) -> np.ndarray:
+        margin = self.margins(X)
+        if margin.shape[1] == 1:
+            p = 1.0 / (1.0 + np.exp(-margin))
+            return np.hstack([1 - p, p])
+        return _softmax(margin)
+
+    def arrays(self) -> dict:
+        arrays = {name: getattr(self, name) for name in
+                  ("left", "right", "feature", "threshold", "default_left",
+                   "roots", "tree_class", "base_margin")}
+        arrays["max_depth"] = np.array(self.max_depth)
+        if self.mean is not None:
+            arrays.update(mean=self.mean, scale=self.scale)
+        return arrays
+
+
+def _max_depth(trees: list) -> int:
+    depth = 0
+    for tree in trees:
+        parents = tree["parents"]
+        for node in range(len(parents)):
+            d = 0
+            while node != 0:
+                node = parents[node]
+                d += 1
+            depth = max(depth, d)
+    return depth
+
+
+def build_runtime(model, scaler=None):
+    """ესტიმატორიდან runtime (None - ტიპი მხარდაუჭერელია)."""
+    mean = None if scaler is None else scaler.mean_
+    scale = None if scaler is None else scaler.scale_
+    if hasattr(model, "get_booster"):
+        return TreeRuntime.from_booster(model.get_booster(), mean, scale)
+    if hasattr(model, "coef_") and hasattr(model, "intercept_"):
+        return LinearRuntime.fold(model.coef_, model.intercept_, mean, scale)
+    return None
+
+
+def export_runtime(model, scaler, path: Path, sample=None) -> str | None:
+    """runtime მასივების ჩაწერა path-ში; აბრუნებს ტიპს ან None-ს.
+
+    sample: ნედლი ფიჩერები ეკვივალენტობის შესამოწმებლად (ორიგინალი
+    ესტიმატორი სკალერით vs runtime).
+    """
+    try:
+        runtime = build_runtime(model, scaler)
+    except ValueError as e:
+        log.warning(f"runtime ექსპორტი გამოტოვებულია: {e}")
+        return None
+    if runtime is None:
+        return None
+
+    if sample is not None and len(sample):
+        X = np.asarray(sample, dtype=np.float64)
+        expected = model.predict_proba(X if scaler is None else scaler.transform(X))
+        diff = float(np.abs(runtime.predict_proba(X) - expected).max())
+        if diff > RUNTIME_ATOL:
+            log.warning(f"runtime არ ემთხვევა ესტიმატორს (max diff {diff:.2e}) - გამოტოვებულია")
+            return None
+        log.info(f"runtime ეკვივალენტურია ({len(X)} სტრიქონი, max diff {diff:.1e})")
+
+    runtime_dir = Path(path) / "runtime"
+    runtime_dir.mkdir()
+    for name, array in runtime.arrays().items():
+        np.save(runtime_dir / f"{name}.npy", array)
+    return runtime.kind
+
+
+def load_runtime(kind: str, path: Path):
+    """ექსპორტირებული runtime-ის ჩატვირთვა (mmap)."""
+    runtime_dir = Path(path) / "runtime"
+    arrays = {p.stem: np.load(p, mmap_mode="r") for p in runtime_dir.glob("*.npy")}
+    if kind == "linear":
+        return LinearRuntime(arrays["weights"], arrays["bias"])
+    if kind == "trees":
+        arrays["max_depth"] = int(arrays["max_depth"])
+        return TreeRuntime(**arrays)
+    raise ValueError(f"უცნობი runtime: {kind}")
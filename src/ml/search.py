@@ -0,0 +1,131 @@
+"""XGBoost-ის ჰიპერპარამეტრების ბიუჯეტიანი ძებნა (successive halving).
+
+ამოწმებს ბევრ შემთხვევით კონფიგურაციას მცირე რესურსით (ხეების რაოდენობა),
+ყოველ საფეხურზე ტოვებს საუკეთესო 1/eta-ს და რესურსს eta-ჯერ ზრდის.
+ყოველი ფოლდი early stopping-ით წყდება, მთლიანი ძებნა კი - დროის
+ბიუჯეტით. ფოლდების QuantileDMatrix-ები ერთხელ იგება და ყველა ცდა მათ
+იყენებს. შედეგი: საუკეთესო პარამეტრები + ყველა ცდის ჩანაწერი.
+"""
+import time
+
+import numpy as np
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import TimeSeriesSplit
+
+from src.config import (
+    SEARCH_BUDGET_SEC, SEARCH_CANDIDATES, SEARCH_ETA, SEARCH_MIN_ROUNDS,
+    SEARCH_MAX_ROUNDS,
+)
+from src.ml.boosting import quantile_matrix, fit_booster
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+# სიები - დისკრეტული არჩევანი, (low, high) - უწყვეტი (log - ლოგარითმულ სკალაზე)
+SEARCH_SPACE = {
+    "max_depth": [2, 3, 4, 5, 6, 7],
+    "learning_rate": ("log", 0.01, 0.3),
+    "subsample": (0.6, 1.0),
+    "colsample_bytree": (0.5, 1.0),
+    "min_child_weight": ("log", 1.0, 20.0),
+    "reg_lambda": ("log", 0.1, 20.0),
+    "gamma": (0.0, 2.0),
+}
+
+
+def sample_params(space: dict, rng: np.random.Generator) -> dict:
+    """ერთი შემთხვევითი კონფიგურაცია სივრციდან."""
+    params = {}
+    for name, spec in space.items():
+        if isinstance(spec, list):
+            params[name] = spec[rng.integers(len(spec))]
+        elif spec[0] == "log":
+            params[name] = float(np.exp(rng.uniform(np.log(spec[1]), np.log(spec[2]))))
+        else:
+            params[name] = float(rng.uniform(spec[0], spec[1]))
+    return {k: (v.item() if isinstance(v, np.generic) else v) for k, v in params.items()}
+
+
+def fold_matrices(X, y, n_splits: int = 3) -> list:
+    """დროითი ფოლდები: (dtrain, dvalid, y_valid) - ერთხელ, ყველა ცდისთვის."""
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    folds = []
+    for train_idx, val_idx in TimeSeriesSplit(n_splits=n_splits).split(X):
+        dtrain = quantile_matrix(X[train_idx], y[train_idx])
+        folds.append((dtrain, quantile_matrix(X[val_idx], y[val_idx], ref=dtrain), y[val_idx]))
+    return folds
+
+
+def evaluate(params: dict, folds: list, rounds: int) -> dict:
+    """კონფიგურაციის შეფასება დროით ფოლდებზე early stopping-ით."""
+    start = time.perf_counter()
+    losses, accuracies, iterations = [], [], []
+    for dtrain, dvalid, y_valid in folds:
+        booster = fit_booster(dtrain, dvalid, params, rounds)
+        proba = booster.predict(dvalid)
+        losses.append(log_loss(y_valid, proba, labels=[0, 1, 2]))
+        accuracies.append(accuracy_score(y_valid, proba.argmax(axis=1)))
+        iterations.append(booster.num_boosted_rounds())
+    return {
+        "log_loss": float(np.mean(losses)),
+        "accuracy": float(np.mean(accuracies)),
+        "n_estimators": int(np.mean(iterations)),
+        "fit_sec": time.perf_counter() - start,
+    }
+
+
+def successive_halving(X, y, space: dict = None, n_candidates: int = SEARCH_CANDIDATES,
+                       eta: int = SEARCH_ETA, min_rounds: int = SEARCH_MIN_ROUNDS,
+                       max_rounds: int = SEARCH_MAX_ROUNDS,
+                       budget_sec: float = SEARCH_BUDGET_SEC, n_splits: int = 3,
+                       seed: int = 42, folds: list = None, callback=None) -> tuple:
+    """ძებნა; აბრუნებს (საუკეთესო პარამეტრები n_estimators-ით, ცდების სია).
+
+    რანჟირება - ვალიდაციის log-loss (ალბათობები გვჭირდება, არა მხოლოდ ლეიბლები).
+    folds: მზა (dtrain, dvalid, y_valid) ფოლდები (მაგ. shard_folds) - მაშინ X, y არ გამოიყენება.
+    callback(შესრულებული, სავარაუდო სულ): ყოველი ცდის შემდეგ (პროგრესისთვის).
+    """
+    rng = np.random.default_rng(seed)
+    if folds is None:
+        folds = fold_matrices(X, y, n_splits)
+    candidates = [sample_params(space or SEARCH_SPACE, rng) for _ in range(n_candidates)]
+
+    # ცდების მაქსიმალური რაოდენობა ყველა საფეხურზე (მაგ. 27 + 9 + 3 + 1)
+    total, remaining, rounds_ = 0, n_candidates, min_rounds
+    while remaining >= 1:
+        total += remaining
+        if remaining == 1 or rounds_ >= max_rounds:
+            break
+        remaining, rounds_ = max(1, remaining // eta), rounds_ * eta
+
+    deadline = time.monotonic() + budget_sec
+    trials = []
+    best = None
+    rung, rounds = 0, min_rounds
+    while candidates:
+        results = []
+        for params in candidates:
+            if time.monotonic() > deadline and best is not None:
+                break
+            result = evaluate(params, folds, rounds)
+            trials.append({"rung": rung, "rounds": rounds, "params": params, **result})
+            results.append((result["log_loss"], params, result))
+            if callback is not None:
+                callback(len(trials), total)
+
+        if not results:
+            break
+        results.sort(key=lambda r: r[0])
+        best = {**results[0][1], "n_estimators": results[0][2]["n_estimators"]}
+        log.info(f"საფეხური {rung}: {len(results)} კანდიდატი, {rounds} ხე, "
+                 f"საუკეთესო log-loss {results[0][0]:.4f}")
+
+        if len(results) == 1 or rounds >= max_rounds or time.monotonic() > deadline:
+            break
+        candidates = [params for _, params, _ in results[:max(1, len(results) // eta)]]
+        rung += 1
+        rounds = min(rounds * eta, max_rounds)
+
+    log.info(f"ძებნა დასრულდა: {len(trials)} ცდა, საუკეთესო {best}")
+    return best, trials
@@ -0,0 +1,138 @@
+"""პროცესის დონის საერთო პროგნოზების სერვისი ქეშით.
+
+ბოტი და Streamlit-ის ყველა სესია ერთ PredictionService-ს იყენებს:
+მოდელი ერთხელ იტვირთება, შეფასებული ცხრილი კი ქეშდება და
+ხელახლა ითვლება მხოლოდ მაშინ, როცა იცვლება ბაზის მონაცემები
+(data_version) ან გამოქვეყნებული მოდელის ვერსია.
+"""
+import threading
+
+import pandas as pd
+
+from src.data.db_manager import get_data_version, get_precomputed_predictions
+from src.ml.precompute import is_fresh
+from src.ml.predictor import Predictor
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+MAX_CACHED_QUERIES = 64
+WARM_UP_ROWS = 10  # მთავარი პანელის ბოლო პროგნოზები
+
+
+class PredictionService:
+    """Predictor-ის thread-safe ქეშირებული გარსი."""
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._predictor = None
+        self._cache = {}  # query -> (cache key, scored DataFrame)
+        self._inflight = {}  # (query, cache key) -> threading.Event (მიმდინარე დათვლა)
+
+    def predictor(self) -> Predictor:
+        """მიმდინარე მოდელის Predictor (ახალი ვერსიისას hot-reload)."""
+        with self._lock:
+            if self._predictor is None:
+                self._predictor = Predictor()
+            elif self._predictor.refresh():
+                self._cache.clear()
+            return self._predictor
+
+    def is_ready(self) -> bool:
+        return self.predictor().is_ready()
+
+    def predict_matches(self, division: str = None) -> pd.DataFrame:
+        """ლიგის ყველა შეფასებული მატჩი ქეშიდან."""
+        return self._cached((division,), lambda p: p.predict_matches(division=division))
+
+    def get_latest_predictions(self, n: int = 20, division: str = None, since: str = None,
+                               until: str = None, team: str = None) -> pd.DataFrame:
+        """ბოლო N პროგნოზი - მხოლოდ მოთხოვნილი ფანჯარა ითვლება.
+
+        თუ run_scheduler.py-ს წინასწარი დათვლა აქტუალურია, სტრიქონები
+        predictions ცხრილიდან იკითხება ML ინფერენსის გარეშე.
+        """
+        query = ("latest", n, division, since, until, team)
+
+        def compute(predictor):
+            if is_fresh(predictor.version):
+                return get_precomputed_predictions(
+                    predictor.version, n=n, division=division,
+                    since=since, until=until, team=team)
+            return predictor.get_latest_predictions(
+                n=n, division=division, since=since, until=until, team=team)
+
+        return self._cached(query, compute)
+
+    def _cached(self, query: tuple, compute) -> pd.DataFrame:
+        """query-ს შედეგი ქეშიდან (საჭიროების შემთხვევაში ხელახლა ითვლება).
+
+        დათვლა ლოკის გარეთ ხდება: სხვა მოთხოვნები არ ბლოკდება, იგივე
+        query-ს პარალელური მოთხოვნები კი პირველის შედეგს ელოდებიან.
+        """
+        while True:
+            predictor = self.predictor()
+            key = (get_data_version(), predictor.version)
+            with self._lock:
+                cached = self._cache.get(query)
+                if cached is not None and cached[0] == key:
+                    return cached[1].copy()
+                pending = self._inflight.get((query, key))
+                if pending is None:
+                    pending = self._inflight[(query, key)] = threading.Event()
+                    break
+            pending.wait()  # სხვა ნაკადი ითვლის - შემდეგ ქეშიდან
+
+        try:
+            log.info(f"პროგნოზების ქეშის განახლება: {query}")
+            result = compute(predictor)
+            with self._lock:
+                self._cache.pop(query, None)
+                if len(self._cache) >= MAX_CACHED_QUERIES:
+                    self._cache.pop(next(iter(self._cache)))
+                self._cache[query] = (key, result)
+        finally:
+            with self._lock:
+                del self._inflight[(query, key)]
+            pending.set()
+        return result.copy()
+
+    def predict_single(self, home_team: str, away_team: str, division: str = None,
+                       date: str = None, odds: tuple = None) -> dict | None:
+        """ერთი მატჩის პროგნოზი point-query-ით (სრული ცხრილის გარეშე)."""
+        return self.predictor().predict_single(home_team, away_team, division=division,
+                                               date=date, odds=odds)
+
+    def warm_up(self, divisions: tuple = (None,)):
+        """მოდელის ჩატვირთვა და ქეშის წინასწარ შევსება."""
+        if not self.is_ready():
+            return
+        for division in divisions:
+            self.get_latest_predictions(n=WARM_UP_ROWS, division=division)
+        log.info("პროგნოზების სერვისი გამზადებულია")
+
+    def warm_up_async(self, divisions: tuple = (None,)) -> threading.Thread:
+        """warm_up ფონურ ნაკადში (პროცესის გაშვება არ ბლოკდება)."""
+        thread = threading.Thread(target=self._safe_warm_up, args=(divisions,),
+                                  name="prediction-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def _safe_warm_up(self, divisions: tuple):
+        try:
+            self.warm_up(divisions)
+        except Exception as e:
+            log.error(f"სერვისის გამზადების შეცდომა: {e}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_prediction_service() -> PredictionService:
+    """პროცესის ერთადერთი PredictionService."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = PredictionService()
+        return _service
@@ -0,0 +1,178 @@
+"""ფიჩერების მატრიცა დისკზე: float32 შარდები (თითო დივიზიონი), mmap-ით.
+
+out-of-core გაწვრთნისთვის (MatchPredictor.train_out_of_core): ფიჩერები
+ლიგა-ლიგა ითვლება და მაშინვე იწერება - მეხსიერებაში ერთდროულად მხოლოდ
+ერთი ლიგის ცხრილია. სწავლება შარდებს ბატჩებად კითხულობს: XGBoost -
+DataIter-ით (QuantileDMatrix ინახავს მხოლოდ ბინებს, ExtMemQuantileDMatrix
+კი მათაც დისკზე), მედიანები - სვეტების ბლოკებით.
+
+    TRAIN_SHARD_DIR/v<data_version>/<დივიზიონი>/{X,y,days}.npy + meta.json
+"""
+import json
+import os
+import shutil
+import warnings
+from pathlib import Path
+
+import numpy as np
+import xgboost as xgb
+
+from src.config import TRAIN_SHARD_DIR, TRAIN_EXTERNAL_MEMORY, XGB_MAX_BIN, XGB_NTHREAD
+from src.data.db_manager import get_all_matches, get_data_version, get_divisions
+from src.data.feature_engineer import create_features, get_feature_columns
+from src.utils.logger import get_logger
+
+log = get_logger(__name__)
+
+CLASSES = ["A", "D", "H"]  # LabelEncoder-ის რიგი (trainer.py)
+MEDIAN_COLUMN_BLOCK = 16  # მედიანებისთვის ერთდროულად წაკითხული სვეტები
+
+
+def build_feature_shards(force: bool = False) -> Path:
+    """ფიჩერების შარდები (ქეში data_version-ის მიხედვით)."""
+    shard_dir = TRAIN_SHARD_DIR / f"v{get_data_version()}"
+    if (shard_dir / "meta.json").exists() and not force:
+        return shard_dir
+
+    tmp_dir = shard_dir.with_name(f".tmp-{shard_dir.name}-{os.getpid()}")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    columns, shards = None, []
+    for division in get_divisions():
+        featured = create_features(get_all_matches(division=division), compact=True)
+        featured = featured[featured["FTR"].isin(CLASSES)]
+        if featured.empty:
+            continue
+        featured = featured.sort_values("Date", kind="stable")
+        columns = columns or get_feature_columns(featured)
+
+        out = tmp_dir / division
+        out.mkdir()
+        np.save(out / "X.npy", featured.reindex(columns=columns).to_numpy(dtype=np.float32))
+        np.save(out / "y.npy", featured["FTR"].astype(str)
+                .map({c: i for i, c in enumerate(CLASSES)}).to_numpy(np.int8))
+        np.save(out / "days.npy", featured["Date"].to_numpy("datetime64[D]").astype(np.int64))
+        shards.append({"name": division, "rows": len(featured)})
+        del featured
+
+    with open(tmp_dir / "meta.json", "w", encoding="utf-8") as f:
+        json.dump({"feature_columns": columns or [], "shards": shards}, f, ensure_ascii=False)
+    shutil.rmtree(shard_dir, ignore_errors=True)
+    os.replace(tmp_dir, shard_dir)
+    log.info(f"შარდები: {shard_dir} ({len(shards)} შარდი, "
+             f"{sum(s['rows'] for s in shards)} მატჩი)")
+    return shard_dir
+
+
+class FeatureShards:
+    """შარდების წამკითხველი; დღეების შუალედი - lo < day <= hi (None - საზღვრის გარეშე)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path / "meta.json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        self.feature_columns = meta["feature_columns"]
+        self.names = [s["name"] for s in meta["shards"]]
+
+    def _array(self, name: str, array: str) -> np.ndarray:
+        return np.load(self.path / name / f"{array}.npy", mmap_mode="r")
+
+    def _span(self, name: str, lo, hi) -> tuple:
+        """შარდის შიგნით დღეები დალაგებულია - შუალედი უწყვეტი ნაჭერია."""
+        days = self._array(name, "days")
+        start = int(np.searchsorted(days, lo, side="right")) if lo is not None else 0
+        end = int(np.searchsorted(days, hi, side="right")) if hi is not None else len(days)
+        return start, end
+
+    def days(self) -> np.ndarray:
+        return np.concatenate([np.asarray(self._array(name, "days")) for name in self.names])
+
+    def labels(self, lo=None, hi=None) -> np.ndarray:
+        parts = []
+        for name in self.names:
+            start, end = self._span(name, lo, hi)
+            parts.append(np.asarray(self._array(name, "y")[start:end]))
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int8)
+
+    def batches(self, lo=None, hi=None, fill: np.ndarray = None):
+        """(X float32, y) თითო შარდიდან; fill - NaN-ების შევსება."""
+        fill = None if fill is None else np.asarray(fill, dtype=np.float32)
+        for name in self.names:
+            start, end = self._span(name, lo, hi)
+            if end <= start:
+                continue
+            X = np.array(self._array(name, "X")[start:end], dtype=np.float32)
+            if fill is not None:
+                np.copyto(X, np.broadcast_to(fill, X.shape), where=np.isnan(X))
+            yield X, np.asarray(self._array(name, "y")[start:end])
+
+    def tail(self, hi, n: int, fill: np.ndarray = None) -> tuple:
+        """ბოლო n სტრიქონი (თარიღით) hi-მდე - შეზღუდული ზომის in-memory ნაწილი."""
+        days = np.sort(self.days())
+        days = days[days <= hi] if hi is not None else days
+        lo = days[-n - 1] if len(days) > n else None
+        parts = list(self.batches(lo, hi, fill))
+        return (np.concatenate([X for X, _ in parts]), np.concatenate([y for _, y in parts]))
+
+    def medians(self, hi=None) -> np.ndarray:
+        """სვეტების მედიანები (NaN-ების გარეშე; ცარიელი სვეტი -> 0), სვეტების ბლოკებით."""
+        spans = [(name, *self._span(name, None, hi)) for name in self.names]
+        medians = np.zeros(len(self.feature_columns))
+        for j in range(0, len(self.feature_columns), MEDIAN_COLUMN_BLOCK):
+            block = np.concatenate([np.asarray(self._array(name, "X")[s:e, j:j + MEDIAN_COLUMN_BLOCK],
+                                               dtype=np.float64)
+                                    for name, s, e in spans])
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                medians[j:j + MEDIAN_COLUMN_BLOCK] = np.nanmedian(block, axis=0)
+        return np.nan_to_num(medians)
+
+
+class ShardIterator(xgb.DataIter):
+    """XGBoost-ის DataIter შარდებზე - მატრიცა ბატჩებად იკრიბება."""
+
+    def __init__(self, store: FeatureShards, lo=None, hi=None, fill=None,
+                 cache_prefix: str = None):
+        self._store, self._lo, self._hi, self._fill = store, lo, hi, fill
+        self._batches = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data) -> bool:
+        if self._batches is None:
+            self._batches = self._store.batches(self._lo, self._hi, self._fill)
+        batch = next(self._batches, None)
+        if batch is None:
+            return False
+        input_data(data=batch[0], label=batch[1])
+        return True
+
+    def reset(self):
+        self._batches = None
+
+
+def shard_matrix(store: FeatureShards, lo=None, hi=None, fill=None, ref=None):
+    """QuantileDMatrix შარდებიდან (TRAIN_EXTERNAL_MEMORY - ბინებიც დისკზე)."""
+    if TRAIN_EXTERNAL_MEMORY:
+        cache = store.path / "xgb-cache"
+        cache.mkdir(exist_ok=True)
+        iterator = ShardIterator(store, lo, hi, fill, cache_prefix=str(cache / "cache"))
+        return xgb.ExtMemQuantileDMatrix(iterator, max_bin=XGB_MAX_BIN, ref=ref,
+                                         nthread=XGB_NTHREAD)
+    return xgb.QuantileDMatrix(ShardIterator(store, lo, hi, fill), max_bin=XGB_MAX_BIN,
+                               ref=ref, nthread=XGB_NTHREAD)
+
+
+def shard_folds(store: FeatureShards, hi, fill, n_splits: int = 3) -> list:
+    """TimeSeriesSplit-ის ეკვივალენტი დღეების საზღვრებით: (dtrain, dvalid, y_valid)."""
+    days = np.sort(store.days())
+    days = days[days <= hi]
+    fold_size = len(days) // (n_splits + 1)
+    folds = []
+    for k in range(n_splits):
+        train_end = len(days) - (n_splits - k) * fold_size
+        cut, valid_cut = days[train_end - 1], days[train_end + fold_size - 1]
+        dtrain = shard_matrix(store, None, cut, fill)
+        folds.append((dtrain, shard_matrix(store, cut, valid_cut, fill, ref=dtrain),
+                      store.labels(cut, valid_cut)))
+    return folds
@@ -1,19 +1,37 @@
 """ML მოდელის გაწვრთნა."""
 import json
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import numpy as np
 import pandas as pd
 from datetime import datetime
-from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.metrics import accuracy_score, log_loss, confusion_matrix, classification_report
-from xgboost import XGBClassifier
-import joblib
 
-from src.config import MODEL_PATH, MODEL_METADATA_PATH, MODELS_DIR
-from src.data.db_manager import get_all_matches, insert_model_run
+from src.data.db_manager import get_all_matches, insert_model_run, insert_model_runs
 from src.data.feature_engineer import create_features, get_feature_columns
+from src.data.feature_registry import resolve_groups
+from src.config import (
+    INCREMENTAL_MAX_ROUNDS, INCREMENTAL_MAX_NEW_FRACTION, INCREMENTAL_REFERENCE_DAYS,
+    INCREMENTAL_HOLDOUT_FRACTION,
+    DIVISION_WORKERS, DIVISION_MIN_TRAIN_ROWS, DIVISION_VALID_FRACTION, DIVISION_MIN_VALID_ROWS,
+    TRAIN_LR_MAX_ROWS, XGB_VALID_FRACTION,
+    SEARCH_MAX_ROUNDS,
+)
+from src.ml.artifacts import (
+    publish_model, publish_family, load_model, ModelArtifact, ModelFamily, BoosterClassifier,
+    GLOBAL_MEMBER,
+)
+from src.ml.boosting import train_booster, continue_booster, fit_booster
+from src.ml.drift import detect_drift
+from src.ml.importance import permutation_importance, top_features, scoring_latency_ms
+from src.ml.search import successive_halving
+from src.utils.concurrency import plan, budgeted, set_process_threads
 from src.utils.logger import get_logger
+from src.utils.profiling import MemoryStages
 
 log = get_logger(__name__)
 
@@ -24,10 +42,19 @@ class MatchPredictor:
         self.scaler = StandardScaler()
         self.label_encoder = LabelEncoder()
         self.feature_columns = []
+        self.impute_values = None
         self.metadata = {}
+        # progress(ეტაპი, წილი 0..1, შეტყობინება) - ფონური job-ები (src/ml/jobs.py);
+        # exception-ით გაწვრთნა წყდება (გაუქმება)
+        self.progress = None
 
     def prepare_data(self, df: pd.DataFrame) -> tuple:
-        """მონაცემების მომზადება ML-ისთვის."""
+        """მონაცემების მომზადება ML-ისთვის.
+
+        სტრიქონები ბრუნდება თარიღით დალაგებული: create_features ლიგა-ლიგა
+        ითვლის, ამიტომ მისი რიგით დროითი გაყოფა ბოლო ლიგებს გადადებდა და
+        არა ბოლო თარიღებს (ბოლო ნაწილი - ყოველთვის ბოლო მატჩები).
+        """
         log.info("მონაცემების მომზადება...")
 
         # ფიჩერების შექმნა
@@ -37,30 +64,61 @@ class MatchPredictor:
             log.error("ფიჩერების შექმნა ვერ მოხერხდა")
             return None, None, None
 
+        featured_df = featured_df.sort_values("Date", kind="stable").reset_index(drop=True)
+
         # ფიჩერების სვეტები
         self.feature_columns = get_feature_columns(featured_df)
         log.info(f"ფიჩერების რაოდენობა: {len(self.feature_columns)}")
 
         # X და y
+        # NaN-ები რჩება - მედიანები train ნაწილზე ითვლება (fit_imputer)
         X = featured_df[self.feature_columns].copy()
         y = featured_df["FTR"].copy()
 
-        # NaN-ების შევსება მედიანით
-        X = X.fillna(X.median())
-
         # ლეიბელ ენკოდინგი: H=0, D=1, A=2
         self.label_encoder.fit(["A", "D", "H"])
         y_encoded = self.label_encoder.transform(y)
 
         return X, y_encoded, featured_df
 
-    def train(self, test_ratio: float = 0.2) -> dict:
-        """მოდელის გაწვრთნა."""
+    def _report(self, stage: str, fraction: float, message: str = ""):
+        """პროგრესის შეტყობინება: features, search, fit, save."""
+        if self.progress is not None:
+            self.progress(stage, fraction, message)
+
+    def _search_callback(self, start: float, end: float):
+        return lambda done, total: self._report(
+            "search", start + (end - start) * min(done / total, 1.0), f"ცდა {done}/{total}")
+
+    def fit_imputer(self, X: pd.DataFrame) -> pd.DataFrame:
+        """მედიანების დათვლა (მხოლოდ სწავლების ნაწილზე) და შევსება."""
+        # მთლიანად ცარიელი სვეტის მედიანა NaN-ია -> 0
+        self.impute_values = X.median().fillna(0.0).to_numpy(dtype=np.float64)
+        return self.apply_imputer(X)
+
+    def apply_imputer(self, X: pd.DataFrame) -> pd.DataFrame:
+        """NaN-ების შევსება შენახული მედიანებით."""
+        return X.fillna(pd.Series(self.impute_values, index=self.feature_columns))
+
+    @budgeted("train")
+    def train(self, test_ratio: float = 0.2, shadow: bool = False,
+              per_division: bool = False, workers: int = DIVISION_WORKERS,
+              prune_top_k: int = None) -> dict:
+        """მოდელის გაწვრთნა.
+
+        shadow: ახალი ვერსია shadow-ად ემატება (ჩემპიონი არ იცვლება).
+        per_division: გლობალურის გარდა თითო ლიგის მოდელი (workers პროცესში) -
+        ინახება ოჯახად, ლიგა საკუთარს მხოლოდ მაშინ იღებს, თუ ის გლობალურზე
+        უკეთესია (train-ის ბოლო DIVISION_VALID_FRACTION-ზე; test მხოლოდ ფასდება).
+        prune_top_k: დამატებით - გადაწვრთნა permutation importance-ის ტოპ-K
+        ფიჩერზე, shadow-ად (შედარება: სიზუსტე / სკორინგის და ფიჩერების დრო).
+        """
         log.info("=" * 50)
         log.info("მოდელის გაწვრთნა იწყება")
         log.info("=" * 50)
 
         # მონაცემების ჩატვირთვა
+        self._report("features", 0.0, "მონაცემები და ფიჩერები")
         df = get_all_matches()
         if df.empty:
             log.error("ბაზაში მატჩები არ მოიძებნა")
@@ -77,51 +135,45 @@ class MatchPredictor:
         X_train, X_test = X.iloc[:split_idx], X.iloc[split_idx:]
         y_train, y_test = y[:split_idx], y[split_idx:]
 
-        log.info(f"Train: {len(X_train)}, Test: {len(X_test)}")
+        # NaN-ების შევსება train-ის მედიანებით (ინახება მოდელთან, ინფერენსიც მათ იყენებს)
+        X_train = self.fit_imputer(X_train)
+        X_test = self.apply_imputer(X_test)
 
-        # სკალირება
-        X_train_scaled = self.scaler.fit_transform(X_train)
-        X_test_scaled = self.scaler.transform(X_test)
+        log.info(f"Train: {len(X_train)}, Test: {len(X_test)} (test - "
+                 f"{featured_df['Date'].iloc[split_idx]:%Y-%m-%d}-დან)")
+        # ინკრემენტული გადაწვრთნა ამ თარიღის შემდეგ მატჩებს დაამატებს
+        trained_through = featured_df["Date"].iloc[:split_idx].max().strftime("%Y-%m-%d")
 
         # === XGBoost ===
-        log.info("XGBoost-ის გაწვრთნა...")
-        xgb_params = {
-            "n_estimators": [100, 200],
-            "max_depth": [3, 5, 7],
-            "learning_rate": [0.05, 0.1],
-            "subsample": [0.8],
-            "colsample_bytree": [0.8],
-        }
-
-        xgb = XGBClassifier(
-            objective="multi:softprob",
-            num_class=3,
-            eval_metric="mlogloss",
-            random_state=42,
-        )
-
-        tscv = TimeSeriesSplit(n_splits=3)
-        grid_search = GridSearchCV(
-            xgb, xgb_params,
-            cv=tscv,
-            scoring="accuracy",
-            n_jobs=-1,
-            verbose=0,
-        )
-        grid_search.fit(X_train_scaled, y_train)
-
-        best_xgb = grid_search.best_estimator_
-        xgb_pred = best_xgb.predict(X_test_scaled)
-        xgb_proba = best_xgb.predict_proba(X_test_scaled)
+        # მშობლიური booster ნედლ ფიჩერებზე (ხეებს სკალირება არ სჭირდება):
+        # ბიუჯეტიანი ძებნა, შემდეგ საბოლოო მოდელი early stopping-ით
+        log.info("XGBoost-ის ჰიპერპარამეტრების ძებნა...")
+        X_train_raw = X_train.to_numpy(dtype=np.float32)
+        X_test_raw = X_test.to_numpy(dtype=np.float32)
+        self._report("search", 0.1, "ჰიპერპარამეტრების ძებნა")
+        search_start = time.perf_counter()
+        best_params, trials = successive_halving(X_train_raw, y_train,
+                                                 callback=self._search_callback(0.1, 0.8))
+        search_sec = time.perf_counter() - search_start
+        self._record_trials(trials, len(X_train))
+
+        self._report("fit", 0.8, "საბოლოო მოდელები")
+        best_xgb, xgb_stats = train_booster(X_train_raw, y_train, best_params)
+        xgb_proba = best_xgb.predict_proba(X_test_raw)
+        xgb_pred = xgb_proba.argmax(axis=1)
 
         xgb_accuracy = accuracy_score(y_test, xgb_pred)
         xgb_logloss = log_loss(y_test, xgb_proba)
 
         log.info(f"XGBoost - Accuracy: {xgb_accuracy:.4f}, Log Loss: {xgb_logloss:.4f}")
-        log.info(f"საუკეთესო პარამეტრები: {grid_search.best_params_}")
+        log.info(f"საუკეთესო პარამეტრები: {best_params} "
+                 f"({len(trials)} ცდა, ძებნა {search_sec:.1f}s)")
 
         # === Logistic Regression (baseline) ===
         log.info("Logistic Regression (baseline)...")
+        self.scaler = StandardScaler()
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
         lr = LogisticRegression(max_iter=1000, random_state=42)
         lr.fit(X_train_scaled, y_train)
         lr_pred = lr.predict(X_test_scaled)
@@ -139,6 +191,8 @@ class MatchPredictor:
             best_logloss = xgb_logloss
             model_type = "XGBoost"
             best_pred = xgb_pred
+            best_proba = xgb_proba
+            self.scaler = None  # ხეები ნედლ ფიჩერებზეა ნასწავლი
             log.info("არჩეულია: XGBoost")
         else:
             self.model = lr
@@ -146,8 +200,37 @@ class MatchPredictor:
             best_logloss = lr_logloss
             model_type = "LogisticRegression"
             best_pred = lr_pred
+            best_proba = lr_proba
             log.info("არჩეულია: Logistic Regression")
 
+        # === permutation importance (არჩეული მოდელი, დროით ბოლო ნაწილი) ===
+        self._report("fit", 0.82, "ფიჩერების მნიშვნელობა (permutation)")
+        importance = permutation_importance(self.model, X_test.to_numpy(dtype=np.float64),
+                                            y_test, self.feature_columns, scaler=self.scaler)
+
+        # === ლიგების მოდელები (გლობალური - fallback) ===
+        members, divisions = None, {}
+        if per_division:
+            self._report("fit", 0.85, "ლიგების მოდელები")
+            valid_idx = int(split_idx * (1 - DIVISION_VALID_FRACTION))
+            global_valid_proba = self._validation_proba(
+                model_type, X_train, y_train, valid_idx, best_params)
+            members, divisions, best_proba = self._fit_divisions(
+                featured_df, X, y, split_idx, valid_idx, best_params, best_proba,
+                global_valid_proba, workers)
+            members[GLOBAL_MEMBER] = {
+                "model": self.model, "scaler": self.scaler, "impute_values": self.impute_values,
+                "sample": X_test, "metadata": {"model_type": model_type,
+                                               "accuracy": best_accuracy,
+                                               "log_loss": best_logloss},
+            }
+            best_pred = best_proba.argmax(axis=1)
+            best_accuracy = accuracy_score(y_test, best_pred)
+            best_logloss = log_loss(y_test, best_proba)
+            log.info(f"ლიგების ოჯახი ({len(members) - 1} ლიგის მოდელი + გლობალური) - "
+                     f"Accuracy: {best_accuracy:.4f}, Log Loss: {best_logloss:.4f}")
+            model_type = "DivisionFamily"
+
         # Confusion Matrix
         cm = confusion_matrix(y_test, best_pred)
         report = classification_report(
@@ -159,21 +242,21 @@ class MatchPredictor:
         log.info(f"\nConfusion Matrix:\n{cm}")
         log.info(f"\nClassification Report:\n{classification_report(y_test, best_pred, target_names=self.label_encoder.classes_)}")
 
-        # Feature Importance
-        feature_importance = {}
-        if hasattr(self.model, "feature_importances_"):
-            importances = self.model.feature_importances_
-            for feat, imp in sorted(
-                zip(self.feature_columns, importances),
-                key=lambda x: x[1], reverse=True
-            ):
-                feature_importance[feat] = float(imp)
+        # Feature Importance (მოდელის საკუთარი, თუ არ აქვს - permutation)
+        feature_importance = self._feature_importance() or {
+            feat: info["log_loss_increase"] for feat, info in importance["features"].items()}
 
         # მოდელის შენახვა
+        self._report("save", 0.95, "შენახვა და გამოქვეყნება")
         self._save_model(model_type, best_accuracy, best_logloss,
                          len(X_train), len(X_test), feature_importance,
-                         grid_search.best_params_ if model_type == "XGBoost" else {},
-                         cm.tolist(), report)
+                         best_params if model_type != "LogisticRegression" else {},
+                         cm.tolist(), report, sample=X_test, shadow=shadow,
+                         training=xgb_stats if model_type == "XGBoost" else {},
+                         extra={"trained_through": trained_through,
+                                "permutation_importance": importance,
+                                **({"divisions": divisions} if per_division else {})},
+                         members=members)
 
         # DB-ში ჩაწერა
         insert_model_run({
@@ -183,8 +266,14 @@ class MatchPredictor:
             "train_size": len(X_train),
             "test_size": len(X_test),
             "features_used": json.dumps(self.feature_columns),
-            "parameters": json.dumps(grid_search.best_params_ if model_type == "XGBoost" else {}),
-            "notes": f"XGB: {xgb_accuracy:.4f}, LR: {lr_accuracy:.4f}",
+            "parameters": json.dumps(best_params if model_type != "LogisticRegression" else {}),
+            "notes": f"XGB: {xgb_accuracy:.4f} ({xgb_stats['iterations']} იტ., "
+                     f"{xgb_stats['train_sec']:.1f}s, {xgb_stats['peak_rss_mb'] or 0:.0f} MB), "
+                     f"LR: {lr_accuracy:.4f}"
+                     + (f", ლიგები: {', '.join(members)}" if members else ""),
+            "kind": "final",
+            "duration_sec": search_sec,
+            "importance": json.dumps(importance["features"], ensure_ascii=False),
         })
 
         results = {
@@ -198,28 +287,587 @@ class MatchPredictor:
             "confusion_matrix": cm.tolist(),
             "classification_report": report,
             "feature_importance": feature_importance,
-            "best_params": grid_search.best_params_,
+            "permutation_importance": importance,
+            "best_params": best_params,
+            "search_trials": len(trials),
+            "search_sec": search_sec,
+            "xgb_training": xgb_stats,
+            "divisions": divisions,
+            "version": self.metadata.get("version"),
         }
 
+        if prune_top_k:
+            results["pruning"] = self._prune(
+                df, X_train, X_test, y_train, y_test, importance, prune_top_k, best_params,
+                trained_through, results, members,
+                featured_df["Div"].astype(str).to_numpy()[split_idx:])
+
         log.info("მოდელის გაწვრთნა დასრულდა!")
         return results
 
-    def _save_model(self, model_type, accuracy, logloss,
-                    train_size, test_size, feature_importance,
-                    params, cm, report):
-        """მოდელის და მეტადატის შენახვა."""
-        MODELS_DIR.mkdir(parents=True, exist_ok=True)
+    @budgeted("train")
+    def train_out_of_core(self, test_ratio: float = 0.2, shadow: bool = False) -> dict:
+        """გაწვრთნა დისკზე არსებული float32 შარდებიდან (src/ml/shards.py).
+
+        მეხსიერებაში არასდროს არის სრული ცხრილი ან მისი float64 ასლები:
+        XGBoost-ის მატრიცები DataIter-ით იკრიბება, მედიანები სვეტების
+        ბლოკებით ითვლება, შეფასება ბატჩებად, LR baseline კი ბოლო
+        TRAIN_LR_MAX_ROWS სასწავლ სტრიქონზე. RSS იზომება ყოველ ეტაპზე.
+        """
+        from src.ml.shards import (
+            CLASSES, FeatureShards, build_feature_shards, shard_folds, shard_matrix,
+        )
 
-        # მოდელის შენახვა
-        model_data = {
-            "model": self.model,
-            "scaler": self.scaler,
-            "label_encoder": self.label_encoder,
-            "feature_columns": self.feature_columns,
+        log.info("=" * 50)
+        log.info("მოდელის გაწვრთნა იწყება (out-of-core)")
+        log.info("=" * 50)
+        memory = MemoryStages()
+
+        self._report("features", 0.0, "ფიჩერების შარდები")
+        with memory.stage("features"):
+            store = FeatureShards(build_feature_shards())
+        days = np.sort(store.days())
+        if len(days) == 0:
+            log.error("ბაზაში მატჩები არ მოიძებნა")
+            return {}
+        self.feature_columns = store.feature_columns
+        self.label_encoder.fit(CLASSES)
+
+        # დროითი გაყოფა დღეებით: train - day <= cut, test - day > cut
+        split_idx = int(len(days) * (1 - test_ratio))
+        cut = days[split_idx - 1]
+        train_size = int(np.searchsorted(days, cut, side="right"))
+        test_size = len(days) - train_size
+        trained_through = str(np.datetime64(int(cut), "D"))
+        log.info(f"Train: {train_size}, Test: {test_size} ({len(store.names)} შარდი)")
+
+        with memory.stage("impute"):
+            self.impute_values = store.medians(hi=cut)
+        fill = self.impute_values
+
+        log.info("XGBoost-ის ჰიპერპარამეტრების ძებნა...")
+        self._report("search", 0.1, "ჰიპერპარამეტრების ძებნა")
+        with memory.stage("search"):
+            search_start = time.perf_counter()
+            folds = shard_folds(store, cut, fill)
+            best_params, trials = successive_halving(None, None, folds=folds,
+                                                     callback=self._search_callback(0.1, 0.8))
+            search_sec = time.perf_counter() - search_start
+            del folds
+        self._record_trials(trials, train_size)
+
+        self._report("fit", 0.8, "საბოლოო მოდელები")
+        with memory.stage("fit"):
+            fit_start = time.perf_counter()
+            valid_cut = days[int(train_size * (1 - XGB_VALID_FRACTION)) - 1]
+            dtrain = shard_matrix(store, None, valid_cut, fill)
+            dvalid = shard_matrix(store, valid_cut, cut, fill, ref=dtrain)
+            best_xgb = BoosterClassifier(
+                fit_booster(dtrain, dvalid, best_params, SEARCH_MAX_ROUNDS))
+            del dtrain, dvalid
+            xgb_stats = {"train_sec": round(time.perf_counter() - fit_start, 3),
+                         "iterations": best_xgb.get_booster().num_boosted_rounds()}
+
+        log.info("Logistic Regression (baseline)...")
+        with memory.stage("lr"):
+            X_lr, y_lr = store.tail(cut, TRAIN_LR_MAX_ROWS, fill)
+            self.scaler = StandardScaler().fit(X_lr)
+            lr = LogisticRegression(max_iter=1000, random_state=42)
+            lr.fit(self.scaler.transform(X_lr), y_lr)
+            lr_scaler = self.scaler
+            del X_lr, y_lr
+
+        with memory.stage("evaluate"):
+            y_test, xgb_proba, lr_proba = [], [], []
+            sample = None
+            for X_batch, y_batch in store.batches(lo=cut, fill=fill):
+                sample = X_batch if sample is None else sample
+                y_test.append(y_batch)
+                xgb_proba.append(best_xgb.predict_proba(X_batch))
+                lr_proba.append(lr.predict_proba(lr_scaler.transform(X_batch)))
+            y_test = np.concatenate(y_test)
+            xgb_proba, lr_proba = np.concatenate(xgb_proba), np.concatenate(lr_proba)
+
+        xgb_accuracy = accuracy_score(y_test, xgb_proba.argmax(axis=1))
+        xgb_logloss = log_loss(y_test, xgb_proba)
+        lr_accuracy = accuracy_score(y_test, lr_proba.argmax(axis=1))
+        lr_logloss = log_loss(y_test, lr_proba)
+        log.info(f"XGBoost - Accuracy: {xgb_accuracy:.4f}, Log Loss: {xgb_logloss:.4f}")
+        log.info(f"Logistic Regression - Accuracy: {lr_accuracy:.4f}, Log Loss: {lr_logloss:.4f}")
+
+        if xgb_accuracy >= lr_accuracy:
+            self.model, self.scaler, model_type = best_xgb, None, "XGBoost"
+            best_proba, best_accuracy, best_logloss = xgb_proba, xgb_accuracy, xgb_logloss
+        else:
+            self.model, model_type = lr, "LogisticRegression"
+            best_proba, best_accuracy, best_logloss = lr_proba, lr_accuracy, lr_logloss
+        log.info(f"არჩეულია: {model_type}")
+
+        best_pred = best_proba.argmax(axis=1)
+        cm = confusion_matrix(y_test, best_pred)
+        report = classification_report(y_test, best_pred,
+                                       target_names=self.label_encoder.classes_,
+                                       output_dict=True)
+        params = best_params if model_type == "XGBoost" else {}
+        training = {**xgb_stats, "out_of_core": True, "shards": len(store.names)}
+
+        self._report("save", 0.95, "შენახვა და გამოქვეყნება")
+        with memory.stage("save"):
+            self._save_model(model_type, best_accuracy, best_logloss, train_size, test_size,
+                             self._feature_importance(), params, cm.tolist(), report,
+                             sample=sample, shadow=shadow,
+                             training={**training, "memory": memory.stages},
+                             extra={"trained_through": trained_through})
+        log.info(f"მეხსიერება ეტაპებად: {memory.summary()}")
+
+        insert_model_run({
+            "model_type": model_type,
+            "accuracy": best_accuracy,
+            "log_loss": best_logloss,
+            "train_size": train_size,
+            "test_size": test_size,
+            "features_used": json.dumps(self.feature_columns),
+            "parameters": json.dumps(params),
+            "notes": f"out-of-core: XGB {xgb_accuracy:.4f}, LR {lr_accuracy:.4f}, "
+                     f"პიკური RSS {memory.peak_mb() or 0:.0f} MB",
+            "kind": "final",
+            "duration_sec": search_sec,
+        })
+
+        log.info("მოდელის გაწვრთნა დასრულდა!")
+        return {
+            "mode": "out_of_core",
+            "model_type": model_type,
+            "accuracy": best_accuracy,
+            "log_loss": best_logloss,
+            "xgb_accuracy": xgb_accuracy,
+            "lr_accuracy": lr_accuracy,
+            "train_size": train_size,
+            "test_size": test_size,
+            "confusion_matrix": cm.tolist(),
+            "classification_report": report,
+            "feature_importance": self.metadata.get("feature_importance", {}),
+            "best_params": best_params,
+            "search_trials": len(trials),
+            "search_sec": search_sec,
+            "xgb_training": training,
+            "memory": memory.stages,
+            "version": self.metadata.get("version"),
+        }
+
+    @staticmethod
+    def _validation_proba(model_type: str, X_train: pd.DataFrame, y_train: np.ndarray,
+                          valid_idx: int, params: dict) -> np.ndarray:
+        """გლობალური მოდელი (იგივე ტიპი) train-ის პირველ ნაწილზე -> ალბათობები ბოლოზე."""
+        X_fit, X_valid = X_train.iloc[:valid_idx], X_train.iloc[valid_idx:]
+        if model_type == "XGBoost":
+            booster, _ = train_booster(X_fit.to_numpy(dtype=np.float32), y_train[:valid_idx],
+                                       params)
+            return booster.predict_proba(X_valid.to_numpy(dtype=np.float32))
+        scaler = StandardScaler().fit(X_fit)
+        lr = LogisticRegression(max_iter=1000, random_state=42)
+        lr.fit(scaler.transform(X_fit), y_train[:valid_idx])
+        return lr.predict_proba(scaler.transform(X_valid))
+
+    def _fit_divisions(self, featured_df: pd.DataFrame, X: pd.DataFrame, y: np.ndarray,
+                       split_idx: int, valid_idx: int, params: dict, global_proba: np.ndarray,
+                       global_valid_proba: np.ndarray, workers: int) -> tuple:
+        """ლიგების მოდელები პარალელურ პროცესებში, იგივე დროითი გაყოფით.
+
+        მოდელის (XGBoost/LR) და მარშრუტის (ლიგის/გლობალური) არჩევა - train-ის
+        ბოლო ნაწილზე (valid_idx:split_idx), test მხოლოდ შეფასებისთვისაა.
+        აბრუნებს (წევრები, ლიგების შეჯამება, მარშრუტიზებული test ალბათობები).
+        """
+        divisions = featured_df["Div"].astype(str).to_numpy()
+        X_raw = X.to_numpy(dtype=np.float64)
+        index = np.arange(len(X))
+        is_train, is_fit = index < split_idx, index < valid_idx
+
+        tasks = []
+        for division in sorted(set(divisions)):
+            rows = divisions == division
+            train_rows, test_rows = rows & is_train, rows & ~is_train
+            fit_rows, valid_rows = train_rows & is_fit, train_rows & ~is_fit
+            if train_rows.sum() < DIVISION_MIN_TRAIN_ROWS or not test_rows.any() \
+                    or valid_rows.sum() < DIVISION_MIN_VALID_ROWS \
+                    or len(np.unique(y[fit_rows])) < 3:
+                log.info(f"{division}: ცოტა მონაცემი - გლობალური მოდელი")
+                continue
+            tasks.append((division, X_raw[train_rows], y[train_rows],
+                          int(fit_rows.sum()), X_raw[test_rows], y[test_rows],
+                          params, self.impute_values))
+
+        start = time.perf_counter()
+        layout = plan("divisions", tasks=len(tasks), workers=workers)
+        fit = partial(_fit_division, nthread=layout.estimator_threads)
+        if layout.workers > 1:
+            with ProcessPoolExecutor(max_workers=layout.workers, initializer=set_process_threads,
+                                     initargs=(layout.blas_threads,)) as pool:
+                fitted = list(pool.map(fit, tasks))
+        else:
+            fitted = [fit(task) for task in tasks]
+        log.info(f"ლიგების მოდელები: {len(fitted)} ლიგა, {layout.workers} პროცესი, "
+                 f"{time.perf_counter() - start:.1f}s")
+
+        proba = global_proba.copy()
+        test_divisions, y_test = divisions[~is_train], y[~is_train]
+        valid_divisions = divisions[valid_idx:split_idx]
+        y_valid = y[valid_idx:split_idx]
+        members, summary = {}, {}
+        for fit in fitted:
+            rows = test_divisions == fit["division"]
+            valid_rows = valid_divisions == fit["division"]
+            global_valid = float(log_loss(y_valid[valid_rows], global_valid_proba[valid_rows],
+                                          labels=[0, 1, 2]))
+            used = fit["valid_log_loss"] < global_valid
+            summary[fit["division"]] = {
+                "model_type": fit["model_type"],
+                "accuracy": fit["accuracy"],
+                "log_loss": fit["log_loss"],
+                "global_log_loss": float(log_loss(y_test[rows], global_proba[rows],
+                                                  labels=[0, 1, 2])),
+                "valid_log_loss": fit["valid_log_loss"],
+                "global_valid_log_loss": global_valid,
+                "train_size": fit["train_size"],
+                "valid_size": fit["valid_size"],
+                "test_size": fit["test_size"],
+                "fit_sec": fit["fit_sec"],
+                "used": used,
+            }
+            log.info(f"{fit['division']}: {fit['model_type']} ვალიდაციის log-loss "
+                     f"{fit['valid_log_loss']:.4f} (გლობალური {global_valid:.4f}) -> "
+                     f"{'ლიგის მოდელი' if used else 'გლობალური'}")
+            if used:
+                proba[rows] = fit["proba"]
+                members[fit["division"]] = {
+                    "model": fit["model"], "scaler": fit["scaler"],
+                    "impute_values": fit["impute_values"], "sample": fit["sample"],
+                    "metadata": {"division": fit["division"], **summary[fit["division"]]},
+                }
+        return members, summary, proba
+
+    @budgeted("train")
+    def train_incremental(self, shadow: bool = False,
+                          max_rounds: int = INCREMENTAL_MAX_ROUNDS) -> dict:
+        """წინა მოდელის განახლება მხოლოდ ახალი მატჩებით (სრული ძიების გარეშე).
+
+        XGBoost: booster-ი გრძელდება ახალ სტრიქონებზე - რაუნდები ახალი/ნასწავლი
+        სტრიქონების პროპორციით, max_rounds-მდე. LR: შენახული კოეფიციენტებიდან
+        (warm start) მთელ ისტორიაზე, წინა სკალერითა და მედიანებით.
+        ახალი მატჩების ბოლო INCREMENTAL_HOLDOUT_FRACTION (თარიღით) განახლებაში არ
+        შედის - მასზე ფასდება განახლებული მოდელი (accuracy/log_loss); ძველი მოდელის
+        შეფასება ყველა ახალ მატჩზე ინახება pre_update_* ველებად. trained_through
+        განახლების ბოლო თარიღია, ამიტომ შემდეგი განახლება ამ მატჩებსაც დაამატებს.
+        დრიფტის, ფიჩერების ცვლილების ან ბევრი ახალი მონაცემის დროს - სრული train().
+        """
+        log.info("=" * 50)
+        log.info("ინკრემენტული გადაწვრთნა")
+        log.info("=" * 50)
+        start = time.perf_counter()
+        self._report("features", 0.0, "წინა მოდელი და ფიჩერები")
+
+        base = load_model(native=True)
+        blocker = self._incremental_blocker(base)
+        if blocker:
+            return self._full_retrain(blocker, shadow, isinstance(base, ModelFamily))
+
+        df = get_all_matches()
+        if df.empty:
+            log.error("ბაზაში მატჩები არ მოიძებნა")
+            return {}
+        X, y, featured_df = self.prepare_data(df)
+        if X is None:
+            return {}
+        if self.feature_columns != list(base.feature_columns):
+            return self._full_retrain("ფიჩერების სია შეიცვალა", shadow)
+
+        trained_through = pd.Timestamp(base.metadata["trained_through"])
+        new_mask = (featured_df["Date"] > trained_through).to_numpy()
+        reference_mask = (~new_mask & (featured_df["Date"] > trained_through - pd.Timedelta(
+            days=INCREMENTAL_REFERENCE_DAYS)).to_numpy())
+        n_new, n_old = int(new_mask.sum()), int((~new_mask).sum())
+        model_type = base.metadata["model_type"]
+        if n_new == 0:
+            log.info(f"ახალი მატჩები არ არის - ვერსია {base.version} უცვლელია")
+            return {"mode": "unchanged", "model_type": model_type, "version": base.version,
+                    "new_rows": 0}
+        if n_new > INCREMENTAL_MAX_NEW_FRACTION * n_old:
+            return self._full_retrain(f"ბევრი ახალი მატჩი ({n_new} / {n_old})", shadow)
+
+        X_raw = X.to_numpy(dtype=np.float64)
+        X_all = base.impute(X_raw)
+        X_new, y_new = X_all[new_mask], y[new_mask]
+
+        # ძველი მოდელი ახალ მატჩებზე - მისი ნამდვილი out-of-sample შეფასება
+        proba = np.asarray(base.predict_proba(X_new))
+        row_losses = -np.log(np.clip(proba[np.arange(n_new), y_new], 1e-15, None))
+        baseline_log_loss = base.metadata.get("baseline_log_loss", base.metadata.get("log_loss"))
+        reasons = detect_drift(X_raw[reference_mask], X_raw[new_mask], self.feature_columns,
+                               baseline_log_loss, row_losses)
+        if reasons:
+            return self._full_retrain("; ".join(reasons), shadow)
+
+        # ბოლო თარიღები - განახლებული მოდელის შეფასებისთვის (მთელი დღეებით)
+        new_dates = featured_df["Date"][new_mask]
+        n_update = int(np.ceil(n_new * (1 - INCREMENTAL_HOLDOUT_FRACTION)))
+        holdout_mask = (featured_df["Date"] > new_dates.iloc[n_update - 1]).to_numpy() & new_mask
+        update_mask = new_mask & ~holdout_mask
+        n_update, n_holdout = int(update_mask.sum()), int(holdout_mask.sum())
+        X_update, y_update = X_all[update_mask], y[update_mask]
+
+        self._report("fit", 0.6, f"განახლება {n_update} ახალი მატჩით")
+        self.impute_values = np.asarray(base.impute_values, dtype=np.float64)
+        params = base.metadata.get("parameters", {})
+        if model_type == "XGBoost":
+            booster = base.model.get_booster()
+            rounds = min(max_rounds, max(1, int(np.ceil(
+                booster.num_boosted_rounds() * n_update / n_old))))
+            self.model, stats = continue_booster(booster, X_update, y_update, params, rounds)
+            self.scaler = None
+        else:
+            fit_start = time.perf_counter()
+            self.scaler = base.scaler
+            lr = LogisticRegression(max_iter=1000, random_state=42, warm_start=True)
+            lr.coef_ = np.array(base.model.coef_)
+            lr.intercept_ = np.array(base.model.intercept_)
+            lr.fit(self.scaler.transform(X_all[~holdout_mask]), y[~holdout_mask])
+            self.model = lr
+            stats = {"train_sec": round(time.perf_counter() - fit_start, 3),
+                     "iterations": int(np.max(lr.n_iter_))}
+
+        # განახლებული მოდელი გადადებულ ბოლო მატჩებზე (არ არის - მეტრიკები არ ინახება)
+        accuracy = logloss = None
+        cm, report = [], {}
+        if n_holdout:
+            X_holdout, y_holdout = X_all[holdout_mask], y[holdout_mask]
+            holdout_proba = np.asarray(self.model.predict_proba(
+                self.scaler.transform(X_holdout) if self.scaler is not None else X_holdout))
+            pred = holdout_proba.argmax(axis=1)
+            accuracy = float((pred == y_holdout).mean())
+            logloss = float(log_loss(y_holdout, holdout_proba, labels=[0, 1, 2]))
+            cm = confusion_matrix(y_holdout, pred, labels=[0, 1, 2]).tolist()
+            report = classification_report(y_holdout, pred, labels=[0, 1, 2],
+                                           target_names=self.label_encoder.classes_,
+                                           output_dict=True, zero_division=0)
+        duration = time.perf_counter() - start
+        incremental = {
+            "base_version": base.version,
+            "new_rows": n_new,
+            "update_rows": n_update,
+            "holdout_rows": n_holdout,
+            # ძველი მოდელი ყველა ახალ მატჩზე (განახლებამდე)
+            "pre_update_accuracy": float((proba.argmax(axis=1) == y_new).mean()),
+            "pre_update_log_loss": float(row_losses.mean()),
+            "duration_sec": round(duration, 3),
         }
-        joblib.dump(model_data, str(MODEL_PATH))
-        log.info(f"მოდელი შენახულია: {MODEL_PATH}")
+        self._report("save", 0.9, "შენახვა და გამოქვეყნება")
+        self._save_model(model_type, accuracy, logloss, len(X_all) - n_holdout, n_holdout,
+                         self._feature_importance(), params, cm, report,
+                         sample=X_new, shadow=shadow, training=stats,
+                         extra={"trained_through": featured_df["Date"][~holdout_mask].max()
+                                .strftime("%Y-%m-%d"),
+                                "baseline_log_loss": baseline_log_loss,
+                                "incremental": incremental})
 
+        insert_model_run({
+            "model_type": model_type,
+            "accuracy": accuracy,
+            "log_loss": logloss,
+            "train_size": len(X_all) - n_holdout,
+            "test_size": n_holdout,
+            "features_used": json.dumps(self.feature_columns),
+            "parameters": json.dumps(params),
+            "notes": f"ინკრემენტული: ვერსია {base.version} + {n_update} მატჩი "
+                     f"({stats['iterations']} იტ., {stats['train_sec']:.2f}s); განახლებამდე "
+                     f"{incremental['pre_update_accuracy']:.4f} / "
+                     f"{incremental['pre_update_log_loss']:.4f} ({n_new} ახალ მატჩზე)",
+            "kind": "incremental",
+            "duration_sec": duration,
+        })
+
+        log.info(f"ინკრემენტული გადაწვრთნა დასრულდა: {base.version} -> "
+                 f"{self.metadata['version']}, +{n_update} მატჩი, {duration:.1f}s "
+                 f"(განახლებამდე ახალ მატჩებზე: {incremental['pre_update_accuracy']:.4f} / "
+                 f"{incremental['pre_update_log_loss']:.4f}"
+                 + (f"; განახლებული {n_holdout} გადადებულზე: {accuracy:.4f} / {logloss:.4f})"
+                    if n_holdout else "; გადადებული მატჩები არ დარჩა)"))
+        return {
+            "mode": "incremental",
+            "model_type": model_type,
+            "accuracy": accuracy,
+            "log_loss": logloss,
+            "train_size": len(X_all) - n_holdout,
+            "test_size": n_holdout,
+            "new_rows": n_new,
+            "update_rows": n_update,
+            "pre_update_accuracy": incremental["pre_update_accuracy"],
+            "pre_update_log_loss": incremental["pre_update_log_loss"],
+            "base_version": base.version,
+            "feature_importance": self.metadata["feature_importance"],
+            "training": stats,
+            "duration_sec": duration,
+            "version": self.metadata.get("version"),
+        }
+
+    @staticmethod
+    def _incremental_blocker(base) -> str | None:
+        """მიზეზი, რის გამოც წინა მოდელს ვერ გავაგრძელებთ (None - შეიძლება)."""
+        if base is None:
+            return "მოდელი ჯერ არ არის"
+        if isinstance(base, ModelFamily):
+            return "ლიგების ოჯახი ინკრემენტულად არ ახლდება"
+        if base.impute_values is None or "trained_through" not in base.metadata:
+            return f"ვერსია {base.version} ძველი ფორმატისაა (მედიანები/trained_through არ აქვს)"
+        model_type = base.metadata.get("model_type")
+        if model_type == "XGBoost" and hasattr(base.model, "get_booster"):
+            return None
+        if model_type == "LogisticRegression" and hasattr(base.model, "coef_") \
+                and base.scaler is not None:
+            return None
+        return f"მოდელის ტიპი {model_type} ინკრემენტულად არ ახლდება"
+
+    def _full_retrain(self, reason: str, shadow: bool, per_division: bool = False) -> dict:
+        log.warning(f"ინკრემენტული გადაწვრთნა გამოტოვებულია: {reason} - სრული გადაწვრთნა")
+        results = self.train(shadow=shadow, per_division=per_division)
+        if results:
+            results.update({"mode": "full", "fallback_reason": reason})
+        return results
+
+    def _prune(self, df: pd.DataFrame, X_train: pd.DataFrame, X_test: pd.DataFrame,
+               y_train: np.ndarray, y_test: np.ndarray, importance: dict, top_k: int,
+               params: dict, trained_through: str, published: dict, members: dict | None,
+               test_divisions: np.ndarray) -> dict:
+        """ტოპ-K ფიჩერზე გადაწვრთნა (იგივე გაყოფა და პარამეტრები); ქვეყნდება shadow-ად.
+
+        აბრუნებს შედარებას გამოქვეყნებულ მოდელთან (published - train()-ის
+        შედეგი; ლიგების ოჯახიც): სიზუსტე, log-loss, სკორინგის დრო 1000
+        მატჩზე და ფიჩერების გამოთვლის დრო (მხოლოდ საჭირო ჯგუფები).
+        """
+        self._report("save", 0.97, f"ტოპ-{top_k} ფიჩერის მოდელი")
+        columns = top_features(importance, top_k)
+        log.info(f"ფიჩერების შემცირება: {len(self.feature_columns)} -> {len(columns)}")
+        pruned = MatchPredictor()
+        pruned.label_encoder = self.label_encoder
+        pruned.feature_columns = columns
+        pruned.impute_values = pd.Series(self.impute_values,
+                                         index=self.feature_columns)[columns].to_numpy()
+        X_train_k = X_train[columns].to_numpy(dtype=np.float64)
+        X_test_k = X_test[columns].to_numpy(dtype=np.float64)
+
+        booster, stats = train_booster(X_train_k.astype(np.float32), y_train, params)
+        xgb_proba = booster.predict_proba(X_test_k.astype(np.float32))
+        scaler = StandardScaler()
+        lr = LogisticRegression(max_iter=1000, random_state=42)
+        lr.fit(scaler.fit_transform(X_train_k), y_train)
+        lr_proba = lr.predict_proba(scaler.transform(X_test_k))
+        if accuracy_score(y_test, xgb_proba.argmax(axis=1)) >= \
+                accuracy_score(y_test, lr_proba.argmax(axis=1)):
+            pruned.model, pruned.scaler, model_type, proba = booster, None, "XGBoost", xgb_proba
+        else:
+            pruned.model, pruned.scaler = lr, scaler
+            model_type, proba = "LogisticRegression", lr_proba
+        pred = proba.argmax(axis=1)
+        accuracy, logloss = float(accuracy_score(y_test, pred)), float(log_loss(y_test, proba))
+
+        # ორივე ფასდება ისე, როგორც სერვისში: predict_raw NumPy შესასვლელით
+        full = self._artifact(members)
+        tradeoff = {
+            "top_k": len(columns),
+            "features": columns,
+            "groups": [g.name for g in resolve_groups(columns)],
+            "full": {"model_type": published["model_type"],
+                     "accuracy": float(published["accuracy"]),
+                     "log_loss": float(published["log_loss"]),
+                     "feature_count": len(self.feature_columns),
+                     "scoring_ms_per_1k": scoring_latency_ms(
+                         lambda X: full.predict_raw(X, test_divisions),
+                         X_test.to_numpy(dtype=np.float64)),
+                     "features_sec": _feature_seconds(df, self.feature_columns)},
+            "pruned": {"model_type": model_type, "accuracy": accuracy, "log_loss": logloss,
+                       "feature_count": len(columns),
+                       "scoring_ms_per_1k": scoring_latency_ms(
+                           pruned._artifact().predict_raw, X_test_k),
+                       "features_sec": _feature_seconds(df, columns)},
+        }
+        log.info(f"ტოპ-{len(columns)}: სიზუსტე {tradeoff['full']['accuracy']:.4f} -> "
+                 f"{accuracy:.4f}, log-loss {tradeoff['full']['log_loss']:.4f} -> {logloss:.4f}, "
+                 f"სკორინგი {tradeoff['full']['scoring_ms_per_1k']:.2f} -> "
+                 f"{tradeoff['pruned']['scoring_ms_per_1k']:.2f} ms/1k, ფიჩერები "
+                 f"{tradeoff['full']['features_sec']:.2f} -> {tradeoff['pruned']['features_sec']:.2f}s")
+
+        cm = confusion_matrix(y_test, pred)
+        report = classification_report(y_test, pred, target_names=self.label_encoder.classes_,
+                                       output_dict=True)
+        params = params if model_type == "XGBoost" else {}
+        pruned._save_model(model_type, accuracy, logloss, len(X_train_k), len(X_test_k),
+                           pruned._feature_importance() or {
+                               feat: importance["features"][feat]["log_loss_increase"]
+                               for feat in columns},
+                           params, cm.tolist(), report, sample=X_test_k, shadow=True,
+                           training=stats if model_type == "XGBoost" else {},
+                           extra={"trained_through": trained_through,
+                                  "pruned_from": self.metadata.get("version"),
+                                  "pruning": tradeoff})
+        insert_model_run({
+            "model_type": model_type,
+            "accuracy": accuracy,
+            "log_loss": logloss,
+            "train_size": len(X_train_k),
+            "test_size": len(X_test_k),
+            "features_used": json.dumps(columns),
+            "parameters": json.dumps(params),
+            "notes": f"ტოპ-{len(columns)} ფიჩერი (ვერსია {self.metadata.get('version')}-დან), "
+                     f"shadow {pruned.metadata['version']}",
+            "kind": "pruned",
+        })
+        tradeoff["version"] = pruned.metadata["version"]
+        return tradeoff
+
+    def _artifact(self, members: dict = None) -> ModelArtifact | ModelFamily:
+        """ნასწავლი მოდელი (ან ლიგების ოჯახი) სერვისის ინტერფეისით, დისკის გარეშე."""
+        def artifact(model, scaler, impute_values):
+            return ModelArtifact(version=self.metadata.get("version"), model=model,
+                                 scaler=scaler, label_encoder=self.label_encoder,
+                                 feature_columns=self.feature_columns,
+                                 impute_values=impute_values)
+
+        if not members:
+            return artifact(self.model, self.scaler, self.impute_values)
+        return ModelFamily(version=self.metadata.get("version"), members={
+            name: artifact(m["model"], m["scaler"], m["impute_values"])
+            for name, m in members.items()})
+
+    def _feature_importance(self) -> dict:
+        """ფიჩერების მნიშვნელობა კლებადობით (თუ მოდელს აქვს)."""
+        if not hasattr(self.model, "feature_importances_"):
+            return {}
+        return {feat: float(imp) for feat, imp in sorted(
+            zip(self.feature_columns, self.model.feature_importances_),
+            key=lambda x: x[1], reverse=True)}
+
+    def _record_trials(self, trials: list, train_size: int):
+        """ძებნის ცდების ჩაწერა model_runs-ში (kind="trial")."""
+        insert_model_runs([{
+            "model_type": "XGBoost",
+            "accuracy": trial["accuracy"],
+            "log_loss": trial["log_loss"],
+            "train_size": train_size,
+            "parameters": json.dumps({**trial["params"], "n_estimators": trial["n_estimators"]}),
+            "notes": f"საფეხური {trial['rung']}, მაქს. {trial['rounds']} ხე",
+            "kind": "trial",
+            "duration_sec": trial["fit_sec"],
+        } for trial in trials])
+
+    def _save_model(self, model_type, accuracy, logloss,
+                    train_size, test_size, feature_importance,
+                    params, cm, report, sample=None, shadow=False, training=None,
+                    extra=None, members=None):
+        """მოდელის და მეტადატის შენახვა.
+
+        sample: სატესტო ფიჩერები - NumPy runtime-ის ექსპორტი მათზე მოწმდება.
+        extra: დამატებითი მეტადატა (trained_through, incremental).
+        members: ოჯახის წევრები (publish_family) - მაშინ model/scaler არ ინახება ცალკე.
+        """
         # მეტადატა
         self.metadata = {
             "model_type": model_type,
@@ -232,10 +880,83 @@ class MatchPredictor:
             "feature_columns": self.feature_columns,
             "feature_importance": feature_importance,
             "parameters": params,
+            "training": training or {},
             "confusion_matrix": cm,
             "classification_report": report,
+            **(extra or {}),
         }
 
-        with open(str(MODEL_METADATA_PATH), "w", encoding="utf-8") as f:
-            json.dump(self.metadata, f, indent=2, ensure_ascii=False)
-        log.info(f"მეტადატა შენახულია: {MODEL_METADATA_PATH}")
+        # ახალი ვერსია + CURRENT მიმთითებლის ატომური განახლება
+        if members is not None:
+            version = publish_family(members, self.label_encoder, self.feature_columns,
+                                     self.metadata, shadow=shadow)
+        else:
+            version = publish_model(self.model, self.scaler, self.label_encoder,
+                                    self.feature_columns, self.metadata, sample=sample,
+                                    impute_values=self.impute_values, shadow=shadow)
+        self.metadata["version"] = version
+
+
+def _feature_seconds(df: pd.DataFrame, columns: list) -> float:
+    """ფიჩერების გამოთვლის დრო მოცემული სვეტებისთვის (მხოლოდ მათი ჯგუფები)."""
+    start = time.perf_counter()
+    create_features(df, columns=columns)
+    return round(time.perf_counter() - start, 3)
+
+
+def _fit_division(task: tuple, nthread: int = None) -> dict:
+    """ერთი ლიგის მოდელი (პროცესში): XGBoost გლობალური პარამეტრებით და LR.
+
+    არჩევანი - train-ის ბოლო (ვალიდაციის) ნაწილის log-loss-ით (სიზუსტე ხმაურიანია);
+    არჩეული ტიპი შემდეგ მთელ train-ზე ისწავლება, test კი მხოლოდ ფასდება.
+    """
+    division, X_train, y_train, n_fit, X_test, y_test, params, fallback = task
+    start = time.perf_counter()
+
+    # ლიგის მედიანები; ლიგაში ცარიელი სვეტი -> გლობალური მედიანა
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        medians = np.nanmedian(X_train, axis=0)
+    medians = np.where(np.isnan(medians), fallback, medians)
+    X_train = np.where(np.isnan(X_train), medians, X_train)
+    X_test = np.where(np.isnan(X_test), medians, X_test)
+
+    def fit_xgb(X, y):
+        booster, _ = train_booster(X, y, params, nthread=nthread)
+        return booster, None
+
+    def fit_lr(X, y):
+        scaler = StandardScaler().fit(X)
+        return LogisticRegression(max_iter=1000, random_state=42).fit(
+            scaler.transform(X), y), scaler
+
+    def predict(model, scaler, X):
+        return model.predict_proba(scaler.transform(X) if scaler is not None else X)
+
+    X_fit, y_fit, X_valid, y_valid = X_train[:n_fit], y_train[:n_fit], \
+        X_train[n_fit:], y_train[n_fit:]
+    scored = []
+    for model_type, fit in (("XGBoost", fit_xgb), ("LogisticRegression", fit_lr)):
+        model, scaler = fit(X_fit, y_fit)
+        scored.append((log_loss(y_valid, predict(model, scaler, X_valid), labels=[0, 1, 2]),
+                       model_type, fit))
+    valid_logloss, model_type, fit = min(scored, key=lambda c: c[0])
+
+    model, scaler = fit(X_train, y_train)
+    proba = predict(model, scaler, X_test)
+    return {
+        "division": division,
+        "model_type": model_type,
+        "model": model,
+        "scaler": scaler,
+        "impute_values": medians,
+        "sample": X_test,
+        "proba": proba,
+        "accuracy": float(accuracy_score(y_test, proba.argmax(axis=1))),
+        "log_loss": float(log_loss(y_test, proba, labels=[0, 1, 2])),
+        "valid_log_loss": float(valid_logloss),
+        "train_size": len(X_train),
+        "valid_size": len(X_valid),
+        "test_size": len(X_test),
+        "fit_sec": round(time.perf_counter() - start, 3),
+    }
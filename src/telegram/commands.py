@@ -1,6 +1,6 @@
 """Telegram ბრძანებების იმპლემენტაცია."""
 import pandas as pd
-from src.ml.predictor import Predictor
+from src.ml.inference_client import get_inference_client
 from src.ml.value_bets import find_value_bets
 from src.data.db_manager import get_all_matches, get_bets
 from src.config import LEAGUES
@@ -13,16 +13,6 @@ from src.utils.logger import get_logger
 
 log = get_logger(__name__)
 
-_predictor = None
-
-
-def _get_predictor() -> Predictor:
-    global _predictor
-    if _predictor is None:
-        _predictor = Predictor()
-    return _predictor
-
-
 def cmd_start() -> str:
     return (
         "⚽ *AIbetuchio-ში მოგესალმებით!*\n\n"
@@ -40,40 +30,39 @@ def cmd_start() -> str:
 
 
 def cmd_today() -> str:
-    predictor = _get_predictor()
+    predictor = get_inference_client()
     if not predictor.is_ready():
         return "⚠️ მოდელი არ არის ჩატვირთული. გაწვრთნეთ ჯერ."
 
-    predictions = predictor.get_latest_predictions(n=50)
-    if predictions.empty:
-        return "📊 დღევანდელი პროგნოზები ვერ მოიძებნა"
-
     today = get_today_str()
-    today_preds = predictions[predictions["Date"] == today]
+    today_preds = predictor.get_latest_predictions(n=50, since=today, until=today)
 
     if today_preds.empty:
         # თუ დღევანდელი არ არის, ბოლო 5 აჩვენე
+        predictions = predictor.get_latest_predictions(n=5)
+        if predictions.empty:
+            return "📊 დღევანდელი პროგნოზები ვერ მოიძებნა"
         return "📊 დღეს მატჩები არ არის. ბოლო პროგნოზები:\n\n" + \
-               format_predictions_list(predictions.tail(5))
+               format_predictions_list(predictions)
 
     return format_predictions_list(today_preds)
 
 
 def cmd_weekend() -> str:
-    predictor = _get_predictor()
+    predictor = get_inference_client()
     if not predictor.is_ready():
         return "⚠️ მოდელი არ არის ჩატვირთული."
 
-    predictions = predictor.get_latest_predictions(n=100)
-    if predictions.empty:
-        return "📊 პროგნოზები ვერ მოიძებნა"
-
     weekend_dates = get_weekend_dates()
-    weekend_preds = predictions[predictions["Date"].isin(weekend_dates)]
+    weekend_preds = predictor.get_latest_predictions(
+        n=100, since=weekend_dates[0], until=weekend_dates[-1])
 
     if weekend_preds.empty:
+        predictions = predictor.get_latest_predictions(n=5)
+        if predictions.empty:
+            return "📊 პროგნოზები ვერ მოიძებნა"
         return "📊 შაბათ-კვირის მატჩები ვერ მოიძებნა. ბოლო პროგნოზები:\n\n" + \
-               format_predictions_list(predictions.tail(5))
+               format_predictions_list(predictions)
 
     return format_predictions_list(weekend_preds)
 
@@ -82,21 +71,12 @@ def cmd_predict(team_name: str) -> str:
     if not team_name.strip():
         return "❓ მიუთითეთ გუნდის სახელი: /predict Arsenal"
 
-    predictor = _get_predictor()
+    predictor = get_inference_client()
     if not predictor.is_ready():
         return "⚠️ მოდელი არ არის ჩატვირთული."
 
-    predictions = predictor.get_latest_predictions(n=100)
-    if predictions.empty:
-        return "📊 პროგნოზები ვერ მოიძებნა"
-
-    # გუნდის ძიება
-    team_lower = team_name.strip().lower()
-    mask = (
-        predictions["HomeTeam"].str.lower().str.contains(team_lower, na=False) |
-        predictions["AwayTeam"].str.lower().str.contains(team_lower, na=False)
-    )
-    team_preds = predictions[mask]
+    # გუნდის ძიება (ფილტრი პროგნოზირებამდე სრულდება)
+    team_preds = predictor.get_latest_predictions(n=1, team=team_name)
 
     if team_preds.empty:
         return f"❓ გუნდი '{team_name}' ვერ მოიძებნა"
@@ -121,7 +101,7 @@ def cmd_predict(team_name: str) -> str:
 
 
 def cmd_valuebets() -> str:
-    predictor = _get_predictor()
+    predictor = get_inference_client()
     if not predictor.is_ready():
         return "⚠️ მოდელი არ არის ჩატვირთული."
 
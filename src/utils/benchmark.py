@@ -0,0 +1,79 @@
+"""ფიჩერების ძრავების შედარება (ეკვივალენტობა) და შედეგების ჩაწერა."""
+import json
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config import BASE_DIR
+
+ROW_KEY = ["Div", "Date", "HomeTeam", "AwayTeam"]
+
+
+def compare_features(reference: pd.DataFrame, candidate: pd.DataFrame,
+                     rtol: float = 1e-5, atol: float = 1e-6) -> list:
+    """ფიჩერების სვეტ-სვეტად შედარება ტოლერანტობით.
+
+    სტრიქონები თანხვდება ROW_KEY-ით. აბრუნებს შეუსაბამობების სიას
+    (ცარიელი სია = ეკვივალენტურია). candidate-ის დამატებითი სვეტები
+    არ ითვლება შეუსაბამობად.
+    """
+    problems = []
+    ref = _align(reference)
+    cand = _align(candidate)
+
+    if len(ref) != len(cand):
+        problems.append({"column": None, "issue": "rows", "reference": len(ref),
+                         "candidate": len(cand)})
+        common = ref.index.intersection(cand.index)
+        ref, cand = ref.loc[common], cand.loc[common]
+    elif not ref.index.equals(cand.index):
+        problems.append({"column": None, "issue": "row_keys"})
+        return problems
+
+    for col in [c for c in ref.columns if c.startswith("feat_")]:
+        if col not in cand.columns:
+            problems.append({"column": col, "issue": "missing"})
+            continue
+        x = ref[col].to_numpy(dtype=np.float64)
+        y = cand[col].to_numpy(dtype=np.float64)
+        close = np.isclose(x, y, rtol=rtol, atol=atol, equal_nan=True)
+        if not close.all():
+            diff = np.abs(x - y)
+            problems.append({
+                "column": col,
+                "issue": "values",
+                "mismatched_rows": int((~close).sum()),
+                "max_abs_diff": float(np.nanmax(diff)) if np.isfinite(diff).any() else None,
+            })
+
+    return problems
+
+
+def _align(df: pd.DataFrame) -> pd.DataFrame:
+    keyed = df.copy()
+    for col in ROW_KEY:
+        keyed[col] = keyed[col].astype(str)
+    return keyed.set_index(ROW_KEY).sort_index()
+
+
+def git_revision() -> str | None:
+    """მიმდინარე commit-ის მოკლე hash (git-ის გარეშე None)."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(BASE_DIR),
+                             capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def append_results(path: Path, records: list):
+    """შედეგების JSON Lines ფაილში დამატება (ერთი ჩანაწერი = ერთი ძრავის გაშვება)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    stamp = {"timestamp": datetime.now().isoformat(), "revision": git_revision()}
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({**stamp, **record}, ensure_ascii=False) + "\n")
@@ -0,0 +1,86 @@
+"""ნაკადების ერთიანი ბიუჯეტი (CPU_BUDGET): გარე და შიდა პარალელიზმი.
+
+პროცესების პული (ლიგების მოდელები, ბექტესტის ფოლდები) x XGBoost-ის
+ნაკადები x BLAS/OpenMP ნაკადები (NumPy, sklearn) ერთი ბიუჯეტიდან
+ნაწილდება - თორემ ყოველი worker-ი ყველა ბირთვს იყენებს და საერთო
+მანქანაზე გაწვრთნა ნელდება. ერთ პროცესში XGBoost და BLAS ერთდროულად
+არ მუშაობენ, ამიტომ ორივე პროცესის წილს იღებს. BLAS-ის ლიმიტი -
+threadpoolctl-ით (თუ არ არის დაყენებული - გარემოს ცვლადებით ახალ პროცესებში).
+"""
+import functools
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from src.config import CPU_BUDGET, INFERENCE_THREADS
+from src.utils.logger import get_logger
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+
+log = get_logger(__name__)
+
+BLAS_ENV_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+@dataclass(frozen=True)
+class ThreadLayout:
+    purpose: str
+    workers: int  # პარალელური პროცესები
+    estimator_threads: int  # XGBoost-ის nthread თითო პროცესში
+    blas_threads: int  # BLAS/OpenMP ნაკადები თითო პროცესში
+    budget: int
+
+    def __str__(self) -> str:
+        return (f"{self.purpose}: {self.workers} პროცესი x {self.estimator_threads} ნაკადი "
+                f"(XGBoost) / {self.blas_threads} (BLAS), ბიუჯეტი {self.budget}")
+
+
+def plan(purpose: str, tasks: int = 1, workers: int = None, budget: int = None,
+         quiet: bool = False) -> ThreadLayout:
+    """განლაგება: პროცესები = min(ამოცანები, workers, ბიუჯეტი), შიდა = ბიუჯეტი // პროცესები.
+
+    purpose="inference" - ერთი პროცესი INFERENCE_THREADS ნაკადით (მცირე ბატჩები).
+    """
+    budget = max(1, budget or CPU_BUDGET)
+    if purpose == "inference":
+        threads = max(1, min(budget, INFERENCE_THREADS))
+        layout = ThreadLayout(purpose, 1, threads, threads, budget)
+    else:
+        n_workers = max(1, min(tasks, workers or budget, budget))
+        inner = max(1, budget // n_workers)
+        layout = ThreadLayout(purpose, n_workers, inner, inner, budget)
+    if not quiet:
+        log.info(f"ნაკადები - {layout}")
+    return layout
+
+
+@contextmanager
+def limit_threads(layout: ThreadLayout):
+    """BLAS/OpenMP ნაკადების ლიმიტი მიმდინარე პროცესში ბლოკის განმავლობაში."""
+    if threadpool_limits is None:
+        yield
+        return
+    with threadpool_limits(limits=layout.blas_threads):
+        yield
+
+
+def set_process_threads(blas_threads: int):
+    """პროცესის მთელი სიცოცხლის ლიმიტი (ProcessPoolExecutor-ის initializer, სერვერი)."""
+    for name in BLAS_ENV_VARS:
+        os.environ[name] = str(blas_threads)
+    if threadpool_limits is not None:
+        threadpool_limits(limits=blas_threads)
+
+
+def budgeted(purpose: str):
+    """დეკორატორი: ფუნქცია plan(purpose)-ის BLAS ლიმიტით სრულდება."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with limit_threads(plan(purpose)):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 
@@ -36,6 +37,107 @@ def implied_probabilities(odds_h: float, odds_d: float, odds_a: float) -> tuple:
     return normalize_probabilities(p_h, p_d, p_a)
 
 
+def odds_matrix_to_probabilities(odds) -> np.ndarray:
+    """კოეფიციენტების მატრიცა (n, k) -> 1/odds (არავალიდური -> 0), ვექტორულად."""
+    odds = np.asarray(odds, dtype=np.float64)
+    valid = odds > 0  # NaN-ისთვისაც False
+    return np.divide(1.0, odds, out=np.zeros_like(odds), where=valid)
+
+
+def overround(odds) -> np.ndarray:
+    """ბუკმეკერის ჯამური ალბათობა (booksum); NaN თუ რომელიმე კოეფიციენტი არავალიდურია."""
+    odds = np.asarray(odds, dtype=np.float64)
+    raw = odds_matrix_to_probabilities(odds)
+    total = raw.sum(axis=1)
+    total[~(odds > 0).all(axis=1)] = np.nan
+    return total
+
+
+def implied_probabilities_matrix(odds, method: str = "basic") -> np.ndarray:
+    """ნორმალიზებული ალბათობები მთელი (n, 3) მატრიცისთვის ერთბაშად.
+
+    method:
+      basic - პროპორციული ნორმალიზება (implied_probabilities-ის ექვივალენტი)
+      shin  - Shin-ის მოდელი (insider trading წილით z)
+      power - p_i = (1/o_i)^k, სადაც k ისეა შერჩეული, რომ ჯამი = 1
+    shin/power არავალიდურ სტრიქონებზე basic-ს იყენებს.
+    """
+    odds = np.asarray(odds, dtype=np.float64)
+    raw = odds_matrix_to_probabilities(odds)
+    total = raw[:, 0] + raw[:, 1] + raw[:, 2]
+
+    probs = np.empty_like(raw)
+    ok = total > 0
+    probs[ok] = raw[ok] / total[ok, None]
+    probs[~ok] = (0.33, 0.34, 0.33)
+
+    if method == "basic":
+        return probs
+
+    valid = (odds > 0).all(axis=1)
+    if method == "shin":
+        probs[valid] = _shin_probabilities(raw[valid])[0]
+    elif method == "power":
+        probs[valid] = _power_probabilities(raw[valid])
+    else:
+        raise ValueError(f"უცნობი მეთოდი: {method}")
+    return probs
+
+
+def shin_z(odds) -> np.ndarray:
+    """Shin-ის z პარამეტრი თითო სტრიქონზე (NaN არავალიდურ სტრიქონებზე)."""
+    odds = np.asarray(odds, dtype=np.float64)
+    valid = (odds > 0).all(axis=1)
+    z = np.full(len(odds), np.nan)
+    z[valid] = _shin_probabilities(odds_matrix_to_probabilities(odds[valid]))[1]
+    return z
+
+
+def _shin_probabilities(raw: np.ndarray, iterations: int = 100, tol: float = 1e-12) -> tuple:
+    """Shin-ის მეთოდი ფიქსირებული წერტილის იტერაციით (Jullien & Salanié)."""
+    n = raw.shape[1]
+    booksum = raw.sum(axis=1, keepdims=True)
+    share = raw ** 2 / booksum
+    z = np.zeros((len(raw), 1))
+    for _ in range(iterations):
+        roots = np.sqrt(z ** 2 + 4 * (1 - z) * share)
+        z_new = (roots.sum(axis=1, keepdims=True) - 2) / (n - 2)
+        z_new = np.clip(z_new, 0.0, 0.99)
+        done = np.abs(z_new - z).max(initial=0.0) < tol
+        z = z_new
+        if done:
+            break
+    probs = (np.sqrt(z ** 2 + 4 * (1 - z) * share) - z) / (2 * (1 - z))
+    probs /= probs.sum(axis=1, keepdims=True)
+    return probs, z[:, 0]
+
+
+def _power_probabilities(raw: np.ndarray, iterations: int = 50, tol: float = 1e-12) -> np.ndarray:
+    """Power მეთოდი: sum((1/o_i)^k) = 1, k ნიუტონის მეთოდით."""
+    log_raw = np.log(raw)
+    k = np.ones((len(raw), 1))
+    for _ in range(iterations):
+        powered = raw ** k
+        f = powered.sum(axis=1, keepdims=True) - 1
+        df = (powered * log_raw).sum(axis=1, keepdims=True)
+        step = np.divide(f, df, out=np.zeros_like(f), where=df != 0)
+        k = k - step
+        if np.abs(step).max(initial=0.0) < tol:
+            break
+    probs = raw ** k
+    probs /= probs.sum(axis=1, keepdims=True)
+    return probs
+
+
+def favorite_index(odds) -> np.ndarray:
+    """ყველაზე დაბალი კოეფიციენტის ინდექსი (NaN-ების გამოტოვებით; ყველა NaN -> NaN)."""
+    odds = np.asarray(odds, dtype=np.float64)
+    all_nan = np.isnan(odds).all(axis=1)
+    idx = np.argmin(np.where(np.isnan(odds), np.inf, odds), axis=1).astype(np.float64)
+    idx[all_nan] = np.nan
+    return idx
+
+
 def kelly_fraction(edge: float, odds: float) -> float:
     """Kelly criterion-ით ფსონის ზომის გამოთვლა."""
     if odds <= 1 or edge <= 0:
@@ -0,0 +1,81 @@
+"""პროცესის მეხსიერების (RSS) გაზომვა."""
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _proc_status_mb(field: str) -> float | None:
+    try:
+        with open("/proc/self/status", "r", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def current_rss_mb() -> float | None:
+    """მიმდინარე RSS მეგაბაიტებში (Linux /proc, სხვაგან None)."""
+    return _proc_status_mb("VmRSS:")
+
+
+def peak_rss_mb() -> float | None:
+    """პროცესის პიკური RSS მეგაბაიტებში."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS ბაიტებში აბრუნებს, Linux - კილობაიტებში
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def frame_mb(df) -> float:
+    """DataFrame-ის ზომა მეგაბაიტებში (object სვეტების ჩათვლით)."""
+    return df.memory_usage(deep=True).sum() / (1024 * 1024)
+
+
+def reset_peak_rss() -> bool:
+    """პიკური RSS-ის (VmHWM) განულება - ეტაპის პიკის გასაზომად (მხოლოდ Linux)."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class MemoryStages:
+    """RSS ეტაპების მიხედვით: {ეტაპი: {"sec", "rss_mb", "peak_rss_mb"}}.
+
+    peak_rss_mb - ეტაპის პიკი, თუ VmHWM-ის განულება შესაძლებელია,
+    წინააღმდეგ შემთხვევაში პროცესის პიკი დაწყებიდან.
+    """
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        reset_peak_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = {
+                "sec": round(time.perf_counter() - start, 3),
+                "rss_mb": current_rss_mb(),
+                "peak_rss_mb": _proc_status_mb("VmHWM:") or peak_rss_mb(),
+            }
+
+    def peak_mb(self) -> float | None:
+        peaks = [s["peak_rss_mb"] for s in self.stages.values() if s["peak_rss_mb"]]
+        return max(peaks) if peaks else None
+
+    def summary(self) -> str:
+        return ", ".join(f"{name} {s['peak_rss_mb'] or 0:.0f} MB/{s['sec']:.1f}s"
+                         for name, s in self.stages.items())
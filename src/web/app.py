@@ -1,6 +1,12 @@
 """AIbetuchio - მთავარი Streamlit აპლიკაცია."""
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
 import streamlit as st
 
+from src.ml.inference_client import get_inference_client
+
 st.set_page_config(
     page_title="AIbetuchio - საფეხბურთო AI",
     page_icon="⚽",
@@ -8,6 +14,17 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+
+
+@st.cache_resource
+def _warm_up():
+    """საერთო სერვისი ერთხელ იტვირთება ყველა სესიისთვის (არა ყოველ rerun-ზე)."""
+    get_inference_client().warm_up_async()
+    return True
+
+
+_warm_up()
+
 st.title("⚽ AIbetuchio")
 st.subheader("საფეხბურთო AI პროგნოზების სისტემა")
 
@@ -9,7 +9,7 @@ import plotly.express as px
 from datetime import datetime
 
 from src.data.db_manager import get_all_matches, get_predictions, get_bets, get_model_runs
-from src.ml.predictor import Predictor
+from src.ml.inference_client import get_inference_client
 from src.config import LEAGUES
 
 st.set_page_config(page_title="მთავარი პანელი - AIbetuchio", page_icon="📊", layout="wide")
@@ -59,7 +59,7 @@ else:
 # ბოლო პროგნოზები
 st.subheader("ბოლო პროგნოზები")
 try:
-    predictor = Predictor()
+    predictor = get_inference_client()
     if predictor.is_ready():
         latest_preds = predictor.get_latest_predictions(n=10)
         if not latest_preds.empty:
@@ -7,7 +7,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from src.ml.predictor import Predictor
+from src.ml.inference_client import get_inference_client
 from src.config import LEAGUES
 
 st.set_page_config(page_title="პროგნოზები - AIbetuchio", page_icon="🎯", layout="wide")
@@ -28,7 +28,7 @@ with col2:
 RESULT_MAP = {"H": "სახლის მოგება", "D": "ფრე", "A": "სტუმრის მოგება"}
 
 try:
-    predictor = Predictor()
+    predictor = get_inference_client()
     if not predictor.is_ready():
         st.warning("მოდელი ჯერ არ არის გაწვრთნილი. გაუშვით: python run_training.py")
         st.stop()
@@ -7,7 +7,7 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 
-from src.ml.predictor import Predictor
+from src.ml.inference_client import get_inference_client
 from src.ml.value_bets import find_value_bets, analyze_value_bets_performance
 from src.config import LEAGUES, MIN_EDGE_THRESHOLD
 
@@ -36,7 +36,7 @@ with col3:
 BET_TYPE_MAP = {"Home Win": "სახლის მოგება", "Draw": "ფრე", "Away Win": "სტუმრის მოგება"}
 
 try:
-    predictor = Predictor()
+    predictor = get_inference_client()
     if not predictor.is_ready():
         st.warning("მოდელი ჯერ არ არის გაწვრთნილი. გაუშვით: python run_training.py")
         st.stop()
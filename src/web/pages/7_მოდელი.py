@@ -10,8 +10,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 
-from src.config import MODEL_METADATA_PATH
-from src.data.db_manager import get_model_runs
+from src.config import MODEL_METADATA_PATH, LEAGUES, JOB_POLL_SEC, LIVE_METRICS_DAYS
+from src.data.db_manager import (
+    get_model_runs, get_live_model_metrics, enqueue_training_job, get_active_training_job,
+    get_training_job, get_training_jobs, request_training_job_cancel,
+)
+from src.ml.jobs import JOB_MODES
+from src.ml.artifacts import (
+    current_version, shadow_versions, promote, remove_shadow, version_metadata, trained_through,
+)
 
 st.set_page_config(page_title="მოდელი - AIbetuchio", page_icon="🤖", layout="wide")
 st.title("🤖 მოდელის ინფორმაცია")
@@ -35,11 +42,12 @@ col1, col2, col3, col4 = st.columns(4)
 with col1:
     st.metric("მოდელის ტიპი", metadata.get("model_type", "N/A"))
 with col2:
-    acc = metadata.get("accuracy", 0)
-    st.metric("სიზუსტე", f"{acc:.1%}")
+    # ინკრემენტულ ვერსიას გადადებული მატჩების გარეშე მეტრიკები არ აქვს
+    acc = metadata.get("accuracy")
+    st.metric("სიზუსტე", f"{acc:.1%}" if acc is not None else "N/A")
 with col3:
-    ll = metadata.get("log_loss", 0)
-    st.metric("Log Loss", f"{ll:.4f}")
+    ll = metadata.get("log_loss")
+    st.metric("Log Loss", f"{ll:.4f}" if ll is not None else "N/A")
 with col4:
     st.metric("ფიჩერები", metadata.get("feature_count", 0))
 
@@ -81,6 +89,13 @@ FEATURE_NAMES = {
     "feat_away_defense_strength": "სტუმრის დაცვის სიძლიერე",
     "feat_home_league_position": "სახლის პოზიცია ლიგაში",
     "feat_away_league_position": "სტუმრის პოზიცია ლიგაში",
+    "feat_home_elo": "სახლის Elo რეიტინგი",
+    "feat_away_elo": "სტუმრის Elo რეიტინგი",
+    "feat_elo_diff": "Elo სხვაობა",
+    "feat_elo_expected_home": "Elo მოსალოდნელი შედეგი (სახლი)",
+    "feat_home_pi_rating": "სახლის Pi-რეიტინგი",
+    "feat_away_pi_rating": "სტუმრის Pi-რეიტინგი",
+    "feat_pi_expected_goal_diff": "Pi მოსალოდნელი გოლების სხვაობა",
     "feat_implied_prob_home": "კოეფ. ალბათობა (სახლი)",
     "feat_implied_prob_draw": "კოეფ. ალბათობა (ფრე)",
     "feat_implied_prob_away": "კოეფ. ალბათობა (სტუმარი)",
@@ -148,6 +163,25 @@ if report:
     if report_data:
         st.dataframe(pd.DataFrame(report_data), use_container_width=True)
 
+# ლიგების მოდელები (ოჯახი)
+divisions = metadata.get("divisions", {})
+if divisions:
+    st.markdown("---")
+    st.subheader("ლიგების მოდელები")
+    st.dataframe(pd.DataFrame([{
+        "ლიგა": LEAGUES.get(division, division),
+        "მოდელი": info["model_type"],
+        # მარშრუტი ვალიდაციით წყდება (train-ის ბოლო ნაწილი), test მხოლოდ შეფასებაა
+        "ვალიდაციის Log Loss": f"{info['valid_log_loss']:.4f}" if "valid_log_loss" in info else "-",
+        "გლობალური (ვალიდაცია)": (f"{info['global_valid_log_loss']:.4f}"
+                                  if "global_valid_log_loss" in info else "-"),
+        "Log Loss": f"{info['log_loss']:.4f}",
+        "გლობალური Log Loss": f"{info['global_log_loss']:.4f}",
+        "სიზუსტე": f"{info['accuracy']:.1%}",
+        "სატესტო": info["test_size"],
+        "გამოიყენება": "✅" if info["used"] else "გლობალური",
+    } for division, info in divisions.items()]), use_container_width=True)
+
 # პარამეტრები
 st.markdown("---")
 st.subheader("მოდელის პარამეტრები")
@@ -186,25 +220,115 @@ if not model_runs.empty:
                       labels={"run_date": "თარიღი", "accuracy": "სიზუსტე"})
         st.plotly_chart(fig, use_container_width=True)
 
-# გადაწვრთნის ღილაკი
+# ჩემპიონი vs shadow მოდელები (run_scheduler.py-ის შენახული პროგნოზებიდან)
+st.markdown("---")
+st.subheader("ჩემპიონი და shadow მოდელები")
+
+champion = current_version()
+shadows = shadow_versions()
+st.write(f"ჩემპიონი: `{champion or 'legacy'}`" +
+         (f" | shadow: {', '.join(f'`{v}`' for v in shadows)}" if shadows else ""))
+
+# მხოლოდ ყოველი ვერსიის სწავლების შემდგომი მატჩები (out-of-sample)
+live_since = (pd.Timestamp.now() - pd.Timedelta(days=LIVE_METRICS_DAYS)).strftime("%Y-%m-%d")
+compared = [champion, *shadows] if champion else []
+live = get_live_model_metrics({v: trained_through(v) for v in compared}, since=live_since)
+if not live.empty:
+    live["როლი"] = live["model_version"].map(
+        lambda v: "ჩემპიონი" if v == champion else "shadow")
+    st.dataframe(live.rename(columns={
+        "model_version": "ვერსია", "matches": "მატჩები",
+        "accuracy": "სიზუსტე", "log_loss": "Log Loss",
+    }), use_container_width=True)
+    st.caption(f"დასრულებული მატჩები {live_since}-დან, ყოველი ვერსიის სწავლების შემდეგ")
+else:
+    st.info("სწავლების შემდეგ დასრულებულ მატჩებზე პროგნოზები ჯერ არ არის "
+            "(python run_scheduler.py --once)")
+
+# შემცირებული (ტოპ-K ფიჩერის) shadow-ები: სიზუსტე vs სიჩქარე
+pruned_rows = []
+for version in shadows:
+    pruning = version_metadata(version).get("pruning")
+    if pruning:
+        for role, info in (("სრული", pruning["full"]), (f"ტოპ-{pruning['top_k']}", pruning["pruned"])):
+            pruned_rows.append({
+                "shadow": version, "მოდელი": role, "ფიჩერები": info["feature_count"],
+                "სიზუსტე": info["accuracy"], "Log Loss": info["log_loss"],
+                "სკორინგი ms/1k": info["scoring_ms_per_1k"], "ფიჩერების დრო s": info["features_sec"],
+            })
+if pruned_rows:
+    st.caption("ფიჩერების შემცირება (run_training.py --prune K)")
+    st.dataframe(pd.DataFrame(pruned_rows), use_container_width=True, hide_index=True)
+
+if shadows:
+    col1, col2 = st.columns(2)
+    selected = col1.selectbox("shadow ვერსია", shadows)
+    if col2.button("ჩემპიონად დაყენება"):
+        promote(selected)
+        st.rerun()
+    if col2.button("shadow-დან ამოღება"):
+        remove_shadow(selected)
+        st.rerun()
+
+# გადაწვრთნა - ფონური job (run_worker.py), გვერდი მხოლოდ სტატუსს კითხულობს
 st.markdown("---")
 st.subheader("მოდელის გადაწვრთნა")
-st.warning("გადაწვრთნა შეცვლის მიმდინარე მოდელს")
+mode = st.radio("რეჟიმი", list(JOB_MODES), format_func=JOB_MODES.get, horizontal=True,
+                help="ინკრემენტული - მხოლოდ ახალი მატჩები (დრიფტისას - სრული); "
+                     "ლიგების მოდელები - თითო ლიგას საკუთარი + გლობალური")
+as_shadow = st.checkbox("shadow-ად (ჩემპიონი არ შეიცვლება)")
+if not as_shadow:
+    st.warning("გადაწვრთნა შეცვლის მიმდინარე მოდელს")
 
 if st.button("მოდელის გადაწვრთნა", type="primary"):
-    with st.spinner("მოდელი იწვრთნება... (შეიძლება რამდენიმე წუთი)"):
-        try:
-            from src.ml.trainer import MatchPredictor
-            trainer = MatchPredictor()
-            results = trainer.train()
-            if results:
-                st.success(
-                    f"მოდელი გადაწვრთნილია!\n"
-                    f"სიზუსტე: {results['accuracy']:.1%}\n"
-                    f"Log Loss: {results['log_loss']:.4f}"
-                )
-                st.rerun()
+    job_id, created = enqueue_training_job(mode, shadow=as_shadow)
+    if not created:
+        st.info(f"გაწვრთნა უკვე მიმდინარეობს (job {job_id})")
+
+
+@st.fragment(run_every=JOB_POLL_SEC)
+def training_status():
+    job = get_active_training_job()
+    watched = st.session_state.get("training_job")
+    if job is None:
+        if watched is not None:
+            # job დასრულდა - მთელი გვერდი ახალი მოდელით
+            st.session_state.training_job = None
+            finished = get_training_job(watched)
+            st.session_state.training_job_finished = finished
+            st.rerun(scope="app")
+        finished = st.session_state.get("training_job_finished")
+        if finished:
+            if finished["status"] == "done":
+                st.success(f"მოდელი გადაწვრთნილია: {finished['message']}")
+            elif finished["status"] == "cancelled":
+                st.info("გაწვრთნა გაუქმდა")
             else:
-                st.error("გაწვრთნა ვერ მოხერხდა")
-        except Exception as e:
-            st.error(f"შეცდომა: {e}")
+                st.error(f"გაწვრთნა ვერ მოხერხდა: {(finished['error'] or '').splitlines()[0]}")
+        return
+
+    st.session_state.training_job = job["id"]
+    label = (f"job {job['id']}: {JOB_MODES.get(job['mode'], job['mode'])}"
+             f"{' (shadow)' if job['shadow'] else ''} - {job['status']}")
+    st.progress(min(float(job["progress"] or 0), 1.0), text=label)
+    if job["status"] == "queued":
+        st.caption("რიგშია - worker-ი: python run_worker.py")
+    else:
+        st.caption(f"ეტაპი: {job['stage'] or '-'} · {job['message'] or ''}")
+    if job["status"] != "cancelling" and st.button("გაუქმება", key=f"cancel_{job['id']}"):
+        request_training_job_cancel(job["id"])
+        st.rerun(scope="fragment")
+
+
+training_status()
+
+jobs = get_training_jobs(limit=10)
+if jobs:
+    with st.expander("ბოლო გაწვრთნის job-ები"):
+        st.dataframe(pd.DataFrame(jobs)[[
+            "id", "mode", "shadow", "status", "stage", "progress", "message",
+            "created_at", "finished_at",
+        ]].rename(columns={
+            "mode": "რეჟიმი", "status": "სტატუსი", "stage": "ეტაპი", "progress": "პროგრესი",
+            "message": "შეტყობინება", "created_at": "შეიქმნა", "finished_at": "დასრულდა",
+        }), use_container_width=True, hide_index=True)